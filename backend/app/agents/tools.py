@@ -8,7 +8,7 @@ from typing import Dict, List, Optional, Annotated, Literal, Union
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import func, case
-import uuid
+from ..utils.ids import uuid7
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +17,7 @@ from ..database.models import (
     Transaction, DebtLoan, Goal, Insight, Log,
     TransactionType, DebtLoanType, DebtLoanStatus, GoalStatus, InsightType,
     Budget, RecurringTransaction, RecurrenceFrequency, Notification, NotificationStatus,
-    Account, CreditCard, AccountType, AccountStatus, CardNetwork
+    Account, AccountType, AccountStatus, CardNetwork, AutopayMode
 )
 from ..services.health_calculator import HealthCalculator
 from ..services.debt_optimizer import DebtOptimizer
@@ -282,9 +282,8 @@ def _add_transaction(
         )
 
     # Validate transaction type
-    try:
-        transaction_type_enum = TransactionType(transaction_type.lower())
-    except ValueError:
+    transaction_type_enum = TransactionType.lookup(transaction_type)
+    if transaction_type_enum is None:
         raise InvalidInputError(
             field="transaction_type",
             value=transaction_type,
@@ -328,7 +327,7 @@ def _add_transaction(
     try:
         with db_transaction(db) as session:
             transaction = Transaction(
-                id=str(uuid.uuid4()),
+                id=str(uuid7()),
                 user_id=user_id,
                 type=transaction_type_enum,
                 amount=amount,
@@ -374,7 +373,7 @@ def _get_transactions(
         query = db.query(Transaction).filter(Transaction.user_id == user_id)
 
         if transaction_type and transaction_type != "all":
-            query = query.filter(Transaction.type == TransactionType(transaction_type.lower()))
+            query = query.filter(Transaction.type == TransactionType(transaction_type))
 
         transactions = query.order_by(Transaction.date.desc()).limit(limit).all()
 
@@ -383,7 +382,7 @@ def _get_transactions(
 
         result = f"Found {len(transactions)} transaction(s):\n\n"
         for t in transactions:
-            result += f"• {t.date.strftime('%Y-%m-%d')}: {ToolContext.currency_symbol}{t.amount} - {t.description} ({t.type.value}, {t.category})\n"
+            result += f"• {t.date.strftime('%Y-%m-%d')}: {ToolContext.currency_symbol}{t.amount} - {t.description} ({t.type}, {t.category})\n"
 
         return result
 
@@ -492,7 +491,7 @@ def _add_debt_or_loan(
         start = datetime.fromisoformat(start_date) if start_date and start_date != "today" else datetime.utcnow()
 
         debt_loan = DebtLoan(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             user_id=user_id,
             type=DebtLoanType(debt_type),
             name=name,
@@ -543,7 +542,7 @@ def get_debts_and_loans() -> str:
         total_loans = 0
 
         for dl in debts_loans:
-            result += f"• {dl.name}: {ToolContext.currency_symbol}{dl.remaining_amount:,.2f} remaining at {dl.interest_rate}% ({dl.type.value})\n"
+            result += f"• {dl.name}: {ToolContext.currency_symbol}{dl.remaining_amount:,.2f} remaining at {dl.interest_rate}% ({dl.type})\n"
             result += f"  Monthly payment: {ToolContext.currency_symbol}{dl.monthly_payment:,.2f}\n\n"
 
             if dl.type == DebtLoanType.DEBT:
@@ -634,7 +633,7 @@ def _add_financial_goal(
         target = datetime.fromisoformat(target_date)
 
         goal = Goal(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             user_id=user_id,
             name=name,
             target_amount=target_amount,
@@ -862,7 +861,7 @@ def _create_budget(
         user_id = ToolContext.user_id
 
         budget = Budget(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             user_id=user_id,
             category=category.lower(),
             amount=amount,
@@ -915,7 +914,7 @@ def get_recurring_transactions() -> str:
             type_emoji = "💰" if r.type == TransactionType.INCOME else "💸"
             result += f"{type_emoji} {r.description}\n"
             result += f"  Amount: {ToolContext.currency_symbol}{r.amount:,.2f}\n"
-            result += f"  Frequency: {r.frequency.value}\n"
+            result += f"  Frequency: {r.frequency}\n"
             result += f"  Next: {r.next_date.strftime('%Y-%m-%d')}\n"
             result += f"  Category: {r.category}\n"
             result += f"  Auto-add: {'Yes' if r.auto_add else 'No'}\n\n"
@@ -946,9 +945,9 @@ def _create_recurring_transaction(
         next_dt = datetime.fromisoformat(next_date)
 
         recurring = RecurringTransaction(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             user_id=user_id,
-            type=TransactionType(transaction_type.lower()),
+            type=TransactionType(transaction_type),
             amount=amount,
             description=description,
             category=category,
@@ -1226,14 +1225,13 @@ def _add_account(
         user_id = ToolContext.user_id
 
         # Validate account type
-        try:
-            account_type_enum = AccountType(account_type.lower())
-        except ValueError:
+        account_type_enum = AccountType.lookup(account_type)
+        if account_type_enum is None:
             return f"❌ Invalid account type. Must be one of: {', '.join([t.value for t in AccountType])}"
 
         # Create account
         account = Account(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             user_id=user_id,
             account_type=account_type_enum,
             account_name=account_name,
@@ -1273,24 +1271,23 @@ def _get_accounts() -> str:
         total_balance = 0.0
 
         for acc in accounts:
-            result += f"• {acc.account_name} ({acc.account_type.value})\n"
+            result += f"• {acc.account_name} ({acc.account_type})\n"
             result += f"  Balance: ${acc.current_balance:.2f}"
             if acc.institution_name:
                 result += f" | {acc.institution_name}"
             if acc.account_number_last4:
                 result += f" | ****{acc.account_number_last4}"
-            result += f"\n  Status: {acc.status.value}\n"
+            result += f"\n  Status: {acc.status}\n"
 
             # Include credit card details if available
-            if acc.account_type == AccountType.CREDIT_CARD and acc.credit_card_details:
-                cc = acc.credit_card_details
-                result += f"  Credit Limit: ${cc.credit_limit:.2f}\n"
-                result += f"  Available: ${cc.available_credit:.2f}\n"
-                result += f"  Utilization: {cc.credit_utilization:.1f}%\n"
-                if cc.payment_due_date:
-                    result += f"  Due Date: {cc.payment_due_date.strftime('%Y-%m-%d')}\n"
-                if cc.minimum_payment:
-                    result += f"  Minimum Payment: ${cc.minimum_payment:.2f}\n"
+            if acc.account_type == AccountType.CREDIT_CARD and acc.credit_limit is not None:
+                result += f"  Credit Limit: ${acc.credit_limit:.2f}\n"
+                result += f"  Available: ${acc.available_credit:.2f}\n"
+                result += f"  Utilization: {acc.credit_utilization:.1f}%\n"
+                if acc.payment_due_date:
+                    result += f"  Due Date: {acc.payment_due_date.strftime('%Y-%m-%d')}\n"
+                if acc.minimum_payment:
+                    result += f"  Minimum Payment: ${acc.minimum_payment:.2f}\n"
 
             result += "\n"
 
@@ -1336,8 +1333,7 @@ def _add_credit_card(
             return "❌ This account is not a credit card account. Please use a credit_card type account."
 
         # Check if credit card details already exist
-        existing_cc = db.query(CreditCard).filter(CreditCard.account_id == account_id).first()
-        if existing_cc:
+        if account.credit_limit is not None:
             return "❌ Credit card details already exist for this account."
 
         # Parse payment due date if provided
@@ -1351,9 +1347,8 @@ def _add_credit_card(
         # Validate card network if provided
         card_network_enum = None
         if card_network:
-            try:
-                card_network_enum = CardNetwork(card_network.lower())
-            except ValueError:
+            card_network_enum = CardNetwork.lookup(card_network)
+            if card_network_enum is None:
                 return f"❌ Invalid card network. Must be one of: {', '.join([n.value for n in CardNetwork])}"
 
         # Calculate credit utilization
@@ -1362,23 +1357,20 @@ def _add_credit_card(
             balance = abs(account.current_balance) if account.current_balance < 0 else 0
             credit_utilization = (balance / credit_limit) * 100
 
-        # Create credit card details
-        credit_card = CreditCard(
-            id=str(uuid.uuid4()),
-            account_id=account_id,
-            credit_limit=credit_limit,
-            available_credit=available_credit,
-            apr=apr if apr > 0 else None,
-            minimum_payment=minimum_payment,
-            payment_due_date=due_date,
-            card_network=card_network_enum,
-            credit_utilization=credit_utilization,
-        )
-
-        db.add(credit_card)
+        # Credit card details live on the account row itself
+        account.credit_limit = credit_limit
+        account.available_credit = available_credit
+        account.apr = apr if apr > 0 else None
+        account.minimum_payment = minimum_payment
+        account.payment_due_date = due_date
+        account.card_network = card_network_enum
+        account.credit_utilization = credit_utilization
+        account.grace_period_days = 21
+        account.alert_before_due_days = 3
+        account.autopay_enabled = False
+        account.autopay_amount = AutopayMode.MINIMUM
         db.flush()
         db.commit()
-        db.refresh(credit_card)
 
         result = f"✅ Credit card details added successfully!\n"
         result += f"Credit Limit: ${credit_limit:.2f}\n"
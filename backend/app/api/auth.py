@@ -1,8 +1,11 @@
 """
 Authentication utilities - JWT tokens and password hashing
 """
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
+import hashlib
+import threading
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -19,6 +22,27 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # JWT token scheme
 security = HTTPBearer()
 
+# Verified token payloads keyed by sha256(token), so an authenticated client
+# pays for signature verification once per TTL instead of once per request.
+# Optional - without cachetools every request is verified.
+try:
+    from cachetools import TTLCache
+
+    _decoded_tokens = TTLCache(maxsize=10_000, ttl=30)
+    TOKEN_CACHE_AVAILABLE = True
+except ImportError:
+    _decoded_tokens = None
+    TOKEN_CACHE_AVAILABLE = False
+
+_decoded_tokens_lock = threading.Lock()  # TTLCache is not thread-safe
+
+# Tokens already issued with the default lifetime, keyed by their claims.
+# JWTs are valid for every request until exp, so identical claims get the
+# same token back instead of a fresh signature.
+_issued_tokens: dict[str, tuple[str, datetime]] = {}
+_issued_tokens_lock = threading.Lock()
+_ISSUED_TOKENS_MAX = 10_000
+
 
 def hash_password(password: str) -> str:
     """Hash a password"""
@@ -31,25 +55,65 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    """Create a JWT access token"""
+    """
+    Create a JWT access token
+
+    With the default lifetime, a token previously issued for the same claims
+    is returned while it has more than TOKEN_REUSE_THRESHOLD_SECS left.
+    """
+    now = datetime.now(timezone.utc)
+    reuse_key = None
+
+    if expires_delta is None:
+        reuse_key = repr(sorted(data.items()))
+        with _issued_tokens_lock:
+            issued = _issued_tokens.get(reuse_key)
+        if issued is not None:
+            token, expire = issued
+            if (expire - now).total_seconds() > settings.TOKEN_REUSE_THRESHOLD_SECS:
+                return token
+
     to_encode = data.copy()
 
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
+    if reuse_key is not None:
+        with _issued_tokens_lock:
+            if len(_issued_tokens) >= _ISSUED_TOKENS_MAX:
+                # Drop expired entries before growing further
+                for key in [k for k, (_, exp) in _issued_tokens.items() if exp <= now]:
+                    del _issued_tokens[key]
+                # Still full: evict the oldest issued entry
+                if len(_issued_tokens) >= _ISSUED_TOKENS_MAX:
+                    del _issued_tokens[next(iter(_issued_tokens))]
+            _issued_tokens[reuse_key] = (encoded_jwt, expire)
+
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> dict:
-    """Decode and verify a JWT token"""
+    """Decode and verify a JWT token (memoized for a short TTL)"""
+    cache_key = None
+    if _decoded_tokens is not None:
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        with _decoded_tokens_lock:
+            payload = _decoded_tokens.get(cache_key)
+        # Re-check expiry so a cached entry never outlives the token itself
+        if payload is not None and payload.get("exp", 0) > time.time():
+            return dict(payload)
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
+        if cache_key is not None:
+            with _decoded_tokens_lock:
+                _decoded_tokens[cache_key] = payload
+        return dict(payload)
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -58,12 +122,16 @@ def decode_access_token(token: str) -> dict:
         )
 
 
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
 ) -> User:
     """
     Dependency to get the current authenticated user from JWT token
+
+    A plain `def` so FastAPI runs it in the threadpool - the sync lookup never
+    blocks the event loop, and it shares get_db (and its test overrides)
+    with the routes.
     """
     token = credentials.credentials
 
@@ -77,8 +145,8 @@ async def get_current_user(
             detail="Could not validate credentials",
         )
 
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    # Get user from database (primary-key lookup, served from the identity map when possible)
+    user = db.get(User, user_id)
 
     if user is None:
         raise HTTPException(
@@ -0,0 +1,178 @@
+"""
+Redis response cache for read-heavy GET endpoints
+
+Endpoints opt in with @cache_policy("short" | "normal" | "long"). Cached
+responses are stored per (method, path, user, query string) as a Redis hash of
+timestamp, stale_at, status, headers and body. Entries outlive their TTL by
+STALE_GRACE_SECONDS so that, if the endpoint fails (e.g., the database is down),
+the last good response is served instead of a 5xx. main.py only registers the
+middleware when at least one route has opted in.
+"""
+from typing import Callable, Iterable, Optional
+import hashlib
+import logging
+import time
+
+import orjson
+
+from fastapi import HTTPException
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Match
+
+from .auth import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+# Optional - requires the redis client
+try:
+    from redis import asyncio as aioredis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    RedisError = Exception
+    REDIS_AVAILABLE = False
+
+# Freshness per policy, in seconds
+CACHE_POLICIES = {
+    "short": 10,
+    "normal": 30,
+    "long": 300,
+}
+
+# How long past freshness an entry is kept as a fallback for failed requests
+STALE_GRACE_SECONDS = 3600
+
+CACHE_KEY_PREFIX = "respcache:"
+
+
+def cache_policy(name: str) -> Callable:
+    """
+    Mark a GET endpoint as cacheable under the named policy
+
+    Usage:
+        @router.get("/analytics/summary")
+        @cache_policy("normal")
+        async def summary(...): ...
+    """
+    if name not in CACHE_POLICIES:
+        raise ValueError(f"Unknown cache policy '{name}'. Valid: {', '.join(CACHE_POLICIES)}")
+
+    def decorator(func: Callable) -> Callable:
+        func.__cache_policy__ = name
+        return func
+
+    return decorator
+
+
+def has_cache_policy_routes(routes: Iterable) -> bool:
+    """True if any of the routes opted in with @cache_policy"""
+    return any(
+        getattr(getattr(route, "endpoint", None), "__cache_policy__", None) is not None
+        for route in routes
+    )
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """Serve opted-in GET endpoints from Redis, falling back to stale entries on errors"""
+
+    def __init__(self, app, redis_url: str):
+        super().__init__(app)
+        self.redis = aioredis.from_url(redis_url)
+
+    def _policy_for(self, request: Request) -> Optional[str]:
+        """Cache policy of the route this request resolves to, if any"""
+        for route in request.app.router.routes:
+            match, _ = route.matches(request.scope)
+            if match == Match.FULL:
+                return getattr(getattr(route, "endpoint", None), "__cache_policy__", None)
+        return None
+
+    @staticmethod
+    def _cache_key(request: Request) -> Optional[str]:
+        """Key per (method, path, user, query); None if the bearer token is invalid"""
+        user_id = "anonymous"
+        auth_header = request.headers.get("authorization", "")
+        if auth_header.lower().startswith("bearer "):
+            try:
+                user_id = decode_access_token(auth_header[7:]).get("sub") or "anonymous"
+            except HTTPException:
+                # Let the route reject it
+                return None
+
+        raw = "|".join((request.method, request.url.path, user_id, request.url.query))
+        return CACHE_KEY_PREFIX + hashlib.sha256(raw.encode()).hexdigest()
+
+    @staticmethod
+    def _to_response(entry: dict, cache_status: str) -> Response:
+        """Rebuild a response from a stored hash"""
+        headers = orjson.loads(entry[b"headers"])
+        headers["x-cache"] = cache_status
+        return Response(
+            content=entry[b"body"],
+            status_code=int(entry[b"status"]),
+            headers=headers,
+        )
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method != "GET":
+            return await call_next(request)
+
+        policy = self._policy_for(request)
+        if policy is None:
+            return await call_next(request)
+
+        key = self._cache_key(request)
+        if key is None:
+            return await call_next(request)
+
+        entry = {}
+        try:
+            entry = await self.redis.hgetall(key)
+        except RedisError as e:
+            logger.warning(f"Response cache read failed: {e}")
+
+        now = time.time()
+        if entry and float(entry[b"stale_at"]) > now:
+            return self._to_response(entry, "HIT")
+
+        try:
+            response = await call_next(request)
+        except Exception:
+            if entry:
+                logger.warning(f"Serving stale response for {request.url.path}")
+                return self._to_response(entry, "STALE")
+            raise
+
+        if response.status_code >= 500 and entry:
+            logger.warning(f"Serving stale response for {request.url.path} (upstream {response.status_code})")
+            return self._to_response(entry, "STALE")
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = dict(response.headers)
+
+        if response.status_code == 200:
+            ttl = CACHE_POLICIES[policy]
+            try:
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.hset(key, mapping={
+                        "timestamp": now,
+                        "stale_at": now + ttl,
+                        "status": response.status_code,
+                        "headers": orjson.dumps(headers),
+                        "body": body,
+                    })
+                    pipe.expire(key, ttl + STALE_GRACE_SECONDS)
+                    await pipe.execute()
+            except RedisError as e:
+                logger.warning(f"Response cache write failed: {e}")
+
+        headers["x-cache"] = "MISS"
+        return Response(
+            content=body,
+            status_code=response.status_code,
+            headers=headers,
+            media_type=response.media_type,
+        )
@@ -1,15 +1,23 @@
 # Add to the existing imports
+from typing import Annotated
+from pydantic import field_validator
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from ..database.models import GoalStatus, GoalProgressEntry
+from ..database.exceptions import handle_sqlalchemy_error
+from ..database.session import get_async_db
+from ..utils.ids import uuid7
 from ..utils.validators import FinancialValidator, FinancialValidationError
 
 class UpdateGoalProgressRequest(BaseModel):
     """Pydantic model for goal progress update"""
-    amount: float = Field(
-        ...,
+    amount: Annotated[float, Field(
         description="Amount to add to goal progress",
         gt=0,  # Must be positive
         le=1_000_000  # Maximum amount
-    )
-    date: Optional[str] = Field(
+    )]
+    date: datetime | None = Field(
         default=None,
         description="Date of progress update (optional, ISO format)"
     )
@@ -19,9 +27,13 @@ class UpdateGoalProgressRequest(BaseModel):
         max_length=500
     )
 
-    @validator('amount')
-    def validate_amount(cls, v):
-        """Validate progress amount"""
+    @field_validator('amount', mode='after')
+    @classmethod
+    def validate_amount(cls, v: float) -> float:
+        """Enforce 2-decimal precision (range is enforced by the field constraints)"""
+        if round(v, 2) == v:
+            return v
+
         try:
             # Use financial validator to ensure amount is valid
             validated_amount = FinancialValidator.validate_amount(
@@ -34,21 +46,17 @@ class UpdateGoalProgressRequest(BaseModel):
         except FinancialValidationError as e:
             raise ValueError(str(e))
 
-    @validator('date')
-    def validate_date(cls, v):
-        """Validate date format if provided"""
+    @field_validator('date', mode='after')
+    @classmethod
+    def validate_date(cls, v: datetime | None) -> datetime | None:
+        """Store offset-aware dates as naive UTC like every other timestamp"""
         if v is None:
             return v
+        return FinancialValidator.to_naive_utc(v)
 
-        try:
-            # Convert to datetime to validate format
-            datetime.fromisoformat(v.replace('Z', '+00:00'))
-            return v
-        except ValueError:
-            raise ValueError("Invalid date format. Use ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)")
-
-    @validator('description')
-    def validate_description(cls, v):
+    @field_validator('description', mode='after')
+    @classmethod
+    def validate_description(cls, v: Optional[str]) -> Optional[str]:
         """Sanitize description if provided"""
         if v is None:
             return v
@@ -62,24 +70,40 @@ class UpdateGoalProgressRequest(BaseModel):
         except FinancialValidationError as e:
             raise ValueError(str(e))
 
+def _record_progress(db: Session, entries: list[dict]) -> None:
+    """
+    Insert goal progress audit entries in a single batched statement
+
+    Uses the Core bulk path (insertmanyvalues) so callers recording many
+    entries at once - scripts, catch-up imports - get batched INSERTs
+    instead of one ORM flush per row. Does not commit.
+    """
+    if not entries:
+        return
+    db.execute(
+        insert(GoalProgressEntry).execution_options(insertmanyvalues_page_size=1000),
+        entries,
+    )
+
+
 @router.put("/goals/{goal_id}/progress")
-def update_goal_progress(
+async def update_goal_progress(
     goal_id: str,
     request: UpdateGoalProgressRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update goal progress with comprehensive validation"""
-    from ..database.models import GoalStatus, GoalProgressEntry
-    from ..database.exceptions import handle_sqlalchemy_error
-    from sqlalchemy.exc import SQLAlchemyError
+    _now = datetime.utcnow()
 
     try:
         # Find the goal and verify ownership
-        goal = db.query(Goal).filter(
-            Goal.id == goal_id,
-            Goal.user_id == current_user.id
-        ).first()
+        goal = await db.scalar(
+            select(Goal).where(
+                Goal.id == goal_id,
+                Goal.user_id == current_user.id
+            )
+        )
 
         if not goal:
             raise HTTPException(
@@ -89,37 +113,38 @@ def update_goal_progress(
 
         # Validate progress won't exceed target
         proposed_total = goal.current_amount + request.amount
-        if proposed_total > goal.target_amount:
-            # Option 1: Truncate to target amount
-            actual_amount = goal.target_amount - goal.current_amount
-            logger.warning(f"Progress amount exceeds goal. Truncating to {actual_amount}")
+        if proposed_total >= goal.target_amount:
+            if proposed_total > goal.target_amount:
+                # Option 1: Truncate to target amount
+                actual_amount = goal.target_amount - goal.current_amount
+                logger.warning(f"Progress amount exceeds goal. Truncating to {actual_amount}")
+            else:
+                actual_amount = request.amount
+
+            # Target reached - no need to divide to know it's 100%
+            goal.current_amount = goal.target_amount
+            progress_percentage = 100.0
+            goal.status = GoalStatus.COMPLETED
+            goal.completed_at = _now
         else:
             actual_amount = request.amount
-
-        # Update goal amount
-        goal.current_amount += actual_amount
-
-        # Determine goal status
-        progress_percentage = (goal.current_amount / goal.target_amount) * 100
-        if progress_percentage >= 100:
-            goal.status = GoalStatus.completed
-            goal.completed_at = datetime.utcnow()
+            goal.current_amount = proposed_total
+            progress_percentage = (proposed_total / goal.target_amount) * 100
 
         # Create progress entry for audit trail
-        progress_entry = GoalProgressEntry(
-            id=str(uuid.uuid4()),
-            goal_id=goal.id,
-            user_id=current_user.id,
-            amount=actual_amount,
-            date=datetime.fromisoformat(request.date.replace('Z', '+00:00')) if request.date else datetime.utcnow(),
-            description=request.description
-        )
-        db.add(progress_entry)
+        progress_entry_id = str(uuid7())
+        await db.run_sync(_record_progress, [{
+            "id": progress_entry_id,
+            "goal_id": goal.id,
+            "user_id": current_user.id,
+            "amount": actual_amount,
+            "date": request.date or _now,
+            "description": request.description,
+        }])
 
         # Commit changes
-        db.commit()
-        db.refresh(goal)
-        db.refresh(progress_entry)
+        await db.commit()
+        await db.refresh(goal)
 
         # Prepare response
         return {
@@ -129,10 +154,10 @@ def update_goal_progress(
             "current_amount": goal.current_amount,
             "progress_percentage": round(progress_percentage, 2),
             "target_date": goal.target_date.isoformat(),
-            "status": goal.status.value,
-            "progress_entry_id": progress_entry.id,
+            "status": goal.status,
+            "progress_entry_id": progress_entry_id,
             "message": "Goal progress updated successfully" +
-                      (" (goal completed!)" if goal.status == GoalStatus.completed else "")
+                      (" (goal completed!)" if goal.status == GoalStatus.COMPLETED else "")
         }
 
     except SQLAlchemyError as db_error:
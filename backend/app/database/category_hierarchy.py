@@ -2,20 +2,16 @@
 Category Hierarchy System
 Defines hierarchical category structure for budgeting and tracking
 """
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class CategoryNode:
     """Represents a category in the hierarchy"""
     name: str
     parent: Optional[str] = None
-    children: List[str] = None
-    
-    def __post_init__(self):
-        if self.children is None:
-            self.children = []
+    children: Tuple[str, ...] = ()
 
 
 class CategoryHierarchy:
@@ -83,17 +79,17 @@ class CategoryHierarchy:
     def _build_lookup(self):
         """Build parent-child lookup maps"""
         self.parent_map = {}  # child -> parent
-        self.children_map = {}  # parent -> [children]
+        self.children_map = {}  # parent -> (children,) - immutable once built
         
         for parent, config in self.hierarchy.items():
             if "children" in config:
-                self.children_map[parent] = config["children"]
+                self.children_map[parent] = tuple(config["children"])
                 for child in config["children"]:
                     self.parent_map[child] = parent
                     
                     # Check for nested children
                     if child in config:
-                        self.children_map[child] = config[child]
+                        self.children_map[child] = tuple(config[child])
                         for grandchild in config[child]:
                             self.parent_map[grandchild] = child
     
@@ -101,9 +97,9 @@ class CategoryHierarchy:
         """Get parent category"""
         return self.parent_map.get(category.lower())
     
-    def get_children(self, category: str) -> List[str]:
+    def get_children(self, category: str) -> Tuple[str, ...]:
         """Get direct children of a category"""
-        return self.children_map.get(category.lower(), [])
+        return self.children_map.get(category.lower(), ())
     
     def get_all_descendants(self, category: str) -> Set[str]:
         """Get all descendants (children, grandchildren, etc.)"""
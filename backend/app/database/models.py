@@ -1,13 +1,132 @@
 """
 SQLAlchemy Database Models
 """
-from sqlalchemy import Column, String, Float, DateTime, Boolean, Text, Enum as SQLEnum, ForeignKey, Integer, Index
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy import CHAR, Column, String, Float, Date, DateTime, Boolean, Text, ForeignKey, Integer, Index, CheckConstraint, DDL, FetchedValue, JSON, Numeric, and_, bindparam, event, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.orm import DeclarativeBase, relationship, validates
 from datetime import datetime
 import enum
 
-Base = declarative_base()
+from ..utils.ids import uuid7
+
+
+class Base(DeclarativeBase):
+    """Declarative base for all models (SQLAlchemy 2.0 style)"""
+
+
+# All relationships use lazy="raise_on_sql": an implicit lazy load (the classic
+# N+1 on list endpoints) raises instead of silently querying. Callers opt in with
+# selectinload()/joinedload() where a collection is actually consumed.
+
+# JSON payload columns: native JSONB on Postgres (parsed by the server, GIN-indexable),
+# plain JSON elsewhere. Values round-trip as dicts/lists - no json.loads at call sites.
+JSONType = JSON().with_variant(JSONB(), 'postgresql')
+
+# Exact NUMERIC storage for money and rates, so SUM()/comparisons in SQL are exact.
+# asdecimal=False keeps Python-side values as float for the float-based service math.
+Money = Numeric(18, 4, asdecimal=False)
+Rate = Numeric(7, 4, asdecimal=False)  # decimals (0.1999) and percentages up to 999.9999
+
+
+class utcnow(FunctionElement):
+    """Server-side current UTC timestamp (naive), matching the datetime.utcnow() values stored elsewhere"""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, 'postgresql')
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+
+class json_contains(FunctionElement):
+    """
+    JSON containment test: column holds every key/value of the given object
+
+    Compiles to jsonb `@>` on PostgreSQL so a jsonb_path_ops GIN index can serve
+    it; elsewhere falls back to one json_extract() comparison per key.
+    """
+    type = Boolean()
+    # The default compilation depends on the keys, not just the bound value
+    inherit_cache = False
+
+    def __init__(self, column, value: dict):
+        self.column = column
+        self.value = value
+        super().__init__(column, bindparam(None, value, type_=JSONType))
+
+
+@compiles(json_contains, 'postgresql')
+def _pg_json_contains(element, compiler, **kw):
+    column, value = element.clauses
+    return f"{compiler.process(column, **kw)} @> {compiler.process(value, **kw)}"
+
+
+@compiles(json_contains)
+def _default_json_contains(element, compiler, **kw):
+    return compiler.process(and_(*(
+        func.json_extract(element.column, f'$.{key}') == value
+        for key, value in element.value.items()
+    )), **kw)
+
+
+def _new_id() -> str:
+    """Default primary key: time-ordered UUIDv7 string, so inserts land on the right edge of the PK index"""
+    return str(uuid7())
+
+
+# created_at/updated_at on mutable tables are filled by the database: updated_at is
+# maintained by the set_updated_at() trigger (migrations/011; an equivalent
+# trigger on SQLite, see below), so flushes don't compute and bind a timestamp
+# for every dirty row.
+
+
+class CaseInsensitiveStrEnum(str, enum.Enum):
+    """String enum that accepts any casing of its values (e.g. "INCOME" -> INCOME)"""
+
+    @classmethod
+    def _missing_(cls, value):
+        """Handle case-insensitive lookup"""
+        if isinstance(value, str):
+            # Lowercase value -> member, built on the first miss so enums that only
+            # ever see canonical values never pay for it
+            ci_map = cls.__dict__.get('_ci_map')
+            if ci_map is None:
+                ci_map = {member.value.lower(): member for member in cls}
+                cls._ci_map = ci_map
+            # Exact values never reach here (Enum checks _value2member_map_ first);
+            # skip the .lower() copy when the input is already lowercase
+            return ci_map.get(value if value.islower() else value.lower())
+        return None
+
+    @classmethod
+    def lookup(cls, value):
+        """Resolve a value in any casing to its member, or None - no ValueError on bad input"""
+        member = cls._value2member_map_.get(value)
+        if member is None and isinstance(value, str):
+            member = cls._missing_(value)
+        return member
+
+
+def _enum_check(column: str, enum_cls: type, name: str) -> CheckConstraint:
+    """CHECK constraint limiting a plain String column to an enum's values"""
+    values = ", ".join(f"'{member.value}'" for member in enum_cls)
+    return CheckConstraint(f"{column} IN ({values})", name=name)
+
+
+def _enum_value(enum_cls: type, value):
+    """Canonical stored value for an enum column - accepts members or any-case strings"""
+    if value is None:
+        return None
+    return enum_cls(value).value
 
 
 class User(Base):
@@ -15,7 +134,7 @@ class User(Base):
     __tablename__ = "users"
     __table_args__ = {'comment': 'User accounts - stores authentication and personal information for each user of the financial planning system'}
 
-    id = Column(String, primary_key=True, comment='Unique user identifier (UUID format)')
+    id = Column(String, primary_key=True, default=_new_id, comment='Unique user identifier (UUID format)')
     email = Column(String, unique=True, nullable=False, index=True, comment='User email address - used for login and notifications (unique, indexed)')
     password_hash = Column(String, nullable=False, comment='Hashed password for authentication - never store plain text passwords')
     name = Column(String, nullable=False, comment='User full name or display name')
@@ -25,38 +144,28 @@ class User(Base):
     currency = Column(String, default="USD", comment='User preferred currency code (e.g., USD, EUR, INR) - all financial amounts are displayed in this currency')
     country = Column(String, nullable=True, comment='User country code (e.g., US, IN, GB) - used for localization and regulations')
 
-    created_at = Column(DateTime, default=datetime.utcnow, comment='Timestamp when the user account was created')
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='Timestamp when the user account was last modified')
+    created_at = Column(DateTime, server_default=utcnow(), comment='Timestamp when the user account was created')
+    updated_at = Column(DateTime, server_default=utcnow(), server_onupdate=FetchedValue(), comment='Timestamp when the user account was last modified')
 
     # Relationships
-    transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan")
-    debts_loans = relationship("DebtLoan", back_populates="user", cascade="all, delete-orphan")
-    goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan")
-    logs = relationship("Log", back_populates="user", cascade="all, delete-orphan")
-    insights = relationship("Insight", back_populates="user", cascade="all, delete-orphan")
-    budgets = relationship("Budget", back_populates="user", cascade="all, delete-orphan")
-    recurring_transactions = relationship("RecurringTransaction", back_populates="user", cascade="all, delete-orphan")
-    notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
-    accounts = relationship("Account", back_populates="user", cascade="all, delete-orphan")
-    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan")
-
-
-class TransactionType(str, enum.Enum):
+    transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql")
+    debts_loans = relationship("DebtLoan", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql")
+    goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql")
+    logs = relationship("Log", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql")
+    insights = relationship("Insight", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql")
+    budgets = relationship("Budget", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql")
+    recurring_transactions = relationship("RecurringTransaction", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql")
+    notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql")
+    accounts = relationship("Account", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql")
+    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql")
+
+
+class TransactionType(CaseInsensitiveStrEnum):
     """Transaction types - case insensitive"""
     INCOME = "income"
     EXPENSE = "expense"
     LENDING = "lending"
     BORROWING = "borrowing"
-    
-    @classmethod
-    def _missing_(cls, value):
-        """Handle case-insensitive lookup"""
-        if isinstance(value, str):
-            value_lower = value.lower()
-            for member in cls:
-                if member.value == value_lower:
-                    return member
-        return None
 
 
 class Transaction(Base):
@@ -64,30 +173,41 @@ class Transaction(Base):
     __tablename__ = "transactions"
     __table_args__ = (
         Index('ix_transactions_user_date', 'user_id', 'date'),
-        Index('ix_transactions_user_type', 'user_id', 'type'),
+        # Per-type windows grouped by category (advisor/budget analysis); INCLUDE makes them index-only on PG 11+
+        Index('ix_tx_user_type_date', 'user_id', 'type', 'date', postgresql_include=['category', 'amount']),
+        # Amount-window lookups for similar transactions (recurring detection)
+        Index('ix_tx_user_type_amt_date', 'user_id', 'type', 'amount', 'date', postgresql_include=['description', 'category']),
         Index('ix_transactions_user_category', 'user_id', 'category'),
         Index('ix_transactions_date', 'date'),
+        # Trigram similarity / ILIKE prefilter for recurring-pattern matching (pg_trgm)
+        Index('ix_tx_desc_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+        _enum_check('type', TransactionType, 'ck_transactions_type'),
         {'comment': 'Financial transactions - records all income, expenses, lending, and borrowing activities for users'}
     )
 
-    id = Column(String, primary_key=True, comment='Unique transaction identifier (UUID format)')
+    id = Column(String, primary_key=True, default=_new_id, comment='Unique transaction identifier (UUID format)')
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True, comment='Foreign key to users table - identifies which user this transaction belongs to (indexed)')
     account_id = Column(String, ForeignKey("accounts.id"), nullable=True, index=True, comment='Optional foreign key to accounts table - links transaction to a specific bank account (indexed)')
-    type = Column(SQLEnum(TransactionType, native_enum=False, create_constraint=False), nullable=False, comment='Transaction type: income (money earned), expense (money spent), lending (money lent to others), borrowing (money borrowed)')
+    type = Column(String(32), nullable=False, comment='Transaction type: income (money earned), expense (money spent), lending (money lent to others), borrowing (money borrowed)')
     special_type = Column(String, nullable=True, comment='Special transaction type: default, upcoming (future bill), subscription (recurring), repetitive (regular pattern), credit (lent to others), debt (borrowed from others)')
-    amount = Column(Float, nullable=False, comment='Transaction amount in the user currency - always positive, type determines if it increases or decreases net worth')
+    amount = Column(Money, nullable=False, comment='Transaction amount in the user currency - always positive, type determines if it increases or decreases net worth')
     description = Column(Text, nullable=False, comment='User-provided description of the transaction (e.g., "Groceries at Whole Foods", "Freelance payment")')
     category = Column(String, nullable=False, default="uncategorized", comment='Category for grouping transactions (e.g., food, transport, entertainment, salary) - used for spending analysis')
     category_id = Column(String, ForeignKey("categories.id"), nullable=True, comment='Optional foreign key to categories table for hierarchical category tracking')
     paired_transaction_id = Column(String, ForeignKey("transactions.id"), nullable=True, comment='For account transfers - links to the paired transaction (expense paired with income)')
     date = Column(DateTime, nullable=False, default=datetime.utcnow, comment='Date when the transaction occurred - can be different from created_at for backdated entries')
     recurring = Column(Boolean, default=False, comment='Boolean flag indicating if this is a recurring transaction (deprecated - use recurring_transactions table instead)')
-    extra_data = Column(Text, comment='JSON string for storing additional custom fields or metadata')
+    extra_data = Column(JSONType, comment='JSON object for storing additional custom fields or metadata')
     created_at = Column(DateTime, default=datetime.utcnow, comment='Timestamp when this transaction record was created in the system')
 
     # Relationships
-    user = relationship("User", back_populates="transactions")
-    account = relationship("Account", back_populates="transactions")
+    user = relationship("User", back_populates="transactions", lazy="raise_on_sql")
+    account = relationship("Account", back_populates="transactions", lazy="raise_on_sql")
+
+    @validates('type')
+    def _validate_enum_columns(self, key, value):
+        """Store enum columns as their canonical lowercase value"""
+        return _enum_value(TransactionType, value)
 
 
 # ============================================================================
@@ -95,7 +215,7 @@ class Transaction(Base):
 # ============================================================================
 
 
-class AccountType(str, enum.Enum):
+class AccountType(CaseInsensitiveStrEnum):
     """Account types following banking industry standards"""
     CHECKING = "checking"
     SAVINGS = "savings"
@@ -104,301 +224,287 @@ class AccountType(str, enum.Enum):
     CASH = "cash"
     OTHER = "other"
 
-    @classmethod
-    def _missing_(cls, value):
-        """Handle case-insensitive lookup"""
-        if isinstance(value, str):
-            value_lower = value.lower()
-            for member in cls:
-                if member.value == value_lower:
-                    return member
-        return None
-
 
-class AccountStatus(str, enum.Enum):
+class AccountStatus(CaseInsensitiveStrEnum):
     """Account status"""
     ACTIVE = "active"
     CLOSED = "closed"
     FROZEN = "frozen"
     PENDING = "pending"
 
-    @classmethod
-    def _missing_(cls, value):
-        """Handle case-insensitive lookup"""
-        if isinstance(value, str):
-            value_lower = value.lower()
-            for member in cls:
-                if member.value == value_lower:
-                    return member
-        return None
+
+class CardNetwork(CaseInsensitiveStrEnum):
+    """Credit card network/issuer"""
+    VISA = "visa"
+    MASTERCARD = "mastercard"
+    AMERICAN_EXPRESS = "american_express"
+    DISCOVER = "discover"
+    DINERS_CLUB = "diners_club"
+    JCB = "jcb"
+    UNIONPAY = "unionpay"
+    OTHER = "other"
+
+
+class AutopayMode(CaseInsensitiveStrEnum):
+    """How much an enabled card autopay pays each cycle"""
+    MINIMUM = "minimum"
+    STATEMENT_BALANCE = "statement_balance"
+    FULL_BALANCE = "full_balance"
+    CUSTOM = "custom"
 
 
 class Account(Base):
     """Bank accounts (checking, savings, credit cards, etc.)"""
     __tablename__ = "accounts"
-    __table_args__ = {'comment': 'Bank accounts - tracks checking, savings, credit cards, investment accounts, and other financial accounts'}
+    __table_args__ = (
+        _enum_check('account_type', AccountType, 'ck_accounts_account_type'),
+        _enum_check('status', AccountStatus, 'ck_accounts_status'),
+        _enum_check('card_network', CardNetwork, 'ck_accounts_card_network'),
+        _enum_check('autopay_amount', AutopayMode, 'ck_accounts_autopay_amount'),
+        # Credit card fields stay NULL on every other account type
+        CheckConstraint("account_type = 'credit_card' OR credit_limit IS NULL", name='ck_accounts_credit_fields'),
+        # "Cards near their limit" lookups only ever need the high-utilization rows
+        Index('ix_accounts_util_high', 'credit_utilization', postgresql_where=text('credit_utilization > 70')),
+        # Upcoming bills: WHERE user_id = ? AND payment_due_date BETWEEN ? AND ? ORDER BY payment_due_date
+        Index('ix_accounts_user_due', 'user_id', 'payment_due_date', postgresql_where=text('payment_due_date IS NOT NULL')),
+        {'comment': 'Bank accounts - tracks checking, savings, credit cards, investment accounts, and other financial accounts'}
+    )
 
-    id = Column(String, primary_key=True, comment='Unique account identifier (UUID format)')
+    id = Column(String, primary_key=True, default=_new_id, comment='Unique account identifier (UUID format)')
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True, comment='Foreign key to users table - identifies which user owns this account (indexed)')
 
     # Account Details
-    account_type = Column(SQLEnum(AccountType, native_enum=False, create_constraint=False), nullable=False, comment='Type of account: checking, savings, credit_card, investment, cash, or other')
+    account_type = Column(String(32), nullable=False, comment='Type of account: checking, savings, credit_card, investment, cash, or other')
     account_name = Column(String, nullable=False, comment='User-friendly name for the account (e.g., "Chase Checking", "Emergency Savings Fund")')
     institution_name = Column(String, nullable=True, comment='Name of the bank or financial institution (e.g., "Chase Bank", "Wells Fargo")')
     account_number_last4 = Column(String, nullable=True, comment='Last 4 digits of account number for identification - stored for security (never store full account numbers)')
 
     # Financial Data
-    current_balance = Column(Float, default=0.0, comment='Current account balance in user currency - updated when transactions are added or account is synced')
-    currency = Column(String, default="USD", comment='Currency code for this account (e.g., USD, EUR) - may differ from user default currency')
+    current_balance = Column(Money, default=0.0, comment='Current account balance in user currency - updated when transactions are added or account is synced')
+    currency = Column(CHAR(3), default="USD", comment='ISO 4217 currency code for this account (e.g., USD, EUR) - may differ from user default currency')
 
     # Account Status & Metadata
-    status = Column(SQLEnum(AccountStatus, native_enum=False, create_constraint=False), default=AccountStatus.ACTIVE, comment='Account status: active (currently in use), closed (no longer active), frozen (temporarily suspended), pending (awaiting activation)')
+    status = Column(String(32), default=AccountStatus.ACTIVE.value, comment='Account status: active (currently in use), closed (no longer active), frozen (temporarily suspended), pending (awaiting activation)')
     opening_date = Column(DateTime, nullable=True, comment='Date when the account was opened at the financial institution')
     closing_date = Column(DateTime, nullable=True, comment='Date when the account was closed (null if still active)')
-    interest_rate = Column(Float, nullable=True, comment='Annual interest rate as decimal (e.g., 0.025 for 2.5%) - applicable for savings accounts')
+    interest_rate = Column(Rate, nullable=True, comment='Annual interest rate as decimal (e.g., 0.025 for 2.5%) - applicable for savings accounts')
+
+    # Credit card fields - only set on credit_card accounts (NULL for every other type)
+    credit_limit = Column(Money, nullable=True, comment='Credit card: total credit limit available on this card')
+    available_credit = Column(Money, nullable=True, comment='Credit card: currently available credit (credit_limit minus current balance)')
+    credit_utilization = Column(Float, nullable=True, comment='Credit card: utilization percentage - calculated as (balance / credit_limit) * 100 - important for credit score')
+
+    # Credit card APR & fees
+    apr = Column(Rate, nullable=True, comment='Credit card: Annual Percentage Rate charged on unpaid balances (as decimal, e.g., 0.1999 for 19.99%)')
+    annual_fee = Column(Money, nullable=True, comment='Credit card: yearly fee charged for having this card')
+    late_fee = Column(Money, nullable=True, comment='Credit card: fee charged when payment is late')
+    foreign_transaction_fee_percent = Column(Rate, nullable=True, comment='Credit card: fee percentage charged on foreign currency transactions (e.g., 0.03 for 3%)')
+
+    # Credit card statement & payment info
+    statement_balance = Column(Money, nullable=True, comment='Credit card: balance shown on the most recent statement')
+    minimum_payment = Column(Money, nullable=True, comment='Credit card: minimum payment amount due for the current billing cycle')
+    statement_date = Column(DateTime, nullable=True, comment='Credit card: date when the statement is generated each billing cycle')
+    payment_due_date = Column(DateTime, nullable=True, comment='Credit card: date when payment is due - used for bill reminders (indexed by ix_accounts_user_due)')
+    last_payment_date = Column(DateTime, nullable=True, comment='Credit card: date of the most recent payment made')
+    last_payment_amount = Column(Money, nullable=True, comment='Credit card: amount of the most recent payment')
+
+    # Credit card details
+    card_network = Column(String(32), nullable=True, comment='Credit card network/issuer: visa, mastercard, american_express, discover, diners_club, jcb, unionpay, other')
+    card_last4 = Column(String, nullable=True, comment='Credit card: last 4 digits of the card number for identification')
+    cardholder_name = Column(String, nullable=True, comment='Credit card: name printed on the card')
+    expiration_month = Column(Integer, nullable=True, comment='Credit card: expiration month (1-12)')
+    expiration_year = Column(Integer, nullable=True, comment='Credit card: expiration year (4-digit format, e.g., 2027)')
+
+    # Credit card rewards, grace period & alerts
+    rewards_program = Column(String, nullable=True, comment='Credit card: type of rewards program (e.g., "Cash Back", "Points", "Miles")')
+    rewards_balance = Column(Money, nullable=True, comment='Credit card: current rewards balance - points, miles, or cash back amount accumulated')
+    cashback_rate = Column(Rate, nullable=True, comment='Credit card: cash back rate as decimal (e.g., 0.015 for 1.5% cash back)')
+    grace_period_days = Column(Integer, nullable=True, comment='Credit card: number of days before interest is charged on new purchases (typically 21-25 days)')
+    alert_before_due_days = Column(Integer, nullable=True, comment='Credit card: number of days before due date to send payment reminder')
+    autopay_enabled = Column(Boolean, nullable=True, comment='Credit card: whether automatic payments are enabled')
+    autopay_amount = Column(String(32), nullable=True, comment='Credit card autopay setting: minimum (pay minimum), statement_balance (pay full statement), full_balance (pay entire balance), custom (fixed amount)')
 
     # Additional Data
     notes = Column(Text, nullable=True, comment='User notes or additional information about this account')
-    extra_data = Column(Text, comment='JSON string for storing custom fields or additional metadata')
-
-    created_at = Column(DateTime, default=datetime.utcnow, comment='Timestamp when this account was added to the system')
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='Timestamp when this account was last modified')
-
-    # Relationships
-    user = relationship("User", back_populates="accounts")
-    transactions = relationship("Transaction", back_populates="account", cascade="all, delete-orphan")
-    credit_card_details = relationship("CreditCard", back_populates="account", uselist=False, cascade="all, delete-orphan")
-
-
-class CardNetwork(str, enum.Enum):
-    """Credit card network/issuer"""
-    VISA = "visa"
-    MASTERCARD = "mastercard"
-    AMERICAN_EXPRESS = "american_express"
-    DISCOVER = "discover"
-    DINERS_CLUB = "diners_club"
-    JCB = "jcb"
-    UNIONPAY = "unionpay"
-    OTHER = "other"
-
-    @classmethod
-    def _missing_(cls, value):
-        """Handle case-insensitive lookup"""
-        if isinstance(value, str):
-            value_lower = value.lower()
-            for member in cls:
-                if member.value == value_lower:
-                    return member
-        return None
+    extra_data = Column(JSONType, comment='JSON object for storing custom fields or additional metadata')
 
-
-class CreditCard(Base):
-    """Credit card specific details - extends Account model
-
-    Industry standard credit card fields following best practices
-    for personal finance management applications.
-    """
-    __tablename__ = "credit_cards"
-    __table_args__ = {'comment': 'Credit card details - extends accounts table with credit-card-specific fields like credit limit, APR, payment dates, and rewards'}
-
-    id = Column(String, primary_key=True, comment='Unique credit card record identifier (UUID format)')
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False, unique=True, index=True, comment='Foreign key to accounts table - links to the parent credit card account (unique, indexed)')
-
-    # Credit Card Specific Fields
-    credit_limit = Column(Float, nullable=False, comment='Total credit limit available on this card')
-    available_credit = Column(Float, nullable=False, comment='Currently available credit (credit_limit minus current balance)')
-
-    # APR & Fees (Industry Standard)
-    apr = Column(Float, nullable=True, comment='Annual Percentage Rate - interest rate charged on unpaid balances (as decimal, e.g., 0.1999 for 19.99%)')
-    annual_fee = Column(Float, default=0.0, comment='Yearly fee charged for having this credit card')
-    late_fee = Column(Float, default=0.0, comment='Fee charged when payment is late')
-    foreign_transaction_fee_percent = Column(Float, default=0.0, comment='Fee percentage charged on foreign currency transactions (e.g., 0.03 for 3%)')
-
-    # Statement & Payment Info
-    statement_balance = Column(Float, default=0.0, comment='Balance shown on the most recent statement')
-    minimum_payment = Column(Float, default=0.0, comment='Minimum payment amount due for the current billing cycle')
-    statement_date = Column(DateTime, nullable=True, comment='Date when the statement is generated each billing cycle')
-    payment_due_date = Column(DateTime, nullable=True, index=True, comment='Date when payment is due - used for bill reminders (indexed for efficient querying of upcoming due dates)')
-    last_payment_date = Column(DateTime, nullable=True, comment='Date of the most recent payment made')
-    last_payment_amount = Column(Float, default=0.0, comment='Amount of the most recent payment')
-
-    # Card Details
-    card_network = Column(SQLEnum(CardNetwork, native_enum=False, create_constraint=False), nullable=True, comment='Card network/issuer: visa, mastercard, american_express, discover, diners_club, jcb, unionpay, other')
-    card_last4 = Column(String, nullable=True, comment='Last 4 digits of the credit card number for identification')
-    cardholder_name = Column(String, nullable=True, comment='Name printed on the credit card')
-    expiration_month = Column(Integer, nullable=True, comment='Card expiration month (1-12)')
-    expiration_year = Column(Integer, nullable=True, comment='Card expiration year (4-digit format, e.g., 2027)')
-
-    # Rewards & Benefits
-    rewards_program = Column(String, nullable=True, comment='Type of rewards program (e.g., "Cash Back", "Points", "Miles")')
-    rewards_balance = Column(Float, default=0.0, comment='Current rewards balance - points, miles, or cash back amount accumulated')
-    cashback_rate = Column(Float, nullable=True, comment='Cash back rate as decimal (e.g., 0.015 for 1.5% cash back)')
-
-    # Grace Period & Credit Features
-    grace_period_days = Column(Integer, default=21, comment='Number of days before interest is charged on new purchases (typically 21-25 days)')
-    credit_utilization = Column(Float, default=0.0, comment='Credit utilization percentage - calculated as (balance / credit_limit) * 100 - important for credit score')
-
-    # Alerts & Preferences
-    alert_before_due_days = Column(Integer, default=3, comment='Number of days before due date to send payment reminder (default 3 days)')
-    autopay_enabled = Column(Boolean, default=False, comment='Whether automatic payments are enabled for this card')
-    autopay_amount = Column(String, default="minimum", comment='Autopay setting: minimum (pay minimum), statement_balance (pay full statement), full_balance (pay entire balance), custom (fixed amount)')
-
-    # Additional Data
-    extra_data = Column(Text, comment='JSON string for custom fields and additional metadata')
-
-    created_at = Column(DateTime, default=datetime.utcnow, comment='Timestamp when this credit card record was created')
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='Timestamp when this credit card record was last modified')
+    created_at = Column(DateTime, server_default=utcnow(), comment='Timestamp when this account was added to the system')
+    updated_at = Column(DateTime, server_default=utcnow(), server_onupdate=FetchedValue(), comment='Timestamp when this account was last modified')
 
     # Relationships
-    account = relationship("Account", back_populates="credit_card_details")
-
-
-class DebtLoanType(str, enum.Enum):
+    user = relationship("User", back_populates="accounts", lazy="raise_on_sql")
+    transactions = relationship("Transaction", back_populates="account", cascade="all, delete-orphan", lazy="raise_on_sql")
+
+    @validates('account_type', 'status', 'card_network', 'autopay_amount')
+    def _validate_enum_columns(self, key, value):
+        """Store enum columns as their canonical lowercase value"""
+        enum_cls = {
+            'account_type': AccountType,
+            'status': AccountStatus,
+            'card_network': CardNetwork,
+            'autopay_amount': AutopayMode,
+        }[key]
+        return _enum_value(enum_cls, value)
+
+
+class DebtLoanType(CaseInsensitiveStrEnum):
     """Debt/Loan types"""
     DEBT = "debt"
     LOAN = "loan"
-    
-    @classmethod
-    def _missing_(cls, value):
-        """Make enum case-insensitive"""
-        if isinstance(value, str):
-            value = value.lower()
-            for member in cls:
-                if member.value == value:
-                    return member
-        return None
 
 
-class DebtLoanStatus(str, enum.Enum):
+class DebtLoanStatus(CaseInsensitiveStrEnum):
     """Status of debt/loan"""
     ACTIVE = "active"
     PAID_OFF = "paid_off"
     DEFAULTED = "defaulted"
-    
-    @classmethod
-    def _missing_(cls, value):
-        """Make enum case-insensitive"""
-        if isinstance(value, str):
-            value = value.lower()
-            for member in cls:
-                if member.value == value:
-                    return member
-        return None
 
 
 class DebtLoan(Base):
     """Debt and loan tracking"""
     __tablename__ = "debts_loans"
-    __table_args__ = {'comment': 'Debts and loans - tracks money owed (debts) and money lent to others (loans) with interest rates and payment schedules'}
+    __table_args__ = (
+        _enum_check('type', DebtLoanType, 'ck_debts_loans_type'),
+        _enum_check('status', DebtLoanStatus, 'ck_debts_loans_status'),
+        {'comment': 'Debts and loans - tracks money owed (debts) and money lent to others (loans) with interest rates and payment schedules'}
+    )
 
-    id = Column(String, primary_key=True, comment='Unique debt/loan identifier (UUID format)')
+    id = Column(String, primary_key=True, default=_new_id, comment='Unique debt/loan identifier (UUID format)')
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True, comment='Foreign key to users table - identifies which user this debt/loan belongs to (indexed)')
-    type = Column(SQLEnum(DebtLoanType, native_enum=False, create_constraint=False), nullable=False, comment='Type: debt (money user owes to others), loan (money user lent to others)')
+    type = Column(String(32), nullable=False, comment='Type: debt (money user owes to others), loan (money user lent to others)')
     name = Column(String, nullable=False, comment='Name or description of the debt/loan (e.g., "Student Loan", "Credit Card Debt", "Loan to John")')
-    principal_amount = Column(Float, nullable=False, comment='Original amount borrowed or lent')
-    remaining_amount = Column(Float, nullable=False, comment='Current outstanding balance - decreases as payments are made')
-    interest_rate = Column(Float, nullable=False, comment='Annual interest rate as percentage (e.g., 5.5 for 5.5% APR)')
+    principal_amount = Column(Money, nullable=False, comment='Original amount borrowed or lent')
+    remaining_amount = Column(Money, nullable=False, comment='Current outstanding balance - decreases as payments are made')
+    interest_rate = Column(Rate, nullable=False, comment='Annual interest rate as percentage (e.g., 5.5 for 5.5% APR)')
     start_date = Column(DateTime, nullable=False, comment='Date when the debt/loan was initiated')
-    monthly_payment = Column(Float, nullable=False, comment='Regular monthly payment amount')
-    status = Column(SQLEnum(DebtLoanStatus, native_enum=False, create_constraint=False), default=DebtLoanStatus.ACTIVE, comment='Status: active (currently being paid), paid_off (fully paid), defaulted (failed to pay)')
-    extra_data = Column(Text, comment='JSON string for repayment schedule, additional terms, or custom metadata')
-    created_at = Column(DateTime, default=datetime.utcnow, comment='Timestamp when this debt/loan record was created')
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='Timestamp when this debt/loan record was last modified')
+    monthly_payment = Column(Money, nullable=False, comment='Regular monthly payment amount')
+    status = Column(String(32), default=DebtLoanStatus.ACTIVE.value, comment='Status: active (currently being paid), paid_off (fully paid), defaulted (failed to pay)')
+    extra_data = Column(JSONType, comment='JSON object for repayment schedule, additional terms, or custom metadata')
+    created_at = Column(DateTime, server_default=utcnow(), comment='Timestamp when this debt/loan record was created')
+    updated_at = Column(DateTime, server_default=utcnow(), server_onupdate=FetchedValue(), comment='Timestamp when this debt/loan record was last modified')
 
     # Relationships
-    user = relationship("User", back_populates="debts_loans")
+    user = relationship("User", back_populates="debts_loans", lazy="raise_on_sql")
 
+    @validates('type', 'status')
+    def _validate_enum_columns(self, key, value):
+        """Store enum columns as their canonical lowercase value"""
+        return _enum_value(DebtLoanType if key == 'type' else DebtLoanStatus, value)
 
-class GoalStatus(str, enum.Enum):
+
+class GoalStatus(CaseInsensitiveStrEnum):
     """Goal status"""
     ACTIVE = "active"
     COMPLETED = "completed"
     ABANDONED = "abandoned"
-    
-    @classmethod
-    def _missing_(cls, value):
-        """Make enum case-insensitive"""
-        if isinstance(value, str):
-            value = value.lower()
-            for member in cls:
-                if member.value == value:
-                    return member
-        return None
 
 
 class Goal(Base):
     """Financial goal"""
     __tablename__ = "goals"
-    __table_args__ = {'comment': 'Financial goals - tracks savings targets like emergency funds, vacations, down payments, or other financial objectives'}
+    __table_args__ = (
+        _enum_check('status', GoalStatus, 'ck_goals_status'),
+        {'comment': 'Financial goals - tracks savings targets like emergency funds, vacations, down payments, or other financial objectives'}
+    )
 
-    id = Column(String, primary_key=True, comment='Unique goal identifier (UUID format)')
+    id = Column(String, primary_key=True, default=_new_id, comment='Unique goal identifier (UUID format)')
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True, comment='Foreign key to users table - identifies which user this goal belongs to (indexed)')
     name = Column(String, nullable=False, comment='Goal name or description (e.g., "Emergency Fund", "Vacation to Japan", "Down Payment")')
-    target_amount = Column(Float, nullable=False, comment='Target amount to save for this goal')
-    current_amount = Column(Float, default=0.0, comment='Amount saved so far towards this goal - updated manually or automatically')
+    target_amount = Column(Money, nullable=False, comment='Target amount to save for this goal')
+    current_amount = Column(Money, default=0.0, comment='Amount saved so far towards this goal - updated manually or automatically')
     target_date = Column(DateTime, nullable=False, comment='Target date to achieve this goal')
-    status = Column(SQLEnum(GoalStatus, native_enum=False, create_constraint=False), default=GoalStatus.ACTIVE, comment='Status: active (currently working towards), completed (goal achieved), abandoned (user stopped pursuing)')
+    status = Column(String(32), default=GoalStatus.ACTIVE.value, comment='Status: active (currently working towards), completed (goal achieved), abandoned (user stopped pursuing)')
     priority = Column(Integer, default=1, comment='Priority level for this goal (1=lowest, higher numbers=higher priority) - used for ranking multiple goals')
-    extra_data = Column(Text, comment='JSON string for custom fields or additional metadata')
-    created_at = Column(DateTime, default=datetime.utcnow, comment='Timestamp when this goal was created')
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='Timestamp when this goal was last modified')
+    extra_data = Column(JSONType, comment='JSON object for custom fields or additional metadata')
+    created_at = Column(DateTime, server_default=utcnow(), comment='Timestamp when this goal was created')
+    updated_at = Column(DateTime, server_default=utcnow(), server_onupdate=FetchedValue(), comment='Timestamp when this goal was last modified')
+
+    # Relationships
+    user = relationship("User", back_populates="goals", lazy="raise_on_sql")
+    progress_entries = relationship("GoalProgressEntry", back_populates="goal", cascade="all, delete-orphan", lazy="raise_on_sql")
+
+    @validates('status')
+    def _validate_enum_columns(self, key, value):
+        """Store enum columns as their canonical lowercase value"""
+        return _enum_value(GoalStatus, value)
+
+
+class GoalProgressEntry(Base):
+    """Audit trail of contributions towards a goal"""
+    __tablename__ = "goal_progress_entries"
+    __table_args__ = {'comment': 'Goal progress entries - audit trail of every amount added towards a financial goal'}
+
+    id = Column(String, primary_key=True, default=_new_id, comment='Unique progress entry identifier (UUID format)')
+    goal_id = Column(String, ForeignKey("goals.id"), nullable=False, index=True, comment='Foreign key to goals table - identifies which goal this contribution belongs to (indexed)')
+    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True, comment='Foreign key to users table - identifies which user made this contribution (indexed)')
+    amount = Column(Money, nullable=False, comment='Amount added to the goal by this entry (after truncation to the remaining target)')
+    date = Column(DateTime, nullable=False, default=datetime.utcnow, comment='Date of the contribution - can be backdated by the user')
+    description = Column(Text, nullable=True, comment='Optional user-provided note for this contribution')
+    created_at = Column(DateTime, default=datetime.utcnow, comment='Timestamp when this progress entry was recorded')
 
     # Relationships
-    user = relationship("User", back_populates="goals")
+    goal = relationship("Goal", back_populates="progress_entries", lazy="raise_on_sql")
 
 
 class Log(Base):
     """Activity log"""
     __tablename__ = "logs"
-    __table_args__ = {'comment': 'Activity logs - audit trail of user actions and system events for security and debugging'}
-
-    id = Column(String, primary_key=True, comment='Unique log entry identifier (UUID format)')
+    __table_args__ = {
+        'comment': 'Activity logs - audit trail of user actions and system events for security and debugging',
+        'postgresql_partition_by': 'RANGE (created_at)',
+    }
+    # Append-only: never fetch server-generated values back after INSERT (no per-row RETURNING)
+    __mapper_args__ = {'eager_defaults': False}
+
+    id = Column(String, primary_key=True, default=_new_id, comment='Unique log entry identifier (UUID format)')
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True, comment='Foreign key to users table - identifies which user performed the action (indexed)')
     action = Column(String, nullable=False, comment='Action performed (e.g., "login", "add_transaction", "update_goal", "delete_account")')
-    details = Column(Text, comment='JSON string with detailed information about the action including parameters and results')
+    details = Column(JSONType, comment='JSON object with detailed information about the action including parameters and results')
     category = Column(String, default="general", comment='Log category for filtering (e.g., "auth", "transaction", "goal", "general")')
     ip_address = Column(String, comment='IP address from which the action was performed - for security auditing')
-    created_at = Column(DateTime, default=datetime.utcnow, index=True, comment='Timestamp when the action was performed (indexed for efficient time-based queries)')
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, index=True, comment='Timestamp when the action was performed - monthly partition key, part of the primary key (indexed)')
 
     # Relationships
-    user = relationship("User", back_populates="logs")
+    user = relationship("User", back_populates="logs", lazy="raise_on_sql")
 
 
-class InsightType(str, enum.Enum):
+class InsightType(CaseInsensitiveStrEnum):
     """Insight types"""
     DEBT = "debt"
     SAVINGS = "savings"
     SPENDING = "spending"
     GOAL = "goal"
     GENERAL = "general"
-    
-    @classmethod
-    def _missing_(cls, value):
-        """Make enum case-insensitive"""
-        if isinstance(value, str):
-            value = value.lower()
-            for member in cls:
-                if member.value == value:
-                    return member
-        return None
 
 
 class Insight(Base):
     """AI-generated insights"""
     __tablename__ = "insights"
-    __table_args__ = {'comment': 'AI-generated insights - personalized financial recommendations and observations generated by the AI agent'}
+    __table_args__ = (
+        _enum_check('type', InsightType, 'ck_insights_type'),
+        {
+            'comment': 'AI-generated insights - personalized financial recommendations and observations generated by the AI agent',
+            'postgresql_partition_by': 'RANGE (created_at)',
+        }
+    )
+    __mapper_args__ = {'eager_defaults': False}
 
-    id = Column(String, primary_key=True, comment='Unique insight identifier (UUID format)')
+    id = Column(String, primary_key=True, default=_new_id, comment='Unique insight identifier (UUID format)')
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True, comment='Foreign key to users table - identifies which user this insight is for (indexed)')
-    type = Column(SQLEnum(InsightType, native_enum=False, create_constraint=False), nullable=False, comment='Insight type: debt (debt-related advice), savings (savings recommendations), spending (spending patterns), goal (goal progress), general (other insights)')
+    type = Column(String(32), nullable=False, comment='Insight type: debt (debt-related advice), savings (savings recommendations), spending (spending patterns), goal (goal progress), general (other insights)')
     message = Column(Text, nullable=False, comment='The insight message text - explains the observation or recommendation to the user')
     priority = Column(Integer, default=1, comment='Priority level (1=low, 2=medium, 3=high) - higher priority insights shown first')
     is_read = Column(Boolean, default=False, comment='Boolean flag indicating if the user has read this insight')
-    extra_data = Column(Text, comment='JSON string with supporting data, calculations, or additional context')
-    created_at = Column(DateTime, default=datetime.utcnow, index=True, comment='Timestamp when this insight was generated (indexed)')
+    extra_data = Column(JSONType, comment='JSON object with supporting data, calculations, or additional context')
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, index=True, comment='Timestamp when this insight was generated - monthly partition key, part of the primary key (indexed)')
 
     # Relationships
-    user = relationship("User", back_populates="insights")
+    user = relationship("User", back_populates="insights", lazy="raise_on_sql")
+
+    @validates('type')
+    def _validate_enum_columns(self, key, value):
+        """Store enum columns as their canonical lowercase value"""
+        return _enum_value(InsightType, value)
 
 
 # ============================================================================
@@ -411,27 +517,39 @@ class Budget(Base):
     __tablename__ = "budgets"
     __table_args__ = (
         Index('ix_budgets_user_category', 'user_id', 'category'),
+        Index('ix_budgets_active_category', 'user_id', 'category', postgresql_where=text('is_active')),
         {'comment': 'Budgets - spending limits by category for monthly, weekly, or yearly periods'}
     )
 
-    id = Column(String, primary_key=True, comment='Unique budget identifier (UUID format)')
+    id = Column(String, primary_key=True, default=_new_id, comment='Unique budget identifier (UUID format)')
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True, comment='Foreign key to users table - identifies which user this budget belongs to (indexed)')
     category = Column(String, nullable=False, index=True, comment='Category this budget applies to (e.g., food, transport, entertainment) - must match transaction categories (indexed)')
-    amount = Column(Float, nullable=False, comment='Budget limit amount for this category in the specified period')
+    amount = Column(Money, nullable=False, comment='Budget limit amount for this category in the specified period')
     period = Column(String, default="monthly", comment='Budget period: monthly (most common), weekly, or yearly')
     start_date = Column(DateTime, nullable=False, comment='Date when this budget becomes effective')
     end_date = Column(DateTime, nullable=True, comment='Date when this budget expires (null means ongoing/indefinite)')
     is_active = Column(Boolean, default=True, comment='Boolean flag indicating if this budget is currently active')
-    alert_threshold = Column(Float, default=0.9, comment='Percentage of budget at which to send alert (e.g., 0.9 for 90%) - triggers notification when spending reaches this level')
-    extra_data = Column(Text, comment='JSON string for custom fields or additional metadata')
-    created_at = Column(DateTime, default=datetime.utcnow, comment='Timestamp when this budget was created')
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='Timestamp when this budget was last modified')
+    alert_threshold = Column(Rate, default=0.9, comment='Percentage of budget at which to send alert (e.g., 0.9 for 90%) - triggers notification when spending reaches this level')
+    extra_data = Column(JSONType, comment='JSON object for custom fields or additional metadata')
+    created_at = Column(DateTime, server_default=utcnow(), comment='Timestamp when this budget was created')
+    updated_at = Column(DateTime, server_default=utcnow(), server_onupdate=FetchedValue(), comment='Timestamp when this budget was last modified')
 
     # Relationships
-    user = relationship("User", back_populates="budgets")
+    user = relationship("User", back_populates="budgets", lazy="raise_on_sql")
+
+
+class DailyCategorySpend(Base):
+    """Expense totals per user, category and day (maintained by trigger on PostgreSQL)"""
+    __tablename__ = "daily_category_spend"
+    __table_args__ = {'comment': 'Daily category spend - expense totals per user/category/day kept in sync with transactions by the trg_transactions_daily_spend trigger; budget and category reports sum days instead of transactions'}
+
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, comment='Foreign key to users table - whose spending this is')
+    category = Column(String, primary_key=True, comment='Transaction category - empty string for uncategorized (null category) expenses')
+    day = Column(Date, primary_key=True, comment='Day of the transactions (date part of transactions.date)')
+    total = Column(Money, nullable=False, default=0, comment='Sum of expense amounts for this user, category and day')
 
 
-class RecurrenceFrequency(str, enum.Enum):
+class RecurrenceFrequency(CaseInsensitiveStrEnum):
     """Recurrence frequency options - case insensitive"""
     DAILY = "daily"
     WEEKLY = "weekly"
@@ -440,16 +558,6 @@ class RecurrenceFrequency(str, enum.Enum):
     QUARTERLY = "quarterly"
     YEARLY = "yearly"
     
-    @classmethod
-    def _missing_(cls, value):
-        """Handle case-insensitive lookup"""
-        if isinstance(value, str):
-            value_lower = value.lower()
-            for member in cls:
-                if member.value == value_lower:
-                    return member
-        return None
-    
     def __str__(self):
         """Return the lowercase value for database storage"""
         return self.value
@@ -458,30 +566,42 @@ class RecurrenceFrequency(str, enum.Enum):
 class RecurringTransaction(Base):
     """Scheduled recurring transactions and bills"""
     __tablename__ = "recurring_transactions"
-    __table_args__ = {'comment': 'Recurring transactions - scheduled bills, subscriptions, and regular income like salary'}
+    __table_args__ = (
+        _enum_check('type', TransactionType, 'ck_recurring_transactions_type'),
+        _enum_check('frequency', RecurrenceFrequency, 'ck_recurring_transactions_frequency'),
+        # Partial indexes - the scheduler scan and per-user listings only ever touch active rows
+        Index('ix_rt_due_active', 'next_date', postgresql_where=text('is_active')),
+        Index('ix_rt_user_active', 'user_id', postgresql_where=text('is_active')),
+        {'comment': 'Recurring transactions - scheduled bills, subscriptions, and regular income like salary'}
+    )
 
-    id = Column(String, primary_key=True, comment='Unique recurring transaction identifier (UUID format)')
+    id = Column(String, primary_key=True, default=_new_id, comment='Unique recurring transaction identifier (UUID format)')
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True, comment='Foreign key to users table - identifies which user this recurring transaction belongs to (indexed)')
-    type = Column(SQLEnum(TransactionType, native_enum=False, create_constraint=False, values_callable=lambda x: [e.value for e in x]), nullable=False, comment='Transaction type: income (recurring earnings like salary), expense (recurring bills like rent), lending, or borrowing')
-    amount = Column(Float, nullable=False, comment='Amount for each occurrence of this recurring transaction')
+    type = Column(String(32), nullable=False, comment='Transaction type: income (recurring earnings like salary), expense (recurring bills like rent), lending, or borrowing')
+    amount = Column(Money, nullable=False, comment='Amount for each occurrence of this recurring transaction')
     description = Column(Text, nullable=False, comment='Description (e.g., "Netflix Subscription", "Monthly Salary", "Rent Payment")')
     category = Column(String, nullable=False, comment='Category for this recurring transaction - used for budgeting and analysis')
-    frequency = Column(SQLEnum(RecurrenceFrequency, native_enum=False, create_constraint=False, values_callable=lambda x: [e.value for e in x]), nullable=False, comment='How often this transaction occurs: daily, weekly, biweekly, monthly, quarterly, or yearly')
-    next_date = Column(DateTime, nullable=False, index=True, comment='Next scheduled date for this transaction - updated after each occurrence (indexed for efficient scheduling queries)')
+    frequency = Column(String(32), nullable=False, comment='How often this transaction occurs: daily, weekly, biweekly, monthly, quarterly, or yearly')
+    next_date = Column(DateTime, nullable=False, comment='Next scheduled date for this transaction - updated after each occurrence (active rows indexed by ix_rt_due_active)')
     end_date = Column(DateTime, nullable=True, comment='Date when this recurring transaction stops (null means indefinite)')
     is_active = Column(Boolean, default=True, comment='Boolean flag indicating if this recurring transaction is currently active')
     remind_days_before = Column(Integer, default=3, comment='Number of days before the transaction to send a reminder notification (default 3 days)')
     auto_add = Column(Boolean, default=True, comment='Boolean flag - if true, automatically create a transaction record when next_date arrives')
     last_processed = Column(DateTime, nullable=True, comment='Timestamp of when this recurring transaction was last processed/executed')
-    extra_data = Column(Text, comment='JSON string for custom fields or additional metadata')
-    created_at = Column(DateTime, default=datetime.utcnow, comment='Timestamp when this recurring transaction was created')
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='Timestamp when this recurring transaction was last modified')
+    extra_data = Column(JSONType, comment='JSON object for custom fields or additional metadata')
+    created_at = Column(DateTime, server_default=utcnow(), comment='Timestamp when this recurring transaction was created')
+    updated_at = Column(DateTime, server_default=utcnow(), server_onupdate=FetchedValue(), comment='Timestamp when this recurring transaction was last modified')
 
     # Relationships
-    user = relationship("User", back_populates="recurring_transactions")
+    user = relationship("User", back_populates="recurring_transactions", lazy="raise_on_sql")
 
+    @validates('type', 'frequency')
+    def _validate_enum_columns(self, key, value):
+        """Store enum columns as their canonical lowercase value"""
+        return _enum_value(TransactionType if key == 'type' else RecurrenceFrequency, value)
 
-class NotificationType(str, enum.Enum):
+
+class NotificationType(CaseInsensitiveStrEnum):
     """Notification types"""
     BUDGET_ALERT = "budget_alert"
     BILL_REMINDER = "bill_reminder"
@@ -490,54 +610,63 @@ class NotificationType(str, enum.Enum):
     LOW_BALANCE = "low_balance"
     GOAL_COMPLETED = "goal_completed"
     DEBT_PAID_OFF = "debt_paid_off"
-    
-    @classmethod
-    def _missing_(cls, value):
-        """Make enum case-insensitive"""
-        if isinstance(value, str):
-            value = value.lower()
-            for member in cls:
-                if member.value == value:
-                    return member
-        return None
 
 
-class NotificationStatus(str, enum.Enum):
+class NotificationStatus(CaseInsensitiveStrEnum):
     """Notification status"""
     UNREAD = "unread"
     READ = "read"
     DISMISSED = "dismissed"
-    
-    @classmethod
-    def _missing_(cls, value):
-        """Make enum case-insensitive"""
-        if isinstance(value, str):
-            value = value.lower()
-            for member in cls:
-                if member.value == value:
-                    return member
-        return None
 
 
 class Notification(Base):
     """Smart notifications for financial events"""
     __tablename__ = "notifications"
-    __table_args__ = {'comment': 'Notifications - smart alerts for financial events like budget limits, bill reminders, and unusual spending'}
+    __table_args__ = (
+        _enum_check('type', NotificationType, 'ck_notifications_type'),
+        _enum_check('status', NotificationStatus, 'ck_notifications_status'),
+        # Recent notifications list and unread badge - both ORDER BY created_at DESC per user
+        Index('ix_notif_user_created', 'user_id', 'created_at'),
+        Index('ix_notif_user_status_created', 'user_id', 'status', 'created_at'),
+        # Dedup lookups on extra_data use json_contains() (@>)
+        Index('ix_notif_extra_gin', 'extra_data', postgresql_using='gin', postgresql_ops={'extra_data': 'jsonb_path_ops'}),
+        Index('ix_notif_user_budget_created', 'user_id', 'budget_id', 'created_at', postgresql_where=text('budget_id IS NOT NULL')),
+        {
+            'comment': 'Notifications - smart alerts for financial events like budget limits, bill reminders, and unusual spending',
+            'postgresql_partition_by': 'RANGE (created_at)',
+        }
+    )
+    __mapper_args__ = {'eager_defaults': False}
 
-    id = Column(String, primary_key=True, comment='Unique notification identifier (UUID format)')
+    id = Column(String, primary_key=True, default=_new_id, comment='Unique notification identifier (UUID format)')
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True, comment='Foreign key to users table - identifies which user this notification is for (indexed)')
-    type = Column(SQLEnum(NotificationType, native_enum=False, create_constraint=False), nullable=False, comment='Notification type: budget_alert, bill_reminder, goal_milestone, unusual_spending, low_balance, goal_completed, debt_paid_off')
+    type = Column(String(32), nullable=False, comment='Notification type: budget_alert, bill_reminder, goal_milestone, unusual_spending, low_balance, goal_completed, debt_paid_off')
     title = Column(String, nullable=False, comment='Short notification title displayed to user (e.g., "Budget Alert", "Bill Due Soon")')
     message = Column(Text, nullable=False, comment='Full notification message with details')
-    status = Column(SQLEnum(NotificationStatus, native_enum=False, create_constraint=False), default=NotificationStatus.UNREAD, comment='Status: unread (not yet viewed), read (user has viewed), dismissed (user dismissed)')
+    status = Column(String(32), default=NotificationStatus.UNREAD.value, comment='Status: unread (not yet viewed), read (user has viewed), dismissed (user dismissed)')
     priority = Column(Integer, default=1, comment='Priority level: 1=low (informational), 2=medium (worth attention), 3=high (urgent action needed)')
     action_url = Column(String, nullable=True, comment='Optional deep link to relevant screen in mobile app (e.g., /budgets/food, /bills/123)')
-    extra_data = Column(Text, comment='JSON string with context data for rendering the notification (amounts, dates, etc.)')
-    created_at = Column(DateTime, default=datetime.utcnow, index=True, comment='Timestamp when this notification was created (indexed)')
+    extra_data = Column(JSONType, comment='JSON object with context data for rendering the notification (amounts, dates, etc.)')
+    budget_id = Column(String, nullable=True, comment='Budget this alert is about (budget_alert only) - denormalized from extra_data for indexed lookups')
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, index=True, comment='Timestamp when this notification was created - monthly partition key, part of the primary key (indexed)')
     read_at = Column(DateTime, nullable=True, comment='Timestamp when the user read this notification (null if unread)')
 
     # Relationships
-    user = relationship("User", back_populates="notifications")
+    user = relationship("User", back_populates="notifications", lazy="raise_on_sql")
+
+    @validates('type', 'status')
+    def _validate_enum_columns(self, key, value):
+        """Store enum columns as their canonical lowercase value"""
+        return _enum_value(NotificationType if key == 'type' else NotificationStatus, value)
+
+
+class BudgetAlertDay(Base):
+    """Days on which a budget alert was sent - dedup key for budget alerts"""
+    __tablename__ = "budget_alert_days"
+    __table_args__ = {'comment': 'Budget alert days - one row per budget per UTC day an alert was created; INSERT ... ON CONFLICT DO NOTHING claims the day so concurrent evaluations send at most one alert'}
+
+    budget_id = Column(String, ForeignKey("budgets.id", ondelete="CASCADE"), primary_key=True, comment='Foreign key to budgets table - budget the alert was sent for')
+    alert_date = Column(Date, primary_key=True, comment='UTC day the alert was sent')
 
 
 class Category(Base):
@@ -545,10 +674,11 @@ class Category(Base):
     __tablename__ = "categories"
     __table_args__ = (
         Index('ix_categories_user_name', 'user_id', 'name', unique=True),
+        Index('ix_categories_keywords_gin', 'keywords', postgresql_using='gin', postgresql_ops={'keywords': 'jsonb_path_ops'}),
         {'comment': 'User-specific categories - personalized category system that learns and adapts to each user'}
     )
 
-    id = Column(String, primary_key=True, comment='Unique category identifier (UUID format)')
+    id = Column(String, primary_key=True, default=_new_id, comment='Unique category identifier (UUID format)')
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True, comment='Foreign key to users table - identifies which user this category belongs to (indexed)')
     name = Column(String, nullable=False, comment='Category name (e.g., "groceries", "streaming", "gas") - lowercase, snake_case format')
     display_name = Column(String, nullable=False, comment='Human-readable display name (e.g., "Groceries", "Streaming Services", "Gas & Fuel")')
@@ -557,16 +687,114 @@ class Category(Base):
     color = Column(String, nullable=True, comment='Color hex code for UI display (e.g., "#4CAF50")')
     
     # AI Learning Metadata
-    usage_count = Column(Integer, default=0, comment='Number of times this category has been used - helps AI prioritize common categories')
+    usage_count = Column(Integer, default=0, comment='Number of transactions in this category - recomputed in bulk by CategoryManager.refresh_usage_counts(), helps AI prioritize common categories')
     ai_suggested = Column(Boolean, default=False, comment='Boolean flag - true if this category was suggested by AI, false if user-created or default')
-    keywords = Column(Text, nullable=True, comment='JSON array of keywords associated with this category for matching (e.g., ["whole foods", "trader joes", "safeway"])')
+    keywords = Column(JSONType, nullable=True, comment='JSON array of keywords associated with this category for matching (e.g., ["whole foods", "trader joes", "safeway"])')
     
     # Status
     is_active = Column(Boolean, default=True, comment='Boolean flag indicating if this category is currently active and available for use')
     is_default = Column(Boolean, default=False, comment='Boolean flag - true for system default categories that were seeded on user creation')
     
-    created_at = Column(DateTime, default=datetime.utcnow, comment='Timestamp when this category was created')
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='Timestamp when this category was last modified')
+    created_at = Column(DateTime, server_default=utcnow(), comment='Timestamp when this category was created')
+    updated_at = Column(DateTime, server_default=utcnow(), server_onupdate=FetchedValue(), comment='Timestamp when this category was last modified')
 
     # Relationships
-    user = relationship("User", back_populates="categories")
+    user = relationship("User", back_populates="categories", lazy="raise_on_sql")
+
+
+# updated_at trigger - installed by create_all() on PostgreSQL as well as by migrations/011
+_set_updated_at_fn = DDL("""
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = TIMEZONE('utc', CURRENT_TIMESTAMP);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+""")
+_updated_at_trigger = DDL(
+    "CREATE TRIGGER trg_%(table)s_updated_at BEFORE UPDATE ON %(table)s "
+    "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+)
+
+# SQLite (local dev/tests) has no BEFORE UPDATE assignment to NEW: touch the row
+# after the update unless the statement set updated_at itself. Without
+# recursive_triggers (off by default) the inner UPDATE does not re-fire it.
+_sqlite_updated_at_trigger = DDL(
+    "CREATE TRIGGER trg_%(table)s_updated_at AFTER UPDATE ON %(table)s "
+    "FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at BEGIN "
+    "UPDATE %(table)s SET updated_at = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid; "
+    "END"
+)
+
+event.listen(Base.metadata, "before_create", _set_updated_at_fn.execute_if(dialect="postgresql"))
+for _table in Base.metadata.tables.values():
+    if "updated_at" in _table.c:
+        event.listen(_table, "after_create", _updated_at_trigger.execute_if(dialect="postgresql"))
+        event.listen(_table, "after_create", _sqlite_updated_at_trigger.execute_if(dialect="sqlite"))
+
+
+# Monthly range partitions for the append-only tables (logs, insights, notifications).
+# PostgreSQL requires the partition key in the primary key, hence (id, created_at).
+# create_all() gets the helper, the partitions around "now" and a DEFAULT catch-all;
+# app.database.partitions keeps them rolling forward and retires old months.
+_ensure_monthly_partitions_fn = DDL("""
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(
+    parent text,
+    months_ahead int DEFAULT 3,
+    from_month date DEFAULT (TIMEZONE('utc', CURRENT_TIMESTAMP))::date
+) RETURNS void AS $$
+DECLARE
+    m date := date_trunc('month', from_month)::date;
+    stop date := (date_trunc('month', TIMEZONE('utc', CURRENT_TIMESTAMP)) + make_interval(months => months_ahead))::date;
+BEGIN
+    WHILE m <= stop LOOP
+        EXECUTE 'CREATE TABLE IF NOT EXISTS ' || quote_ident(parent || '_' || to_char(m, 'YYYYMM'))
+            || ' PARTITION OF ' || quote_ident(parent)
+            || ' FOR VALUES FROM (' || quote_literal(m) || ') TO (' || quote_literal((m + interval '1 month')::date) || ')';
+        m := (m + interval '1 month')::date;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+""")
+_initial_partitions = DDL(
+    "SELECT ensure_monthly_partitions('%(table)s'); "
+    "CREATE TABLE IF NOT EXISTS %(table)s_default PARTITION OF %(table)s DEFAULT"
+)
+
+event.listen(Base.metadata, "before_create", _ensure_monthly_partitions_fn.execute_if(dialect="postgresql"))
+for _table in (Log.__table__, Insight.__table__, Notification.__table__):
+    event.listen(_table, "after_create", _initial_partitions.execute_if(dialect="postgresql"))
+
+
+# Daily expense rollup, kept in sync with transactions by trigger - also installed by migrations/022
+_daily_category_spend_fn = DDL("""
+CREATE OR REPLACE FUNCTION daily_category_spend_apply() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.type = 'expense' THEN
+        INSERT INTO daily_category_spend AS d (user_id, category, day, total)
+        VALUES (OLD.user_id, COALESCE(OLD.category, ''), OLD.date::date, -OLD.amount)
+        ON CONFLICT (user_id, category, day) DO UPDATE SET total = d.total + EXCLUDED.total;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.type = 'expense' THEN
+        INSERT INTO daily_category_spend AS d (user_id, category, day, total)
+        VALUES (NEW.user_id, COALESCE(NEW.category, ''), NEW.date::date, NEW.amount)
+        ON CONFLICT (user_id, category, day) DO UPDATE SET total = d.total + EXCLUDED.total;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""")
+_daily_category_spend_trigger = DDL(
+    "CREATE TRIGGER trg_transactions_daily_spend "
+    "AFTER INSERT OR DELETE OR UPDATE OF user_id, type, category, amount, date ON transactions "
+    "FOR EACH ROW EXECUTE FUNCTION daily_category_spend_apply()"
+)
+
+event.listen(Base.metadata, "before_create", _daily_category_spend_fn.execute_if(dialect="postgresql"))
+event.listen(Transaction.__table__, "after_create", _daily_category_spend_trigger.execute_if(dialect="postgresql"))
+
+
+# Trigram operator class for ix_tx_desc_trgm; must exist before the transactions table
+_pg_trgm_extension = DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+event.listen(Base.metadata, "before_create", _pg_trgm_extension.execute_if(dialect="postgresql"))
@@ -0,0 +1,114 @@
+"""
+Monthly partition maintenance for append-only tables
+
+logs, insights and notifications are range-partitioned on created_at (one child
+table per month, named <table>_YYYYMM, plus a <table>_default catch-all).
+Run maintain_partitions() from a scheduled job (e.g., daily cron) so next
+months' partitions exist before rows arrive and expired months are detached.
+"""
+from datetime import datetime
+from typing import Dict, List
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("logs", "insights", "notifications")
+
+
+def ensure_partitions(db: Session, months_ahead: int = 3) -> None:
+    """
+    Create monthly partitions from the current month through months_ahead
+
+    Args:
+        db: Database session
+        months_ahead: How many future months to pre-create
+    """
+    for table in PARTITIONED_TABLES:
+        db.execute(
+            text("SELECT ensure_monthly_partitions(:parent, :months_ahead)"),
+            {"parent": table, "months_ahead": months_ahead},
+        )
+
+
+def detach_expired_partitions(
+    db: Session,
+    keep_months: int = 13,
+    drop: bool = True,
+) -> List[str]:
+    """
+    Detach (and by default drop) monthly partitions older than keep_months
+
+    Removing a month is a metadata operation instead of a bulk DELETE.
+
+    Args:
+        db: Database session
+        keep_months: Number of months to retain, including the current one
+        drop: Drop the detached tables as well
+
+    Returns:
+        Names of the partitions that were detached
+    """
+    now = datetime.utcnow()
+    month_index = now.year * 12 + now.month - 1 - (keep_months - 1)
+    cutoff = f"{month_index // 12:04d}{month_index % 12 + 1:02d}"
+
+    detached = []
+    for table in PARTITIONED_TABLES:
+        children = db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :parent"
+            ),
+            {"parent": table},
+        ).scalars().all()
+
+        for child in children:
+            suffix = child[len(table) + 1:]
+            # Only <table>_YYYYMM children; leave the DEFAULT partition alone
+            if not (suffix.isdigit() and len(suffix) == 6) or suffix >= cutoff:
+                continue
+            db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{child}"'))
+            if drop:
+                db.execute(text(f'DROP TABLE "{child}"'))
+            detached.append(child)
+
+    return detached
+
+
+def maintain_partitions(
+    db: Session,
+    months_ahead: int = 3,
+    keep_months: int = 13,
+) -> Dict[str, int]:
+    """
+    Roll partitions forward and retire expired months, then commit
+
+    No-op on non-PostgreSQL databases.
+
+    Args:
+        db: Database session
+        months_ahead: How many future months to pre-create
+        keep_months: Number of months to retain
+
+    Returns:
+        Dict with maintenance statistics
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return {"detached": 0}
+
+    try:
+        ensure_partitions(db, months_ahead)
+        detached = detach_expired_partitions(db, keep_months)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if detached:
+        logger.info(f"Detached expired partitions: {', '.join(detached)}")
+    return {"detached": len(detached)}
@@ -1,9 +1,9 @@
 """
 Database session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from ..config import settings
 
 # Create engine with optimized connection pooling
@@ -11,24 +11,80 @@ engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Check connection health before using
     echo=settings.DEBUG,  # Log SQL queries in debug mode
-    pool_size=10,  # Max connections in pool
-    max_overflow=20,  # Max overflow connections beyond pool_size
+    echo_pool=settings.DEBUG,  # Log pool checkouts/checkins in debug mode
+    pool_size=settings.POOL_SIZE,  # Max connections in pool
+    max_overflow=settings.MAX_OVERFLOW,  # Max overflow connections beyond pool_size
     pool_timeout=30,  # Timeout for getting connection from pool (seconds)
-    pool_recycle=3600,  # Recycle connections after 1 hour to prevent stale connections
+    pool_recycle=settings.POOL_RECYCLE,  # Recycle connections before the server drops them as idle
+    pool_use_lifo=True,  # Reuse the most recent connection so surplus idle ones age out
+    query_cache_size=1200,  # Compiled-statement LRU cache (default 500) - room for every ORM/Core statement shape
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-from contextlib import contextmanager
+def _async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver (asyncpg / aiosqlite)"""
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+# Async engine for write-heavy routes that should not hold a threadpool worker
+# while waiting on the database. Optional - requires the async driver.
+try:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+    _async_url = _async_database_url(settings.DATABASE_URL)
+    # aiosqlite runs on NullPool, which rejects queue-pool sizing arguments
+    _async_pool_kwargs = {} if _async_url.startswith("sqlite") else dict(
+        pool_size=settings.POOL_SIZE,
+        max_overflow=settings.MAX_OVERFLOW,
+        pool_timeout=30,
+        pool_recycle=settings.POOL_RECYCLE,
+        pool_use_lifo=True,
+    )
+    async_engine = create_async_engine(
+        _async_url,
+        pool_pre_ping=True,
+        echo=settings.DEBUG,
+        echo_pool=settings.DEBUG,
+        query_cache_size=1200,
+        **_async_pool_kwargs,
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    ASYNC_DB_AVAILABLE = True
+except ImportError:
+    async_engine = None
+    AsyncSessionLocal = None
+    ASYNC_DB_AVAILABLE = False
+
+
+from contextlib import asynccontextmanager, contextmanager
 from sqlalchemy.exc import SQLAlchemyError
 from .exceptions import DatabaseOperationError
 
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency for FastAPI routes to get database session
-    Provides robust session management with error handling
+
+    Read-only by default: nothing is committed for the route. Routes that write
+    either commit explicitly or depend on get_db_tx instead.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_db_tx() -> Generator[Session, None, None]:
+    """
+    Dependency for FastAPI routes that write
+
+    Commits when the route returns, rolls back on any database error
     """
     db = SessionLocal()
     try:
@@ -40,12 +96,49 @@ def get_db() -> Generator[Session, None, None]:
         # Convert SQLAlchemy error to our custom exception
         raise DatabaseOperationError(
             message="Database transaction failed",
-            operation="get_db",
+            operation="get_db_tx",
             details=str(e)
         ) from e
     finally:
         db.close()
 
+def _require_async_sessions(operation: str) -> None:
+    """Raise if the async driver is not installed"""
+    if AsyncSessionLocal is None:
+        raise DatabaseOperationError(
+            message="Async database driver is not installed",
+            operation=operation,
+        )
+
+async def get_async_db() -> AsyncGenerator["AsyncSession", None]:
+    """
+    Async counterpart of get_db for `async def` routes
+    Read-only by default - commit explicitly or use get_async_db_tx
+    """
+    _require_async_sessions("get_async_db")
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_db_tx() -> AsyncGenerator["AsyncSession", None]:
+    """
+    Async counterpart of get_db_tx for `async def` routes
+    Same commit/rollback semantics, awaited on the event loop
+    """
+    _require_async_sessions("get_async_db_tx")
+
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise DatabaseOperationError(
+                message="Database transaction failed",
+                operation="get_async_db_tx",
+                details=str(e)
+            ) from e
+
 @contextmanager
 def db_transaction(db: Session):
     """
@@ -68,7 +161,41 @@ def db_transaction(db: Session):
         ) from e
 
 
+@asynccontextmanager
+async def async_db_transaction(db: "AsyncSession"):
+    """
+    Async counterpart of db_transaction for AsyncSession callers
+
+    Usage:
+        async with async_db_transaction(db) as transaction:
+            # Perform awaited database operations
+    """
+    try:
+        yield db
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseOperationError(
+            message="Database transaction failed",
+            operation="async_db_transaction",
+            details=str(e)
+        ) from e
+
+
+# Arbitrary application-wide key for the schema bootstrap advisory lock
+_INIT_DB_LOCK_KEY = 7_204_311
+
+
 def init_db():
-    """Initialize database (create tables)"""
+    """
+    Initialize database (create missing tables)
+
+    Idempotent. On PostgreSQL, concurrent callers (several workers or
+    containers starting together) are serialized on an advisory lock, so only
+    one of them issues DDL and the rest find the tables already present.
+    """
     from .models import Base
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _INIT_DB_LOCK_KEY})
+        Base.metadata.create_all(bind=conn)
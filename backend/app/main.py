@@ -2,14 +2,44 @@
 FastAPI Application - AI Financial Planner
 Built with Python + FastAPI + LangGraph (2025 Industry Standards)
 """
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from fastapi.utils import is_body_allowed_for_status_code
+from starlette.exceptions import HTTPException as StarletteHTTPException
+import logging
+import logging.config
+import os
 import uvicorn
 
 from .config import settings
 from .database.session import init_db
 from .api.routes import router
+from .api.response_cache import ResponseCacheMiddleware, REDIS_AVAILABLE, has_cache_policy_routes
+
+# Application log output, configured once at import. Only the app package
+# logger is touched; uvicorn keeps its own handlers.
+logging.config.dictConfig({
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {"format": "%(asctime)s %(levelname)s %(name)s: %(message)s"},
+    },
+    "handlers": {
+        "default": {"class": "logging.StreamHandler", "formatter": "default"},
+    },
+    "loggers": {
+        __name__.rpartition(".")[0]: {
+            "handlers": ["default"],
+            "level": "DEBUG" if settings.DEBUG else "INFO",
+            "propagate": False,
+        },
+    },
+})
+
+logger = logging.getLogger(__name__)
 
 # Rate limiting (2025 optimization)
 try:
@@ -17,7 +47,14 @@ try:
     from slowapi.util import get_remote_address
     from slowapi.errors import RateLimitExceeded
 
-    limiter = Limiter(key_func=get_remote_address)
+    # Moving (sliding) window over shared storage; falls back to per-process
+    # memory while the storage backend is unreachable
+    limiter = Limiter(
+        key_func=get_remote_address,
+        storage_uri=settings.RATE_LIMIT_STORAGE_URL or "memory://",
+        strategy="moving-window",
+        in_memory_fallback_enabled=True,
+    )
     RATE_LIMITING_AVAILABLE = True
 except ImportError:
     RATE_LIMITING_AVAILABLE = False
@@ -59,10 +96,23 @@ app = FastAPI(
     2. Login: `POST /api/v1/auth/login`
     3. Include the token: `Authorization: Bearer <token>`
     """,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
 
+# Include API routes (before the middleware below, which checks them)
+app.include_router(router, prefix="/api/v1")
+
+# Redis response cache, registered only if some GET endpoint opted in with
+# @cache_policy - otherwise it would add per-request overhead for nothing
+# (added first so CORS wraps it)
+RESPONSE_CACHE_ENABLED = bool(
+    REDIS_AVAILABLE and settings.USE_REDIS and settings.REDIS_URL and has_cache_policy_routes(app.routes)
+)
+if RESPONSE_CACHE_ENABLED:
+    app.add_middleware(ResponseCacheMiddleware, redis_url=settings.REDIS_URL)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -75,50 +125,77 @@ app.add_middleware(
 # Rate limiting middleware (2025 optimization)
 if RATE_LIMITING_AVAILABLE and settings.RATE_LIMIT_ENABLED:
     app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-# Include API routes
-app.include_router(router, prefix="/api/v1")
+    async def _rate_limit_exceeded_logged(request: Request, exc: RateLimitExceeded):
+        """Log each violation (client, path, limit) before the standard 429"""
+        logger.warning(
+            f"Rate limit exceeded: {get_remote_address(request)} "
+            f"{request.method} {request.url.path} ({exc.detail})"
+        )
+        return _rate_limit_exceeded_handler(request, exc)
+
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_logged)
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup"""
-    print("🚀 Starting AI Financial Planner...")
-    print(f"📊 AI Provider: {settings.AI_PROVIDER}")
-
-    # Show the active model for the current provider
-    active_model = settings.get_model_for_provider(settings.AI_PROVIDER)
-    print(f"🤖 Active Model: {active_model}")
-
-    # Show fallback providers if configured
-    if settings.fallback_providers:
-        print(f"🔄 Fallback Providers: {', '.join(settings.fallback_providers)}")
-
-    # Show optimization settings (2025)
-    print(f"⚡ Prompt Caching: {'✅ Enabled' if settings.ENABLE_PROMPT_CACHING else '❌ Disabled'}")
-    print(f"🛡️  Rate Limiting: {'✅ Enabled' if RATE_LIMITING_AVAILABLE and settings.RATE_LIMIT_ENABLED else '❌ Disabled'}")
-    if RATE_LIMITING_AVAILABLE and settings.RATE_LIMIT_ENABLED:
-        print(f"   └─ Limit: {settings.RATE_LIMIT_PER_MINUTE} requests/minute")
-    print(f"💬 Max Chat History: {settings.MAX_CHAT_HISTORY_MESSAGES} messages")
+    rate_limiting = RATE_LIMITING_AVAILABLE and settings.RATE_LIMIT_ENABLED
+    startup_config = {
+        "ai_provider": settings.AI_PROVIDER,
+        "model": settings.get_model_for_provider(settings.AI_PROVIDER),
+        "fallback_providers": ",".join(settings.fallback_providers) or None,
+        "prompt_caching": settings.ENABLE_PROMPT_CACHING,
+        "rate_limit": f"{settings.RATE_LIMIT_PER_MINUTE}/minute" if rate_limiting else None,
+        "rate_limit_storage": ("shared" if settings.RATE_LIMIT_STORAGE_URL else "in-process") if rate_limiting else None,
+        "response_cache": RESPONSE_CACHE_ENABLED,
+        "max_chat_history": settings.MAX_CHAT_HISTORY_MESSAGES,
+        "debug": settings.DEBUG,
+    }
+    logger.info(
+        f"Starting {settings.APP_NAME} v{settings.VERSION}: "
+        + " ".join(f"{key}={value}" for key, value in startup_config.items()),
+        extra={"startup_config": startup_config},
+    )
 
-    print(f"🔧 Debug Mode: {settings.DEBUG}")
+    # Initialize database (skipped when the schema was bootstrapped before the workers started)
+    if settings.INIT_DB_ON_STARTUP:
+        try:
+            init_db()
+            logger.info("Database initialized")
+        except Exception as e:
+            logger.error(f"Database initialization error: {e}")
+
+    if settings.DEBUG:
+        logger.debug("API documentation: http://localhost:8000/docs")
+
+
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    """HTTP errors raised by routes/dependencies - same body as FastAPI's default, via orjson"""
+    if not is_body_allowed_for_status_code(exc.status_code):
+        return Response(status_code=exc.status_code, headers=getattr(exc, "headers", None))
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None),
+    )
 
-    # Initialize database
-    try:
-        init_db()
-        print("✅ Database initialized")
-    except Exception as e:
-        print(f"⚠️  Database initialization error: {e}")
 
-    print("✅ Application started successfully!")
-    print(f"📖 API Documentation: http://localhost:8000/docs")
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """Request validation errors (422) - same body as FastAPI's default, via orjson"""
+    return ORJSONResponse(
+        status_code=422,
+        content={"detail": jsonable_encoder(exc.errors())},
+    )
 
 
 @app.exception_handler(Exception)
-async def global_exception_handler(request, exc):
-    """Global exception handler"""
-    return JSONResponse(
+async def global_exception_handler(request: Request, exc: Exception):
+    """Uncaught exceptions only - the exception text is exposed in DEBUG mode only"""
+    logger.error(f"Unhandled error on {request.method} {request.url.path}: {type(exc).__name__}")
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -139,9 +216,15 @@ async def root():
 
 
 if __name__ == "__main__":
+    # One worker per core unless WEB_CONCURRENCY says otherwise; reload mode
+    # is single-process only, so DEBUG always runs one worker
+    workers = 1 if settings.DEBUG else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
+        workers=workers,
+        loop="auto",  # uvloop when installed (uvicorn[standard])
+        http="auto",  # httptools when installed, h11 otherwise
     )
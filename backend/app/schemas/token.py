@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 class Token(BaseModel):
     access_token: str
@@ -20,13 +20,14 @@ def create_access_token(
     Create a new access token with optional custom expiration
     """
     from jose import jwt
-    from app.core.config import settings
+    from ..config import settings
 
     to_encode = data.copy()
+    now = datetime.now(timezone.utc)
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(
@@ -44,14 +45,15 @@ def create_refresh_token(
     Create a new refresh token with optional custom expiration
     """
     from jose import jwt
-    from app.core.config import settings
+    from ..config import settings
 
     to_encode = data.copy()
+    now = datetime.now(timezone.utc)
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
         # Refresh token lasts longer than access token
-        expire = datetime.utcnow() + timedelta(days=30)
+        expire = now + timedelta(days=30)
 
     to_encode.update({"exp": expire, "type": "refresh"})
     encoded_jwt = jwt.encode(
@@ -3,18 +3,67 @@ AI-Enhanced Budget Adjustment Advisor
 Provides personalized, context-aware budget recommendations using LLM
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import Row, and_, func, select
 from datetime import datetime, timedelta
+from itertools import islice
 from typing import Dict, List, Optional
+import heapq
 import logging
-import json
+import orjson
 
-from ..database.models import Budget, Transaction, TransactionType, Goal, GoalStatus, User
+from ..database.models import Transaction, TransactionType, Goal, GoalStatus, User
 from .budget_tracker import BudgetTracker
+from .llm_clients import cached_system_message, extract_json_array, get_service_llm
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Cap on over/underspent categories listed in an analysis (most severe first)
+MAX_LISTED_CATEGORIES = 10
+
+# Identical for every user - sent as the system block so providers with
+# prompt caching can reuse it
+ADVISOR_SYSTEM_PROMPT = """You are a personal financial advisor analyzing a user's budget and spending patterns.
+
+**Your Task:**
+Provide 3-5 personalized budget adjustment recommendations. For each recommendation:
+
+1. **Category**: Which budget category to adjust
+2. **Current Amount**: Current budget amount
+3. **Recommended Amount**: New suggested amount
+4. **Change**: Dollar amount of change
+5. **Reasoning**: Clear, personalized explanation (2-3 sentences) that:
+   - Explains WHY this adjustment makes sense for THIS user
+   - References specific spending patterns or goals
+   - Considers user's lifestyle and priorities
+6. **Priority**: high/medium/low
+7. **Type**: increase/decrease/reallocate
+
+**Guidelines:**
+- Be specific and actionable
+- Consider user's goals and priorities
+- Don't make drastic changes (max 30% adjustment)
+- Balance between essential and discretionary spending
+- Explain trade-offs clearly
+- Be empathetic and supportive in tone
+
+**Output Format (JSON):**
+```json
+[
+  {
+    "category": "category_name",
+    "current_amount": 500.00,
+    "recommended_amount": 400.00,
+    "change": -100.00,
+    "reasoning": "Your personalized explanation here...",
+    "priority": "high",
+    "type": "decrease"
+  }
+]
+```
+
+Provide ONLY the JSON array, no other text."""
+
 
 class AIBudgetAdvisor:
     """
@@ -50,29 +99,23 @@ class AIBudgetAdvisor:
         if current_date is None:
             current_date = datetime.utcnow()
         
-        # Get user profile
-        user = db.query(User).filter(User.id == user_id).first()
+        # Get user profile - only the fields the prompt uses
+        user = db.execute(
+            select(User.name, User.currency, User.country).where(User.id == user_id)
+        ).first()
         if not user:
             return {"status": "error", "message": "User not found"}
         
-        # Get budget data
-        budgets = db.query(Budget).filter(
-            and_(
-                Budget.user_id == user_id,
-                Budget.is_active == True
-            )
-        ).all()
+        # Get budget statuses (one per active budget)
+        budget_statuses = BudgetTracker.get_all_budget_statuses(db, user_id, current_date)
         
-        if not budgets:
+        if not budget_statuses:
             return {
                 "status": "no_budgets",
                 "message": "No active budgets to analyze",
                 "recommendations": []
             }
         
-        # Get budget statuses
-        budget_statuses = BudgetTracker.get_all_budget_statuses(db, user_id, current_date)
-        
         # Get spending analysis
         analysis = AIBudgetAdvisor._analyze_spending(db, user_id, budget_statuses, current_date)
         
@@ -84,14 +127,6 @@ class AIBudgetAdvisor:
             )
         ).order_by(Goal.priority.desc()).all()
         
-        # Get recent transactions for context
-        recent_transactions = db.query(Transaction).filter(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.date >= current_date - timedelta(days=30)
-            )
-        ).order_by(Transaction.date.desc()).limit(50).all()
-        
         # Generate recommendations
         if use_ai:
             try:
@@ -100,7 +135,6 @@ class AIBudgetAdvisor:
                     budget_statuses=budget_statuses,
                     analysis=analysis,
                     goals=goals,
-                    recent_transactions=recent_transactions,
                 )
             except Exception as e:
                 logger.error(f"AI recommendation failed: {e}, falling back to rule-based")
@@ -116,7 +150,7 @@ class AIBudgetAdvisor:
             "status": "success",
             "analysis": analysis,
             "recommendations": recommendations,
-            "total_budgets": len(budgets),
+            "total_budgets": len(budget_statuses),
             "method": "ai" if use_ai else "rule-based",
         }
     
@@ -129,43 +163,52 @@ class AIBudgetAdvisor:
     ) -> Dict:
         """Analyze spending patterns"""
         
-        total_budget = sum(b["budgeted_amount"] for b in budget_statuses)
-        total_spent = sum(b["actual_spent"] for b in budget_statuses)
-        
-        overspent = [b for b in budget_statuses if b["is_overspent"]]
-        underspent = [b for b in budget_statuses if b["percentage_used"] < 50]
+        # Totals and over/under classification in a single pass over the statuses
+        total_budget = 0.0
+        total_spent = 0.0
+        overspent = []
+        underspent = []
+        for b in budget_statuses:
+            total_budget += b["budgeted_amount"]
+            total_spent += b["actual_spent"]
+            if b["is_overspent"]:
+                overspent.append(b)
+            if b["percentage_used"] < 50:
+                underspent.append(b)
+        
+        # Only the worst offenders are listed; the counts above stay complete
+        top_overspent = heapq.nlargest(
+            MAX_LISTED_CATEGORIES, overspent, key=lambda b: b["actual_spent"] - b["budgeted_amount"]
+        )
+        top_underspent = heapq.nsmallest(
+            MAX_LISTED_CATEGORIES, underspent, key=lambda b: b["percentage_used"]
+        )
         
         # Get spending by category
         lookback_days = 30
         lookback_start = current_date - timedelta(days=lookback_days)
         
-        category_spending = db.query(
+        # Expense totals per category and total income in one grouped scan
+        totals_by_type = db.query(
+            Transaction.type,
             Transaction.category,
             func.sum(Transaction.amount).label("total"),
             func.count(Transaction.id).label("count")
         ).filter(
             and_(
                 Transaction.user_id == user_id,
-                Transaction.type == TransactionType.EXPENSE,
+                Transaction.type.in_([TransactionType.EXPENSE.value, TransactionType.INCOME.value]),
                 Transaction.date >= lookback_start
             )
-        ).group_by(Transaction.category).all()
-        
-        spending_by_category = {
-            cat: {"total": float(total), "count": count}
-            for cat, total, count in category_spending
-        }
+        ).group_by(Transaction.type, Transaction.category).all()
         
-        # Calculate income
-        total_income = db.query(
-            func.sum(Transaction.amount)
-        ).filter(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.type == TransactionType.INCOME,
-                Transaction.date >= lookback_start
-            )
-        ).scalar() or 0
+        spending_by_category = {}
+        total_income = 0.0
+        for trans_type, cat, total, count in totals_by_type:
+            if trans_type == TransactionType.INCOME.value:
+                total_income += float(total or 0)
+            else:
+                spending_by_category[cat] = {"total": float(total), "count": count}
         
         return {
             "total_budget": total_budget,
@@ -176,11 +219,11 @@ class AIBudgetAdvisor:
             "underspent_count": len(underspent),
             "overspent_categories": [
                 {"category": b["category"], "amount": b["actual_spent"], "budget": b["budgeted_amount"]}
-                for b in overspent
+                for b in top_overspent
             ],
             "underspent_categories": [
                 {"category": b["category"], "usage": b["percentage_used"]}
-                for b in underspent
+                for b in top_underspent
             ],
             "spending_by_category": spending_by_category,
             "savings_rate": ((total_income - total_spent) / total_income * 100) if total_income > 0 else 0,
@@ -188,23 +231,21 @@ class AIBudgetAdvisor:
     
     @staticmethod
     def _generate_ai_recommendations(
-        user: User,
+        user: Row,
         budget_statuses: List[Dict],
         analysis: Dict,
         goals: List[Goal],
-        recent_transactions: List[Transaction],
     ) -> List[Dict]:
         """Generate personalized recommendations using AI"""
         
         # Build context for AI
         context = AIBudgetAdvisor._build_context(
-            user, budget_statuses, analysis, goals, recent_transactions
+            budget_statuses, analysis, goals
         )
         
-        # Create prompt
-        prompt = f"""You are a personal financial advisor analyzing a user's budget and spending patterns.
-
-**User Profile:**
+        # Stable instructions go in the system block (cacheable across users);
+        # only the per-user snapshot changes between calls
+        user_message = f"""**User Profile:**
 - Name: {user.name}
 - Currency: {user.currency}
 - Country: {user.country}
@@ -223,74 +264,20 @@ class AIBudgetAdvisor:
 {context['goals_summary']}
 
 **Recent Spending Patterns:**
-{context['spending_summary']}
-
-**Your Task:**
-Provide 3-5 personalized budget adjustment recommendations. For each recommendation:
-
-1. **Category**: Which budget category to adjust
-2. **Current Amount**: Current budget amount
-3. **Recommended Amount**: New suggested amount
-4. **Change**: Dollar amount of change
-5. **Reasoning**: Clear, personalized explanation (2-3 sentences) that:
-   - Explains WHY this adjustment makes sense for THIS user
-   - References specific spending patterns or goals
-   - Considers user's lifestyle and priorities
-6. **Priority**: high/medium/low
-7. **Type**: increase/decrease/reallocate
-
-**Guidelines:**
-- Be specific and actionable
-- Consider user's goals and priorities
-- Don't make drastic changes (max 30% adjustment)
-- Balance between essential and discretionary spending
-- Explain trade-offs clearly
-- Be empathetic and supportive in tone
-
-**Output Format (JSON):**
-```json
-[
-  {{
-    "category": "category_name",
-    "current_amount": 500.00,
-    "recommended_amount": 400.00,
-    "change": -100.00,
-    "reasoning": "Your personalized explanation here...",
-    "priority": "high",
-    "type": "decrease"
-  }}
-]
-```
+{context['spending_summary']}"""
 
-Provide ONLY the JSON array, no other text."""
+        from langchain_core.messages import HumanMessage
 
-        # Call LLM
-        from langchain_anthropic import ChatAnthropic
-        from langchain_openai import ChatOpenAI
-        
         provider = getattr(settings, 'AI_PROVIDER', 'anthropic').lower()
-        model = settings.get_model_for_provider(provider)
-        
-        if provider in ["anthropic", "claude"] and settings.ANTHROPIC_API_KEY:
-            llm = ChatAnthropic(
-                temperature=0.3,
-                api_key=settings.ANTHROPIC_API_KEY,
-                model=model,
-                max_tokens=2000,
-                timeout=30,
-            )
-        elif settings.OPENAI_API_KEY:
-            llm = ChatOpenAI(
-                temperature=0.3,
-                api_key=settings.OPENAI_API_KEY,
-                model=model,
-                max_tokens=2000,
-                timeout=30,
-            )
-        else:
+        llm = get_service_llm(
+            provider, settings.get_model_for_provider(provider),
+            temperature=0.3, max_tokens=2000, timeout=30,
+        )
+        if llm is None:
             raise ValueError("No AI provider configured. Set ANTHROPIC_API_KEY or OPENAI_API_KEY")
-        
-        response = llm.invoke(prompt)
+
+        system_message = cached_system_message(ADVISOR_SYSTEM_PROMPT, provider)
+        response = llm.invoke([system_message, HumanMessage(content=user_message)])
         
         # Parse response
         try:
@@ -298,14 +285,11 @@ Provide ONLY the JSON array, no other text."""
             content = response.content if hasattr(response, 'content') else str(response)
             
             # Find JSON array in response
-            start_idx = content.find('[')
-            end_idx = content.rfind(']') + 1
-            
-            if start_idx == -1 or end_idx == 0:
+            json_str = extract_json_array(content)
+            if json_str is None:
                 raise ValueError("No JSON array found in response")
             
-            json_str = content[start_idx:end_idx]
-            recommendations = json.loads(json_str)
+            recommendations = orjson.loads(json_str)
             
             # Validate and enrich recommendations
             for rec in recommendations:
@@ -330,45 +314,32 @@ Provide ONLY the JSON array, no other text."""
     
     @staticmethod
     def _build_context(
-        user: User,
         budget_statuses: List[Dict],
         analysis: Dict,
         goals: List[Goal],
-        recent_transactions: List[Transaction],
     ) -> Dict:
         """Build context strings for AI prompt"""
         
-        # Budget summary
-        budget_lines = []
-        for b in budget_statuses[:10]:  # Top 10 categories
-            status = "⚠️ OVERSPENT" if b["is_overspent"] else "✓"
-            budget_lines.append(
-                f"  {status} {b['category']}: ${b['actual_spent']:.2f} / ${b['budgeted_amount']:.2f} "
-                f"({b['percentage_used']:.0f}% used)"
-            )
-        
-        budget_summary = "\n".join(budget_lines) if budget_lines else "  No budget data"
-        
-        # Goals summary
-        goal_lines = []
-        for g in goals[:5]:  # Top 5 goals
-            progress = (g.current_amount / g.target_amount * 100) if g.target_amount > 0 else 0
-            priority_str = "⭐" * g.priority
-            goal_lines.append(
-                f"  {priority_str} {g.name}: ${g.current_amount:.2f} / ${g.target_amount:.2f} "
-                f"({progress:.0f}% complete) - Due: {g.target_date.strftime('%Y-%m-%d') if g.target_date else 'No deadline'}"
-            )
-        
-        goals_summary = "\n".join(goal_lines) if goal_lines else "  No active goals"
-        
-        # Spending summary
-        spending_lines = []
-        for cat, data in list(analysis["spending_by_category"].items())[:10]:
-            spending_lines.append(
-                f"  {cat}: ${data['total']:.2f} ({data['count']} transactions)"
-            )
-        
-        spending_summary = "\n".join(spending_lines) if spending_lines else "  No recent spending"
+        # Budget summary (top 10 categories)
+        budget_summary = "\n".join([
+            f"  {'⚠️ OVERSPENT' if b['is_overspent'] else '✓'} {b['category']}: "
+            f"${b['actual_spent']:.2f} / ${b['budgeted_amount']:.2f} ({b['percentage_used']:.0f}% used)"
+            for b in budget_statuses[:10]
+        ]) or "  No budget data"
+        
+        # Goals summary (top 5 goals)
+        goals_summary = "\n".join([
+            f"  {'⭐' * g.priority} {g.name}: ${g.current_amount:.2f} / ${g.target_amount:.2f} "
+            f"({(g.current_amount / g.target_amount * 100) if g.target_amount > 0 else 0:.0f}% complete) - "
+            f"Due: {g.target_date.strftime('%Y-%m-%d') if g.target_date else 'No deadline'}"
+            for g in goals[:5]
+        ]) or "  No active goals"
+        
+        # Spending summary (first 10 categories, without copying the whole dict)
+        spending_summary = "\n".join([
+            f"  {cat}: ${data['total']:.2f} ({data['count']} transactions)"
+            for cat, data in islice(analysis["spending_by_category"].items(), 10)
+        ]) or "  No recent spending"
         
         return {
             "budget_summary": budget_summary,
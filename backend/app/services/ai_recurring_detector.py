@@ -4,28 +4,121 @@ Uses semantic understanding and ML to detect complex recurring patterns
 """
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, event, exists, func, or_
+import copy
 import logging
+import re
+import threading
 import json
 import os
 
 from ..database.models import Transaction, RecurringTransaction, TransactionType, RecurrenceFrequency
 from ..config import settings
+from .llm_clients import cached_system_message, get_service_llm
 
 logger = logging.getLogger(__name__)
 
+# Common suffixes stripped by _normalize_description. Each is removed at most
+# once, INC first and PMT last (then trailing whitespace), so the tail lists
+# them in reverse; sub() takes the leftmost match, i.e. every suffix present.
+_DESCRIPTION_SUFFIXES = ["INC", "LLC", "CORP", "LTD", "SUBSCRIPTION", "SUB", "PAYMENT", "PMT"]
+_DESCRIPTION_SUFFIX_RE = re.compile(
+    "".join(rf"(?:\s*{suffix})?" for suffix in reversed(_DESCRIPTION_SUFFIXES)) + r"$"
+)
+
+# Static part of the pattern-insight prompt; the pattern details go in the user message
+PATTERN_INSIGHT_SYSTEM_PROMPT = """Analyze the recurring transaction pattern you are given and provide a brief insight (1-2 sentences).
+
+Provide a helpful insight about this pattern. Is it consistent? Any trends? Any recommendations?
+Keep it brief and actionable."""
+
+# Optional - local sentence embeddings for description similarity
+try:
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None
+    EMBEDDINGS_AVAILABLE = False
+
+
+@lru_cache(maxsize=1)
+def _get_embedder(model_name: str):
+    """Load the sentence-transformer once per process"""
+    return SentenceTransformer(model_name)
+
+
+# Detected patterns per user, keyed by (use_ai, window signature). The signature
+# (count, latest created_at, latest date, amount total) changes when rows are
+# added, removed or re-dated/re-priced; in-process edits to a user's
+# transactions also drop the entry (see _invalidate_on_transaction_flush).
+# Optional - without cachetools detection always recomputes.
+try:
+    from cachetools import TTLCache
+
+    _pattern_cache = TTLCache(maxsize=512, ttl=300)
+    PATTERN_CACHE_AVAILABLE = True
+except ImportError:
+    _pattern_cache = None
+    PATTERN_CACHE_AVAILABLE = False
+
+_pattern_cache_lock = threading.Lock()  # TTLCache is not thread-safe
+
+
+def _get_cached_patterns(user_id: str, use_ai: bool, signature: tuple) -> Optional[List[Dict]]:
+    """Cached patterns for this user and window signature, if any (copied)"""
+    if not PATTERN_CACHE_AVAILABLE:
+        return None
+    with _pattern_cache_lock:
+        patterns = _pattern_cache.get(user_id, {}).get((use_ai, signature))
+    return copy.deepcopy(patterns) if patterns is not None else None
+
+
+def _store_cached_patterns(user_id: str, use_ai: bool, signature: tuple, patterns: List[Dict]) -> None:
+    """Remember patterns for this user and window signature, replacing older signatures"""
+    if not PATTERN_CACHE_AVAILABLE:
+        return
+    patterns = copy.deepcopy(patterns)
+    with _pattern_cache_lock:
+        entries = {
+            key: value
+            for key, value in _pattern_cache.get(user_id, {}).items()
+            if key[0] != use_ai
+        }
+        entries[(use_ai, signature)] = patterns
+        _pattern_cache[user_id] = entries
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_transaction_flush(session, flush_context):
+    """Drop cached patterns of users whose transactions changed in this flush"""
+    if not PATTERN_CACHE_AVAILABLE:
+        return
+    user_ids = {
+        obj.user_id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, Transaction)
+    }
+    if user_ids:
+        with _pattern_cache_lock:
+            for user_id in user_ids:
+                _pattern_cache.pop(user_id, None)
+
 
 class AIRecurringDetector:
     """AI-enhanced recurring transaction pattern detector"""
 
     # Base thresholds (can be adjusted per user based on feedback)
     SEMANTIC_SIMILARITY_THRESHOLD = 0.85
+    TRIGRAM_PREFILTER_THRESHOLD = 0.4  # pg_trgm similarity for SQL-side candidate prefilter
     BASE_AMOUNT_TOLERANCE = 0.15  # 15% variance
     UTILITY_AMOUNT_TOLERANCE = 0.30  # 30% for utilities
     MIN_OCCURRENCES = 2
     MIN_CONFIDENCE = 0.60  # Don't show patterns below this
+    MAX_CONCURRENT_INSIGHTS = 4  # LLM insight calls in flight per detection run
     
     # Pattern detection intervals (in days, with 20% tolerance)
     PATTERN_INTERVALS = {
@@ -38,6 +131,13 @@ class AIRecurringDetector:
         "annual": 365,
     }
 
+    # (name, expected_days, min_days, max_days, 1 / expected_days) with the 20%
+    # tolerance applied, ascending by expected_days
+    _PATTERN_BOUNDS = tuple(
+        (name, days, days * (1 - 0.20), days * (1 + 0.20), 1.0 / days)
+        for name, days in sorted(PATTERN_INTERVALS.items(), key=lambda item: item[1])
+    )
+
     @staticmethod
     def detect_patterns(db: Session, user_id: str, use_ai: bool = True) -> List[Dict]:
         """
@@ -51,14 +151,75 @@ class AIRecurringDetector:
         Returns:
             List of detected patterns with confidence scores
         """
-        # Get transactions from last 12 months for better seasonal detection
         twelve_months_ago = datetime.utcnow() - timedelta(days=365)
+        window = (
+            Transaction.user_id == user_id,
+            Transaction.date >= twelve_months_ago
+        )
+
+        # One aggregate over the window decides whether cached patterns still apply
+        signature = tuple(
+            db.query(
+                func.count(Transaction.id),
+                func.max(Transaction.created_at),
+                func.max(Transaction.date),
+                func.sum(Transaction.amount),
+            )
+            .filter(*window)
+            .one()
+        )
+
+        # Too few transactions in the window for any pattern: skip the scan
+        if signature[0] < AIRecurringDetector.MIN_OCCURRENCES:
+            return []
+
+        patterns = _get_cached_patterns(user_id, use_ai, signature)
+
+        if patterns is None:
+            patterns = AIRecurringDetector._detect_window_patterns(db, window, use_ai)
+            _store_cached_patterns(user_id, use_ai, signature, patterns)
+
+        # Drop patterns already covered by an active recurring transaction
+        suggestions = []
+        if patterns:
+            existing_descriptions = AIRecurringDetector._get_active_recurring_descriptions(
+                db, user_id
+            )
+            for pattern in patterns:
+                needle = pattern["description"].lower()
+                if not any(needle in desc for desc in existing_descriptions):
+                    suggestions.append(pattern)
+
+        logger.info(f"Detected {len(suggestions)} new recurring patterns")
+        return suggestions
+
+    @staticmethod
+    def _detect_window_patterns(db: Session, window: tuple, use_ai: bool) -> List[Dict]:
+        """
+        Detect qualifying patterns in a transaction window
+
+        Args:
+            db: Database session
+            window: Filter criteria selecting the user's transactions
+            use_ai: Whether to use AI enhancement
+
+        Returns:
+            Patterns at or above MIN_CONFIDENCE (not yet checked against
+            existing recurring transactions)
+        """
+        # Only the columns pattern detection reads, as plain rows rather than ORM
+        # entities (attribute access like t.date / t.amount works the same). The
+        # grouping below compares transactions pairwise, so the window is loaded whole.
         transactions = (
-            db.query(Transaction)
-            .filter(
-                Transaction.user_id == user_id,
-                Transaction.date >= twelve_months_ago
+            db.query(
+                Transaction.id,
+                Transaction.date,
+                Transaction.amount,
+                Transaction.description,
+                Transaction.category,
+                Transaction.type,
             )
+            .filter(*window)
             .order_by(Transaction.date)
             .all()
         )
@@ -75,36 +236,58 @@ class AIRecurringDetector:
 
         logger.info(f"Found {len(grouped)} potential recurring groups")
 
-        # Analyze each group for patterns
-        suggestions = []
+        # Analyze each group for patterns (LLM insights fetched afterwards, concurrently)
+        patterns = []
+        insight_requests = []
         for group in grouped:
             if len(group) >= AIRecurringDetector.MIN_OCCURRENCES:
                 pattern = AIRecurringDetector._analyze_pattern_ai(
-                    group, use_ai=use_ai
+                    group, use_ai=use_ai, include_insights=False
                 )
                 if pattern and pattern["confidence"] >= AIRecurringDetector.MIN_CONFIDENCE:
-                    # Check if already exists
-                    existing = AIRecurringDetector._check_existing_recurring(
-                        db, user_id, pattern
-                    )
-                    if not existing:
-                        suggestions.append(pattern)
+                    patterns.append(pattern)
+                    if use_ai and len(group) >= 3:
+                        insight_requests.append((pattern, group))
 
-        logger.info(f"Detected {len(suggestions)} new recurring patterns")
-        return suggestions
+        if insight_requests:
+            AIRecurringDetector._attach_ai_insights(insight_requests)
+
+        return patterns
 
     @staticmethod
+    def _attach_ai_insights(insight_requests: List[Tuple[Dict, List[Transaction]]]) -> None:
+        """
+        Fetch LLM insights for several patterns concurrently and attach them
+
+        Each insight is an independent network round-trip, so they run on a
+        small thread pool (at most MAX_CONCURRENT_INSIGHTS in flight) and the
+        total wait is roughly the slowest call rather than the sum.
+
+        Args:
+            insight_requests: (pattern, transactions) pairs; patterns are updated in place
+        """
+        workers = min(AIRecurringDetector.MAX_CONCURRENT_INSIGHTS, len(insight_requests))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            insights = pool.map(
+                lambda request: AIRecurringDetector._get_ai_pattern_insights(
+                    request[1], request[0]["frequency"], request[0]["confidence"]
+                ),
+                insight_requests,
+            )
+            for (pattern, _), insight in zip(insight_requests, insights):
+                if insight:
+                    pattern["ai_insights"] = insight
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
     def _normalize_description(description: str) -> str:
-        """Normalize transaction description for better matching"""
-        # Remove common suffixes
-        suffixes = ["INC", "LLC", "CORP", "LTD", "SUBSCRIPTION", "SUB", "PAYMENT", "PMT"]
-        desc = description.upper().strip()
-        
-        for suffix in suffixes:
-            if desc.endswith(suffix):
-                desc = desc[:-len(suffix)].strip()
-        
-        return desc
+        """
+        Normalize transaction description for better matching
+
+        Cached, as the same merchant descriptions repeat across a user's transactions.
+        """
+        # Remove common suffixes (INC, LLC, CORP, LTD, SUBSCRIPTION, SUB, PAYMENT, PMT)
+        return _DESCRIPTION_SUFFIX_RE.sub("", description.upper().strip())
 
     @staticmethod
     def _calculate_semantic_similarity(desc1: str, desc2: str, use_ai: bool = True) -> float:
@@ -128,8 +311,8 @@ class AIRecurringDetector:
             if norm1 in norm2 or norm2 in norm1:
                 return 0.95
             
-            # For now, use enhanced word overlap
-            # TODO: Implement actual embeddings when needed
+            # Pairwise calls use enhanced word overlap; batch grouping uses
+            # embeddings when RECURRING_EMBEDDING_MODEL is configured
             return AIRecurringDetector._word_overlap_similarity(desc1, desc2)
             
         except Exception as e:
@@ -138,7 +321,12 @@ class AIRecurringDetector:
 
     @staticmethod
     def _word_overlap_similarity(desc1: str, desc2: str) -> float:
-        """Calculate similarity based on word overlap (fallback method)"""
+        """
+        Calculate similarity based on word overlap (fallback method)
+
+        Word sets whose sizes alone bound the overlap below
+        SEMANTIC_SIMILARITY_THRESHOLD score 0.0 without the set operations.
+        """
         desc1 = desc1.lower().strip()
         desc2 = desc2.lower().strip()
         
@@ -153,55 +341,267 @@ class AIRecurringDetector:
         
         if not words1 or not words2:
             return 0.0
+
+        if AIRecurringDetector._overlap_bound_below_threshold(words1, words2):
+            return 0.0
         
         overlap = len(words1 & words2)
         union = len(words1 | words2)
         
         return overlap / union if union > 0 else 0.0
 
+    @staticmethod
+    def _description_features(description: str) -> Tuple[str, str, frozenset, int]:
+        """
+        Normalized (upper) form, lowercased form, lowercased word set and word
+        bitmask of a description
+
+        The bitmask sets bit hash(word) % 64 for every word; descriptions whose
+        masks share no bit cannot share a word.
+        """
+        lowered = description.lower().strip()
+        words = frozenset(lowered.split())
+        word_mask = 0
+        for word in words:
+            word_mask |= 1 << (hash(word) & 63)
+        return (
+            AIRecurringDetector._normalize_description(description),
+            lowered,
+            words,
+            word_mask,
+        )
+
+    @staticmethod
+    def _similarity_from_features(
+        features1: Tuple[str, str, frozenset, int],
+        features2: Tuple[str, str, frozenset, int],
+        use_ai: bool = True,
+    ) -> float:
+        """
+        Same score as _calculate_semantic_similarity, on precomputed features
+        """
+        norm1, lower1, words1, mask1 = features1
+        norm2, lower2, words2, mask2 = features2
+
+        if use_ai:
+            if norm1 == norm2:
+                return 1.0
+            if norm1 in norm2 or norm2 in norm1:
+                return 0.95
+
+        if lower1 == lower2:
+            return 1.0
+        if lower1 in lower2 or lower2 in lower1:
+            return 0.9
+        if not words1 or not words2:
+            return 0.0
+        if AIRecurringDetector._overlap_bound_below_threshold(words1, words2):
+            return 0.0
+        if not mask1 & mask2:
+            return 0.0  # no common word, skip the set operations
+
+        overlap = len(words1 & words2)
+        union = len(words1 | words2)
+        return overlap / union if union > 0 else 0.0
+
+    @staticmethod
+    def _overlap_bound_below_threshold(words1, words2) -> bool:
+        """
+        True if the word-overlap score cannot reach SEMANTIC_SIMILARITY_THRESHOLD
+
+        Overlap / union is at most min(|a|, |b|) / max(|a|, |b|), so sets of very
+        different sizes never match and the intersection/union can be skipped.
+        """
+        small, big = sorted((len(words1), len(words2)))
+        return small < AIRecurringDetector.SEMANTIC_SIMILARITY_THRESHOLD * big
+
+    @staticmethod
+    def _candidate_keys(features: Tuple[str, str, frozenset, int]) -> Optional[set]:
+        """
+        Inverted-index keys for a description, or None if it must be compared with everything
+
+        Any pair that can reach the similarity threshold shares a key: word
+        overlap needs a common word, and a substring match carries every
+        3-character shingle of the contained description's words. Descriptions
+        with no word of 3+ characters cannot be shingled and are always compared.
+        """
+        norm, _, words, _ = features
+        norm_words = norm.split()
+        if not any(len(w) >= 3 for w in words) or not any(len(w) >= 3 for w in norm_words):
+            return None
+
+        keys = {("w", w) for w in words}
+        keys.update(("l", w[k:k + 3]) for w in words for k in range(len(w) - 2))
+        keys.update(("u", w[k:k + 3]) for w in norm_words for k in range(len(w) - 2))
+        return keys
+
     @staticmethod
     def _group_similar_transactions_semantic(
         transactions: List[Transaction],
         use_ai: bool = True
     ) -> List[List[Transaction]]:
-        """Group transactions using semantic similarity"""
-        groups = []
-        used = set()
-
-        for i, trans in enumerate(transactions):
-            if i in used:
-                continue
+        """
+        Group transactions using semantic similarity
+
+        Candidates come from an inverted index over description words and
+        shingles (per transaction type), so each transaction is only scored
+        against others it could match instead of against every transaction.
+        Every matching pair (description similarity plus amount within the
+        earlier transaction's category tolerance) is linked with union-find,
+        so groups are the connected components and do not depend on which
+        transaction happens to come first.
+
+        With use_ai and RECURRING_EMBEDDING_MODEL configured (sentence-transformers
+        installed), descriptions are compared by embedding similarity instead.
+        """
+        if use_ai and EMBEDDINGS_AVAILABLE and settings.RECURRING_EMBEDDING_MODEL:
+            try:
+                return AIRecurringDetector._group_by_embeddings(transactions)
+            except Exception as e:
+                logger.warning(f"Embedding grouping failed, falling back to word overlap: {e}")
+
+        features = [
+            AIRecurringDetector._description_features(t.description) for t in transactions
+        ]
+
+        # (type, key) -> indices, plus per-type indices that must always be compared
+        postings = defaultdict(list)
+        always_compare = defaultdict(list)
+        by_type = defaultdict(list)
+        keys_per_trans = []
+        for i, (trans, feat) in enumerate(zip(transactions, features)):
+            keys = AIRecurringDetector._candidate_keys(feat)
+            keys_per_trans.append(keys)
+            by_type[trans.type].append(i)
+            if keys is None:
+                always_compare[trans.type].append(i)
+            else:
+                for key in keys:
+                    postings[(trans.type, key)].append(i)
 
-            group = [trans]
-            used.add(i)
+        tolerance_by_category = {}
+        parent = list(range(len(transactions)))
 
-            # Find similar transactions
-            for j, other in enumerate(transactions[i + 1:], start=i + 1):
-                if j in used:
+        for i, trans in enumerate(transactions):
+            keys = keys_per_trans[i]
+            if keys is None:
+                candidates = by_type[trans.type]
+            else:
+                candidate_set = set(always_compare[trans.type])
+                for key in keys:
+                    candidate_set.update(postings[(trans.type, key)])
+                candidates = candidate_set
+
+            if trans.category not in tolerance_by_category:
+                tolerance_by_category[trans.category] = AIRecurringDetector._get_amount_tolerance(trans.category)
+            tolerance = tolerance_by_category[trans.category]
+            amount = trans.amount
+            amount_tolerance = tolerance * amount
+
+            # Link with similar transactions (same type, later in the list)
+            find = AIRecurringDetector._find
+            for j in candidates:
+                # Pairs already in one set need no scoring
+                if j <= i or find(parent, j) == find(parent, i):
                     continue
 
-                # Must be same type
-                if trans.type != other.type:
+                other = transactions[j]
+
+                # Amount similarity with adaptive tolerance, checked first as it is
+                # cheaper than description similarity. Same test as
+                # _is_amount_similar without the division: |a - b| / ((a + b) / 2) <= tol
+                other_amount = other.amount
+                if amount and other_amount:
+                    if abs(amount - other_amount) * 2 > amount_tolerance + tolerance * other_amount:
+                        continue
+                elif amount != other_amount:
                     continue
 
-                # Check semantic similarity
-                similarity = AIRecurringDetector._calculate_semantic_similarity(
-                    trans.description, other.description, use_ai=use_ai
+                similarity = AIRecurringDetector._similarity_from_features(
+                    features[i], features[j], use_ai=use_ai
                 )
-                
+
                 if similarity >= AIRecurringDetector.SEMANTIC_SIMILARITY_THRESHOLD:
-                    # Check amount similarity with adaptive tolerance
-                    tolerance = AIRecurringDetector._get_amount_tolerance(trans.category)
-                    if AIRecurringDetector._is_amount_similar(
-                        trans.amount, other.amount, tolerance
-                    ):
-                        group.append(other)
-                        used.add(j)
+                    AIRecurringDetector._union(parent, i, j)
 
-            if len(group) >= AIRecurringDetector.MIN_OCCURRENCES:
-                groups.append(group)
+        return AIRecurringDetector._components(transactions, parent)
+
+    @staticmethod
+    def _find(parent: List[int], x: int) -> int:
+        """Union-find root of x, compressing the path"""
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    @staticmethod
+    def _union(parent: List[int], a: int, b: int) -> None:
+        """Merge the sets of a and b (the lower index stays root)"""
+        root_a = AIRecurringDetector._find(parent, a)
+        root_b = AIRecurringDetector._find(parent, b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    @staticmethod
+    def _components(transactions: List[Transaction], parent: List[int]) -> List[List[Transaction]]:
+        """Union-find sets with at least MIN_OCCURRENCES members, in transaction order"""
+        components = defaultdict(list)
+        for i, trans in enumerate(transactions):
+            components[AIRecurringDetector._find(parent, i)].append(trans)
+        return [
+            group for group in components.values()
+            if len(group) >= AIRecurringDetector.MIN_OCCURRENCES
+        ]
+
+    @staticmethod
+    def _group_by_embeddings(transactions: List[Transaction]) -> List[List[Transaction]]:
+        """
+        Group transactions by cosine similarity of description embeddings
+
+        Each unique normalized description is encoded once; all pairwise
+        similarities come from a single matrix product of the normalized
+        embeddings. Pairs are linked like the word-overlap path (same type,
+        amount within the earlier transaction's category tolerance).
+        """
+        if not transactions:
+            return []
+
+        unique_index = {}
+        desc_index = []
+        for t in transactions:
+            norm = AIRecurringDetector._normalize_description(t.description)
+            desc_index.append(unique_index.setdefault(norm, len(unique_index)))
+
+        embeddings = _get_embedder(settings.RECURRING_EMBEDDING_MODEL).encode(
+            list(unique_index),
+            batch_size=64,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        similar_descs = (embeddings @ embeddings.T) >= AIRecurringDetector.SEMANTIC_SIMILARITY_THRESHOLD
+
+        tolerance_by_category = {}
+        parent = list(range(len(transactions)))
+
+        for i, trans in enumerate(transactions):
+            if trans.category not in tolerance_by_category:
+                tolerance_by_category[trans.category] = AIRecurringDetector._get_amount_tolerance(trans.category)
+            tolerance = tolerance_by_category[trans.category]
 
-        return groups
+            row = similar_descs[desc_index[i]]
+            for j in range(i + 1, len(transactions)):
+                if not row[desc_index[j]]:
+                    continue
+
+                other = transactions[j]
+                if other.type == trans.type and AIRecurringDetector._is_amount_similar(
+                    trans.amount, other.amount, tolerance
+                ):
+                    AIRecurringDetector._union(parent, i, j)
+
+        return AIRecurringDetector._components(transactions, parent)
 
     @staticmethod
     def _get_amount_tolerance(category: Optional[str]) -> float:
@@ -227,9 +627,15 @@ class AIRecurringDetector:
     @staticmethod
     def _analyze_pattern_ai(
         transactions: List[Transaction],
-        use_ai: bool = True
+        use_ai: bool = True,
+        include_insights: bool = True
     ) -> Optional[Dict]:
-        """Analyze transaction group to detect recurring pattern using AI"""
+        """
+        Analyze transaction group to detect recurring pattern using AI
+
+        With include_insights=False the LLM insight is left to the caller
+        (see _attach_ai_insights).
+        """
         if len(transactions) < 2:
             return None
 
@@ -237,10 +643,8 @@ class AIRecurringDetector:
         sorted_trans = sorted(transactions, key=lambda t: t.date)
 
         # Calculate intervals
-        intervals = []
-        for i in range(len(sorted_trans) - 1):
-            days = (sorted_trans[i + 1].date - sorted_trans[i].date).days
-            intervals.append(days)
+        dates = [t.date for t in sorted_trans]
+        intervals = [(later - earlier).days for earlier, later in zip(dates, dates[1:])]
 
         if not intervals:
             return None
@@ -253,19 +657,18 @@ class AIRecurringDetector:
         if not frequency:
             return None
 
-        # Calculate statistics
-        avg_amount = sum(t.amount for t in sorted_trans) / len(sorted_trans)
-        amount_variance = AIRecurringDetector._calculate_amount_variance(sorted_trans)
-        
-        # Get most common values
-        descriptions = [t.description for t in sorted_trans]
-        most_common_desc = max(set(descriptions), key=descriptions.count)
+        # Calculate statistics (amounts read once, mean shared with the variance)
+        amounts = [t.amount for t in sorted_trans]
+        avg_amount = sum(amounts) / len(amounts)
+        amount_variance = AIRecurringDetector._calculate_amount_variance(amounts, avg_amount)
         
-        categories = [t.category for t in sorted_trans]
-        most_common_cat = max(set(categories), key=categories.count)
+        # Get most common values (single counting pass each; ties go to the earliest)
+        most_common_desc = Counter(t.description for t in sorted_trans).most_common(1)[0][0]
+        category_counts = Counter(t.category for t in sorted_trans if t.category is not None).most_common(1)
+        most_common_cat = category_counts[0][0] if category_counts else None
 
         # Calculate next expected date
-        last_date = sorted_trans[-1].date
+        last_date = dates[-1]
         next_date, date_range = AIRecurringDetector._predict_next_occurrence(
             last_date, frequency, intervals
         )
@@ -280,13 +683,13 @@ class AIRecurringDetector:
 
         # Use AI to analyze pattern if enabled and sufficient data
         ai_insights = None
-        if use_ai and len(sorted_trans) >= 3:
+        if use_ai and include_insights and len(sorted_trans) >= 3:
             ai_insights = AIRecurringDetector._get_ai_pattern_insights(
                 sorted_trans, frequency, confidence
             )
 
         pattern = {
-            "transaction_type": sorted_trans[0].type.value,
+            "transaction_type": sorted_trans[0].type,
             "amount": round(avg_amount, 2),
             "amount_variance": round(amount_variance, 2),
             "description": most_common_desc,
@@ -311,40 +714,64 @@ class AIRecurringDetector:
         """
         Detect frequency pattern from intervals
         Returns (frequency, confidence)
+
+        Each interval is assigned to the pattern whose 20% band contains it and
+        the pattern with the most intervals wins, so one late or skipped
+        payment does not drag an otherwise regular series out of its band (as
+        a plain average would). Confidence is the share of intervals in the
+        winning band times how close their mean is to the expected period; at
+        least half of the intervals must fall in the band.
         """
         if not intervals:
             return None, 0.0
 
-        avg_interval = sum(intervals) / len(intervals)
-        
-        # Try to match to known patterns (with 20% tolerance)
-        tolerance = 0.20
+        # Per pattern: [count, sum] of the intervals in its band (bands ascending by period)
+        in_band = {}
+        for interval in intervals:
+            for freq_name, expected_days, min_days, max_days, inv_expected in AIRecurringDetector._PATTERN_BOUNDS:
+                if interval < min_days:
+                    break  # every later pattern is longer still
+                if interval <= max_days:
+                    stats = in_band.setdefault(freq_name, [0, 0])
+                    stats[0] += 1
+                    stats[1] += interval
+                    break
+
         best_match = None
         best_confidence = 0.0
 
-        for freq_name, expected_days in AIRecurringDetector.PATTERN_INTERVALS.items():
-            min_days = expected_days * (1 - tolerance)
-            max_days = expected_days * (1 + tolerance)
+        for freq_name, expected_days, min_days, max_days, inv_expected in AIRecurringDetector._PATTERN_BOUNDS:
+            if freq_name not in in_band:
+                continue
+            count, total = in_band[freq_name]
+            share = count / len(intervals)
+            if share < 0.5:
+                continue
+
+            # Calculate how close to expected
+            deviation = abs(total / count - expected_days) * inv_expected
+            match_confidence = share * (1.0 - deviation)
 
-            if min_days <= avg_interval <= max_days:
-                # Calculate how close to expected
-                deviation = abs(avg_interval - expected_days) / expected_days
-                match_confidence = 1.0 - deviation
-                
-                if match_confidence > best_confidence:
-                    best_match = freq_name
-                    best_confidence = match_confidence
+            if match_confidence > best_confidence:
+                best_match = freq_name
+                best_confidence = match_confidence
 
         return best_match, best_confidence
 
     @staticmethod
-    def _calculate_amount_variance(transactions: List[Transaction]) -> float:
-        """Calculate amount variance as percentage"""
-        if len(transactions) < 2:
+    def _calculate_amount_variance(amounts: List[float], avg: Optional[float] = None) -> float:
+        """
+        Calculate amount variance as percentage (coefficient of variation)
+
+        Args:
+            amounts: Transaction amounts
+            avg: Precomputed mean of amounts, if the caller already has it
+        """
+        if len(amounts) < 2:
             return 0.0
 
-        amounts = [t.amount for t in transactions]
-        avg = sum(amounts) / len(amounts)
+        if avg is None:
+            avg = sum(amounts) / len(amounts)
         
         if avg == 0:
             return 0.0
@@ -358,18 +785,26 @@ class AIRecurringDetector:
     def _predict_next_occurrence(
         last_date: datetime,
         frequency: str,
-        intervals: List[int]
+        intervals: List[int],
+        avg_interval: Optional[float] = None
     ) -> Tuple[datetime, Optional[str]]:
         """
         Predict next occurrence date with confidence range
         Returns (predicted_date, date_range_string)
+
+        Args:
+            last_date: Date of the latest transaction
+            frequency: Detected frequency
+            intervals: Days between consecutive transactions
+            avg_interval: Precomputed mean of intervals, if the caller already has it
         """
         expected_days = AIRecurringDetector.PATTERN_INTERVALS.get(frequency, 30)
         next_date = last_date + timedelta(days=expected_days)
 
         # Calculate variance in intervals
         if len(intervals) > 1:
-            avg_interval = sum(intervals) / len(intervals)
+            if avg_interval is None:
+                avg_interval = sum(intervals) / len(intervals)
             variance = sum((i - avg_interval) ** 2 for i in intervals) / len(intervals)
             std_dev = variance ** 0.5
 
@@ -443,45 +878,29 @@ class AIRecurringDetector:
             amounts = [t.amount for t in sorted_trans]
             dates = [t.date.strftime("%Y-%m-%d") for t in sorted_trans]
             
-            prompt = f"""Analyze this recurring transaction pattern and provide a brief insight (1-2 sentences):
-
-Merchant: {sorted_trans[0].description}
+            prompt = f"""Merchant: {sorted_trans[0].description}
 Category: {sorted_trans[0].category}
 Frequency: {frequency}
 Occurrences: {len(transactions)}
 Amounts: {amounts}
 Dates: {dates}
-Confidence: {confidence}
-
-Provide a helpful insight about this pattern. Is it consistent? Any trends? Any recommendations?
-Keep it brief and actionable."""
+Confidence: {confidence}"""
 
-            # Initialize LLM based on provider
-            from langchain_anthropic import ChatAnthropic
-            from langchain_openai import ChatOpenAI
-            
+            # Shared LLM client, built once per provider/model
             provider = getattr(settings, 'AI_PROVIDER', 'anthropic').lower()
-            model = settings.get_model_for_provider(provider)
-            
-            if provider in ["anthropic", "claude"] and settings.ANTHROPIC_API_KEY:
-                llm = ChatAnthropic(
-                    api_key=settings.ANTHROPIC_API_KEY,
-                    model=model,
-                    temperature=0.3,
-                    max_tokens=150,
-                )
-            elif settings.OPENAI_API_KEY:
-                llm = ChatOpenAI(
-                    api_key=settings.OPENAI_API_KEY,
-                    model=model,
-                    temperature=0.3,
-                    max_tokens=150,
-                )
-            else:
+            llm = get_service_llm(
+                provider, settings.get_model_for_provider(provider),
+                temperature=0.3, max_tokens=150,
+            )
+            if llm is None:
                 return None
 
-            # Get response
-            response = llm.invoke(prompt)
+            # Get response (static instructions as the cacheable system message)
+            from langchain_core.messages import HumanMessage
+            response = llm.invoke([
+                cached_system_message(PATTERN_INSIGHT_SYSTEM_PROMPT, provider),
+                HumanMessage(content=prompt),
+            ])
             insight = response.content.strip()
             return insight
 
@@ -494,17 +913,28 @@ Keep it brief and actionable."""
         db: Session, user_id: str, pattern: Dict
     ) -> bool:
         """Check if recurring transaction already exists for this pattern"""
-        existing = (
-            db.query(RecurringTransaction)
-            .filter(
+        # EXISTS - the database stops at the first match and no row is materialized
+        return db.query(
+            exists().where(
                 RecurringTransaction.user_id == user_id,
                 RecurringTransaction.is_active == True,
-                RecurringTransaction.description.ilike(f"%{pattern['description']}%")
+                RecurringTransaction.description.icontains(pattern["description"], autoescape=True)
             )
-            .first()
-        )
+        ).scalar()
 
-        return existing is not None
+    @staticmethod
+    def _get_active_recurring_descriptions(db: Session, user_id: str) -> List[str]:
+        """
+        Lowercased descriptions of the user's active recurring transactions
+
+        Lets callers checking many patterns do the containment match in Python
+        after one query, instead of one query per pattern.
+        """
+        rows = db.query(RecurringTransaction.description).filter(
+            RecurringTransaction.user_id == user_id,
+            RecurringTransaction.is_active == True,
+        ).all()
+        return [description.lower() for (description,) in rows if description]
 
     @staticmethod
     def check_new_transaction_for_pattern(
@@ -553,24 +983,44 @@ Keep it brief and actionable."""
         amount_max = reference.amount * (1 + tolerance)
 
         # Get candidates
-        candidates = (
-            db.query(Transaction)
-            .filter(
-                Transaction.user_id == user_id,
-                Transaction.id != reference.id,
-                Transaction.type == reference.type,
-                Transaction.amount >= amount_min,
-                Transaction.amount <= amount_max,
-                Transaction.date >= cutoff_date
-            )
-            .all()
+        # Filters in ix_tx_user_type_amt_date column order, the id exclusion last
+        query = db.query(Transaction).filter(
+            Transaction.user_id == user_id,
+            Transaction.type == reference.type,
+            Transaction.amount >= amount_min,
+            Transaction.amount <= amount_max,
+            Transaction.date >= cutoff_date,
+            Transaction.id != reference.id
         )
 
-        # Filter by semantic similarity
+        if db.get_bind().dialect.name == "postgresql":
+            # Prefilter in the database: trigram-near rows (% operator, served by the
+            # ix_tx_desc_trgm GIN index, then held to TRIGRAM_PREFILTER_THRESHOLD) and
+            # rows containing, or contained in, the reference text. Not limited - every
+            # candidate is scored below, as on other databases.
+            reference_lower = reference.description.lower()
+            query = query.filter(
+                or_(
+                    and_(
+                        Transaction.description.op("%")(reference.description),
+                        func.similarity(Transaction.description, reference.description)
+                        >= AIRecurringDetector.TRIGRAM_PREFILTER_THRESHOLD,
+                    ),
+                    Transaction.description.icontains(reference.description, autoescape=True),
+                    func.strpos(reference_lower, func.lower(Transaction.description)) > 0,
+                )
+            )
+
+        candidates = query.all()
+
+        # Filter by semantic similarity (reference normalized once)
+        reference_features = AIRecurringDetector._description_features(reference.description)
         similar = []
         for candidate in candidates:
-            similarity = AIRecurringDetector._calculate_semantic_similarity(
-                reference.description, candidate.description, use_ai=use_ai
+            similarity = AIRecurringDetector._similarity_from_features(
+                reference_features,
+                AIRecurringDetector._description_features(candidate.description),
+                use_ai=use_ai
             )
             if similarity >= AIRecurringDetector.SEMANTIC_SIMILARITY_THRESHOLD:
                 similar.append(candidate)
@@ -2,20 +2,113 @@
 AI-Enhanced Transaction Categorization Service
 Uses LLM for semantic understanding with fallback to rule-based
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 from datetime import datetime
+from dataclasses import dataclass
+import asyncio
 import logging
-import json
+import orjson
+import re
 
 from ..database.models import Transaction, User, Category
 from ..database.category_hierarchy import CATEGORY_HIERARCHY
 from .transaction_categorizer import TransactionCategorizer
-from .category_manager import CategoryManager
+from .category_manager import CategorizationView, CategoryManager
+from . import categorization_cache, spending_cache
+from .llm_clients import AsyncRateLimiter, cached_human_message, cached_system_message, extract_json_array, extract_json_object, get_service_llm
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Identical for every transaction - sent as the system block so providers with
+# prompt caching can reuse it
+CATEGORIZATION_SYSTEM_PROMPT = """You are a financial transaction categorization expert. Categorize the given transaction into the most appropriate category.
+
+**Instructions:**
+1. Choose the MOST SPECIFIC category from the user's existing categories
+2. Consider the user's historical patterns and usage frequency
+3. Use semantic understanding, not just keywords
+4. If NO existing category fits well, you can suggest a NEW category
+5. Provide confidence score (0.0 to 1.0)
+6. Explain your reasoning briefly
+
+**Response Format (JSON):**
+{
+    "category": "category_name",
+    "confidence": 0.95,
+    "reasoning": "Brief explanation",
+    "new_category_suggested": false
+}
+
+**If suggesting a NEW category:**
+{
+    "category": "new_category_name",
+    "confidence": 0.85,
+    "reasoning": "Why existing categories don't fit",
+    "new_category_suggested": true,
+    "new_category": {
+        "name": "new_category_name",
+        "display_name": "New Category Name",
+        "parent": "parent_category_if_applicable"
+    }
+}
+
+**Examples:**
+- "Whole Foods Market" → "groceries" (not just "food")
+- "Netflix subscription" → "streaming" (not just "entertainment")
+- "Apple Store" → Could be "electronics" or "groceries" depending on context
+
+Respond ONLY with valid JSON, no other text."""
+
+# Bulk variant: several numbered transactions per call, answered as one array
+BATCH_CATEGORIZATION_SYSTEM_PROMPT = CATEGORIZATION_SYSTEM_PROMPT.replace(
+    "Categorize the given transaction into the most appropriate category.",
+    "Categorize each of the given numbered transactions into the most appropriate category.",
+) + """
+
+**Several transactions:** respond with a JSON array containing one object per
+transaction, in the format above plus an "id" field with the transaction's
+number, e.g. [{"id": 1, "category": "groceries", ...}, {"id": 2, ...}].
+Respond ONLY with the JSON array."""
+
+# Recent rows scanned per history entry when deduplicating merchants
+HISTORY_SCAN_FACTOR = 5
+
+# History rows worth showing the model: a real category, not NULL/empty/uncategorized
+_CATEGORIZED = (
+    Transaction.category.isnot(None),
+    Transaction.category.notin_(["", "uncategorized"]),
+)
+
+# Output budget for one bulk call (about 20 transactions)
+BATCH_MAX_TOKENS = 4000
+
+# Per-call part of the prompt; everything before it is shared across calls
+TRANSACTION_DETAILS_TEMPLATE = """**Transaction Details:**
+- Description: "{description}"
+- Amount: ${amount:.2f}
+- Type: {trans_type}"""
+
+SIMILAR_HISTORY_LINE_TEMPLATE = "- '{description}' (${amount:.2f}) → {category}\n"
+
+BATCH_TRANSACTION_LINE_TEMPLATE = "{index}. \"{description}\" | ${amount:.2f} | {type}\n"
+
+
+@dataclass(slots=True)
+class CategorizationContext:
+    """Per-user data shared by every categorization prompt in a request"""
+    user_history: List[Dict]
+    user_categories: List[Dict]
+    # Valid category names for validating answers
+    category_names: List[str]
+    # Formatted categories and history - identical for every call of this user,
+    # so it is sent as a cacheable prefix of the user message
+    prompt_context: str
+
 
 class AITransactionCategorizer:
     """
@@ -37,6 +130,7 @@ class AITransactionCategorizer:
         user_id: str,
         db: Session,
         use_ai: bool = True,
+        context: Optional[CategorizationContext] = None,
     ) -> Dict:
         """
         Categorize transaction using AI with fallback
@@ -48,24 +142,232 @@ class AITransactionCategorizer:
             user_id: User ID for personalization
             db: Database session for learning from history
             use_ai: Whether to use AI (False for testing/fallback)
+            context: Prefetched user history/categories (see load_context)
             
         Returns:
             Dict with category, confidence, reasoning, and metadata
         """
-        # Try AI categorization first
+        # Nothing to categorize: no history, cache or LLM work
+        description = AITransactionCategorizer._clean_description(description)
+        skipped = AITransactionCategorizer._skip_result(description, amount)
+        if skipped:
+            return skipped
+        
+        # Try AI categorization first (repeat merchants come from the cache),
+        # unless the keyword rules are already confident
         if use_ai and settings.AI_PROVIDER:
+            # Earlier answers and user corrections beat the keyword rules
+            cached = categorization_cache.get_cached_category(user_id, description, trans_type, amount)
+            if cached:
+                logger.info(f"Cached categorization: {description} -> {cached['category']}")
+                return cached
+
+            category_names = (
+                context.category_names if context is not None
+                else AITransactionCategorizer._valid_category_names(user_id, db)
+            )
+            rule_result = AITransactionCategorizer._confident_rule_result(
+                description, amount, trans_type, category_names
+            )
+            if rule_result:
+                logger.info(f"Rule categorization (no AI): {description} -> {rule_result['category']}")
+                return rule_result
+
             try:
                 result = AITransactionCategorizer._categorize_with_ai(
-                    description, amount, trans_type, user_id, db
+                    description, amount, trans_type, user_id, db, context
                 )
                 if result and result.get("confidence", 0) > 0.5:
                     logger.info(f"AI categorization: {description} -> {result['category']} ({result['confidence']:.2f})")
+                    categorization_cache.store_category(user_id, description, trans_type, amount, result)
                     return result
             except Exception as e:
                 logger.warning(f"AI categorization failed, falling back to rules: {e}")
         
         # Fallback to rule-based
         logger.info(f"Using rule-based categorization for: {description}")
+        return AITransactionCategorizer._categorize_with_rules(description, amount, trans_type)
+    
+    @staticmethod
+    def categorize_bulk(
+        transactions: List[Dict],
+        user_id: str,
+        db: Session,
+        use_ai: bool = True,
+        batch_size: int = 20,
+    ) -> List[Dict]:
+        """
+        Categorize many transactions (e.g., an import) with one LLM call per batch
+        
+        User history and categories are loaded once, cached merchants are
+        served from the categorization cache, and the rest are sent
+        batch_size at a time in a single prompt. Anything the model does not
+        answer confidently falls back to rule-based categorization.
+        
+        Args:
+            transactions: Dicts with description, amount and type
+            user_id: User ID for personalization
+            db: Database session for learning from history
+            use_ai: Whether to use AI (False for testing/fallback)
+            batch_size: Transactions per LLM call
+            
+        Returns:
+            One result dict per transaction, in input order
+        """
+        transactions = AITransactionCategorizer._clean_transactions(transactions)
+        results, pending = AITransactionCategorizer._resolve_without_llm(transactions, user_id, db, use_ai)
+        
+        if pending:
+            context = AITransactionCategorizer.load_context(db, user_id)
+            
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                try:
+                    answers = AITransactionCategorizer._categorize_batch_with_ai(
+                        [transactions[i] for i in batch], user_id, db, context
+                    )
+                except Exception as e:
+                    logger.warning(f"AI batch categorization failed, falling back to rules: {e}")
+                    continue
+                
+                for i, result in zip(batch, answers):
+                    AITransactionCategorizer._accept_ai_result(results, i, transactions[i], result, user_id)
+        
+        return AITransactionCategorizer._fill_with_rules(transactions, results)
+    
+    @staticmethod
+    def _clean_transactions(transactions: List[Dict]) -> List[Dict]:
+        """Copies of the transactions with cleaned descriptions"""
+        return [
+            {**txn, "description": AITransactionCategorizer._clean_description(txn["description"])}
+            for txn in transactions
+        ]
+    
+    @staticmethod
+    def _resolve_without_llm(
+        transactions: List[Dict],
+        user_id: str,
+        db: Session,
+        use_ai: bool,
+    ) -> Tuple[List[Optional[Dict]], List[int]]:
+        """
+        Answer what does not need the LLM (skips, cache hits, confident rules)
+        
+        Returns:
+            (results with None where unanswered, indexes to send to the LLM)
+        """
+        results: List[Optional[Dict]] = [
+            AITransactionCategorizer._skip_result(txn["description"], txn["amount"])
+            for txn in transactions
+        ]
+        pending: List[int] = []
+        if not (use_ai and settings.AI_PROVIDER):
+            return results, pending
+        
+        category_names = AITransactionCategorizer._valid_category_names(user_id, db)
+        for i, txn in enumerate(transactions):
+            if results[i] is not None:
+                continue
+            cached = categorization_cache.get_cached_category(
+                user_id, txn["description"], txn["type"], txn["amount"]
+            )
+            if cached:
+                results[i] = cached
+                continue
+            rule_result = AITransactionCategorizer._confident_rule_result(
+                txn["description"], txn["amount"], txn["type"], category_names
+            )
+            if rule_result:
+                results[i] = rule_result
+            else:
+                pending.append(i)
+        return results, pending
+    
+    @staticmethod
+    def _accept_ai_result(
+        results: List[Optional[Dict]],
+        index: int,
+        txn: Dict,
+        result: Optional[Dict],
+        user_id: str,
+    ) -> None:
+        """Keep (and cache) an AI answer if it is confident enough"""
+        if result and result.get("confidence", 0) > 0.5:
+            categorization_cache.store_category(
+                user_id, txn["description"], txn["type"], txn["amount"], result
+            )
+            results[index] = result
+    
+    @staticmethod
+    def _fill_with_rules(transactions: List[Dict], results: List[Optional[Dict]]) -> List[Dict]:
+        """Fallback to rule-based for everything not answered by the cache or AI"""
+        for i, txn in enumerate(transactions):
+            if results[i] is None:
+                results[i] = AITransactionCategorizer._categorize_with_rules(
+                    txn["description"], txn["amount"], txn["type"]
+                )
+        return results
+    
+    @staticmethod
+    def _clean_description(description: Optional[str]) -> str:
+        """Strip and collapse whitespace so cache keys and prompts see one form"""
+        return _WHITESPACE_RE.sub(" ", description or "").strip()
+    
+    @staticmethod
+    def _skip_result(description: str, amount: float) -> Optional[Dict]:
+        """Result for inputs not worth categorizing (empty description or zero amount)"""
+        if description and amount:
+            return None
+        return {
+            "category": "uncategorized",
+            "confidence": 1.0,
+            "reasoning": "Empty description or zero amount",
+            "new_category_suggested": False,
+            "method": "skip",
+        }
+    
+    @staticmethod
+    def _valid_category_names(user_id: str, db: Session) -> List[str]:
+        """The user's active category names (default hierarchy if they have none)"""
+        return CategoryManager.get_categorization_view(user_id, db).names or CATEGORY_HIERARCHY.get_all_categories()
+    
+    @staticmethod
+    def _confident_rule_result(
+        description: str,
+        amount: float,
+        trans_type: str,
+        category_names: List[str],
+    ) -> Optional[Dict]:
+        """
+        Rule-based result when it is good enough to skip the LLM
+        
+        Tier of the categorization cascade after the cache: keyword matches at
+        or above settings.AI_ESCALATION_THRESHOLD whose category the user has
+        and that fits the transaction type are returned as-is ("interest" on
+        an expense is a card charge, not investment income); everything else
+        is escalated to the LLM.
+        """
+        result = TransactionCategorizer.categorize(description, amount, trans_type)
+        if result["confidence"] < settings.AI_ESCALATION_THRESHOLD or result["category"] not in category_names:
+            return None
+        if not AITransactionCategorizer._fits_type(result["category"], trans_type):
+            return None
+        result["method"] = "rule-based"
+        result["reasoning"] = "Keyword matching"
+        return result
+    
+    @staticmethod
+    def _fits_type(category: str, trans_type: str) -> bool:
+        """Income categories only for income, everything else only for expenses"""
+        is_income = (
+            category in TransactionCategorizer.INCOME_CATEGORIES
+            or CATEGORY_HIERARCHY.get_root_category(category) == "income"
+        )
+        return (trans_type or "").lower() == ("income" if is_income else "expense")
+    
+    @staticmethod
+    def _categorize_with_rules(description: str, amount: float, trans_type: str) -> Dict:
+        """Keyword-based categorization used when AI is unavailable or unsure"""
         result = TransactionCategorizer.categorize(description, amount, trans_type)
         result["method"] = "rule-based"
         result["reasoning"] = "Keyword matching"
@@ -78,6 +380,7 @@ class AITransactionCategorizer:
         trans_type: str,
         user_id: str,
         db: Session,
+        context: Optional[CategorizationContext] = None,
     ) -> Dict:
         """
         Use LLM to categorize transaction with context
@@ -88,75 +391,259 @@ class AITransactionCategorizer:
         3. Calls LLM for categorization
         4. Parses and validates response
         """
-        # Get user's recent categorization history for learning
-        user_history = AITransactionCategorizer._get_user_history(db, user_id, limit=20)
+        if context is None:
+            context = AITransactionCategorizer.load_context(db, user_id)
+        llm, messages, all_categories = AITransactionCategorizer._prepare_ai_request(
+            description, amount, trans_type, context,
+            AITransactionCategorizer._get_similar_history(db, user_id, description),
+        )
+        
+        # Get response
+        response = llm.invoke(messages)
+        
+        return AITransactionCategorizer._finish_ai_result(response.content, all_categories, user_id, db)
+    
+    @staticmethod
+    async def acategorize(
+        description: str,
+        amount: float,
+        trans_type: str,
+        user_id: str,
+        db: Session,
+        use_ai: bool = True,
+    ) -> Dict:
+        """
+        Async categorize: same result as categorize, without blocking the event loop on the LLM
+        """
+        results = await AITransactionCategorizer.acategorize_many(
+            [{"description": description, "amount": amount, "type": trans_type}],
+            user_id, db, use_ai=use_ai,
+        )
+        return results[0]
+    
+    @staticmethod
+    async def acategorize_many(
+        transactions: List[Dict],
+        user_id: str,
+        db: Session,
+        use_ai: bool = True,
+        max_concurrency: int = 10,
+        rpm: int = 500,
+    ) -> List[Dict]:
+        """
+        Categorize several transactions with concurrent LLM calls
         
-        # Get user's personalized categories
-        user_categories = CategoryManager.get_user_categories(user_id, db, active_only=True)
-        all_categories = [cat["name"] for cat in user_categories]
+        Only the LLM calls run on the event loop. The database and Redis work
+        (cache lookups, user context, similar history, suggested categories)
+        is sync and runs in a worker thread, once before and once after the
+        calls - one thread at a time, so the Session is never shared
+        concurrently. Each transaction gets its own ainvoke call, at most
+        max_concurrency in flight and at most rpm started per minute. Cache
+        hits and fallbacks behave as in categorize.
         
-        # Fallback to default categories if user has none
-        if not all_categories:
-            all_categories = CATEGORY_HIERARCHY.get_all_categories()
+        Args:
+            transactions: Dicts with description, amount and type
+            user_id: User ID for personalization
+            db: Database session for learning from history
+            use_ai: Whether to use AI (False for testing/fallback)
+            max_concurrency: Maximum LLM calls in flight
+            rpm: Maximum LLM calls started per minute
+            
+        Returns:
+            One result dict per transaction, in input order
+        """
+        transactions = AITransactionCategorizer._clean_transactions(transactions)
         
-        # Build AI prompt
-        prompt = AITransactionCategorizer._build_categorization_prompt(
-            description, amount, trans_type, user_history, user_categories
+        def prepare() -> Tuple[List[Optional[Dict]], List[Tuple[int, object, list, List[str]]]]:
+            results, pending = AITransactionCategorizer._resolve_without_llm(transactions, user_id, db, use_ai)
+            requests = []
+            if pending:
+                context = AITransactionCategorizer.load_context(db, user_id)
+                for i in pending:
+                    txn = transactions[i]
+                    try:
+                        llm, messages, all_categories = AITransactionCategorizer._prepare_ai_request(
+                            txn["description"], txn["amount"], txn["type"], context,
+                            AITransactionCategorizer._get_similar_history(db, user_id, txn["description"]),
+                        )
+                    except Exception as e:
+                        logger.warning(f"AI categorization failed, falling back to rules: {e}")
+                        continue
+                    requests.append((i, llm, messages, all_categories))
+            return results, requests
+        
+        results, requests = await asyncio.to_thread(prepare)
+        
+        answers: List = []
+        if requests:
+            semaphore = asyncio.Semaphore(max_concurrency)
+            limiter = AsyncRateLimiter(rpm, 60.0, burst=max_concurrency)
+            
+            async def ask(llm, messages) -> str:
+                async with semaphore:
+                    await limiter.acquire()
+                    response = await llm.ainvoke(messages)
+                return response.content
+            
+            answers = await asyncio.gather(
+                *(ask(llm, messages) for _, llm, messages, _ in requests),
+                return_exceptions=True,
+            )
+        
+        def finish() -> List[Dict]:
+            for (i, _, _, all_categories), answer in zip(requests, answers):
+                if isinstance(answer, Exception):
+                    logger.warning(f"AI categorization failed, falling back to rules: {answer}")
+                    continue
+                try:
+                    result = AITransactionCategorizer._finish_ai_result(answer, all_categories, user_id, db)
+                except Exception as e:
+                    logger.warning(f"AI categorization failed, falling back to rules: {e}")
+                    continue
+                AITransactionCategorizer._accept_ai_result(results, i, transactions[i], result, user_id)
+            return AITransactionCategorizer._fill_with_rules(transactions, results)
+        
+        return await asyncio.to_thread(finish)
+    
+    @staticmethod
+    def load_context(db: Session, user_id: str) -> CategorizationContext:
+        """
+        Load the user data every categorization prompt needs
+        
+        Callers categorizing several transactions in one request can load
+        this once and pass it to categorize(context=...).
+        """
+        user_history = AITransactionCategorizer._get_user_history(
+            db, user_id, limit=settings.AI_CATEGORIZATION_HISTORY_LIMIT
         )
+        view = CategoryManager.get_categorization_view(user_id, db)
+        categories_text, history_text = AITransactionCategorizer._build_user_context(user_history, view)
+        return CategorizationContext(
+            user_history=user_history,
+            user_categories=view.categories,
+            # Fallback to default categories if user has none
+            category_names=view.names or CATEGORY_HIERARCHY.get_all_categories(),
+            prompt_context=f"{categories_text}\n{history_text}".strip(),
+        )
+    
+    @staticmethod
+    def _prepare_ai_request(
+        description: str,
+        amount: float,
+        trans_type: str,
+        context: CategorizationContext,
+        similar_history: List[Dict],
+    ) -> Tuple[object, list, List[str]]:
+        """
+        Build the LLM call for one transaction (shared by the sync and async paths)
         
-        # Call LLM
-        from langchain_anthropic import ChatAnthropic
-        from langchain_openai import ChatOpenAI
+        Returns:
+            (llm, messages, valid category names)
+        """
+        # Build AI prompt (static instructions go in the system message,
+        # the user's categories/history in a cached prefix)
+        prompt = AITransactionCategorizer._build_categorization_prompt(
+            description, amount, trans_type, similar_history
+        )
         
-        # Initialize LLM based on provider
+        # Shared client, built once per provider/model
         provider = getattr(settings, 'AI_PROVIDER', 'anthropic').lower()
-        model = settings.get_model_for_provider(provider)
-        
-        if provider in ["anthropic", "claude"] and settings.ANTHROPIC_API_KEY:
-            llm = ChatAnthropic(
-                api_key=settings.ANTHROPIC_API_KEY,
-                model=model,
-                temperature=0.3,  # Lower temperature for more consistent categorization
-                max_tokens=500,
-            )
-        elif settings.OPENAI_API_KEY:
-            llm = ChatOpenAI(
-                api_key=settings.OPENAI_API_KEY,
-                model=model,
-                temperature=0.3,
-                max_tokens=500,
-            )
-        else:
+        llm = get_service_llm(
+            provider, settings.get_model_for_provider(provider),
+            temperature=0.3,  # Lower temperature for more consistent categorization
+            max_tokens=500,
+        )
+        if llm is None:
             raise ValueError("No LLM API key found. Set ANTHROPIC_API_KEY or OPENAI_API_KEY")
         
-        # Get response
-        response = llm.invoke(prompt)
-        response_text = response.content
-        
-        # Parse response
+        messages = [
+            cached_system_message(CATEGORIZATION_SYSTEM_PROMPT, provider),
+            cached_human_message(context.prompt_context, prompt, provider),
+        ]
+        return llm, messages, context.category_names
+    
+    @staticmethod
+    def _finish_ai_result(response_text: str, all_categories: List[str], user_id: str, db: Session) -> Dict:
+        """Parse the LLM answer and add any category it suggested"""
         result = AITransactionCategorizer._parse_ai_response(response_text, all_categories)
         result["method"] = "ai"
         
         # If AI suggested a new category, add it to user's collection
-        if result.get("new_category_suggested"):
-            new_cat = result.get("new_category")
-            if new_cat:
-                CategoryManager.add_category(
-                    user_id=user_id,
-                    name=new_cat["name"],
-                    display_name=new_cat.get("display_name", new_cat["name"].replace("_", " ").title()),
-                    db=db,
-                    parent_category=new_cat.get("parent"),
-                    ai_suggested=True,
-                )
-                logger.info(f"AI suggested and added new category: {new_cat['name']}")
-        
-        # Increment usage count for the selected category
-        if result.get("category"):
-            CategoryManager.increment_usage(user_id, result["category"], db)
+        AITransactionCategorizer._add_suggested_category(result, user_id, db)
         
+        # usage_count is recomputed in bulk by CategoryManager.refresh_usage_counts()
         return result
     
+    @staticmethod
+    def _categorize_batch_with_ai(
+        transactions: List[Dict],
+        user_id: str,
+        db: Session,
+        context: CategorizationContext,
+    ) -> List[Optional[Dict]]:
+        """
+        Use one LLM call to categorize several transactions
+        
+        Transactions are numbered in the prompt and the model answers with a
+        JSON array of objects carrying those ids.
+        
+        Returns:
+            One result per transaction, in input order (None if the model skipped it)
+        """
+        all_categories = context.category_names
+        prompt = AITransactionCategorizer._build_batch_categorization_prompt(transactions)
+        
+        provider = getattr(settings, 'AI_PROVIDER', 'anthropic').lower()
+        llm = get_service_llm(
+            provider, settings.get_model_for_provider(provider),
+            temperature=0.3,
+            max_tokens=BATCH_MAX_TOKENS,
+        )
+        if llm is None:
+            raise ValueError("No LLM API key found. Set ANTHROPIC_API_KEY or OPENAI_API_KEY")
+        
+        response = llm.invoke([
+            cached_system_message(BATCH_CATEGORIZATION_SYSTEM_PROMPT, provider),
+            cached_human_message(context.prompt_context, prompt, provider),
+        ])
+        
+        json_str = extract_json_array(response.content)
+        if json_str is None:
+            raise ValueError("No JSON array found in response")
+        
+        results: List[Optional[Dict]] = [None] * len(transactions)
+        for item in orjson.loads(json_str):
+            try:
+                index = int(item["id"]) - 1
+                if not 0 <= index < len(transactions) or results[index] is not None:
+                    continue
+                result = AITransactionCategorizer._validate_ai_result(item, all_categories)
+            except Exception as e:
+                logger.warning(f"Skipping malformed batch categorization item: {e}")
+                continue
+            result["method"] = "ai"
+            AITransactionCategorizer._add_suggested_category(result, user_id, db)
+            results[index] = result
+        
+        return results
+    
+    @staticmethod
+    def _add_suggested_category(result: Dict, user_id: str, db: Session) -> None:
+        """Add a category the AI suggested to the user's collection"""
+        if not result.get("new_category_suggested"):
+            return
+        new_cat = result.get("new_category")
+        if new_cat:
+            CategoryManager.add_category(
+                user_id=user_id,
+                name=new_cat["name"],
+                display_name=new_cat.get("display_name", new_cat["name"].replace("_", " ").title()),
+                db=db,
+                parent_category=new_cat.get("parent"),
+                ai_suggested=True,
+            )
+            logger.info(f"AI suggested and added new category: {new_cat['name']}")
+    
     @staticmethod
     def _get_user_history(db: Session, user_id: str, limit: int = 20) -> List[Dict]:
         """
@@ -166,119 +653,140 @@ class AITransactionCategorizer:
         - How they categorize similar transactions
         - Their category usage patterns
         - Merchant-specific preferences
+        
+        Keeps the most recent row per merchant (case-insensitive description),
+        so a run of repeat purchases does not fill the prompt with copies.
+        Only the latest limit * HISTORY_SCAN_FACTOR categorized rows are
+        considered, which keeps the window function's input bounded.
         """
-        recent_transactions = (
-            db.query(Transaction)
-            .filter(Transaction.user_id == user_id)
+        # Only the columns the prompt uses - plain rows, no ORM entities;
+        # uncategorized rows are filtered in SQL so the limit counts useful rows
+        recent = (
+            select(
+                Transaction.description,
+                Transaction.amount,
+                Transaction.category,
+                Transaction.type,
+                Transaction.date,
+            )
+            .where(Transaction.user_id == user_id, *_CATEGORIZED)
             .order_by(Transaction.date.desc())
-            .limit(limit)
-            .all()
+            .limit(limit * HISTORY_SCAN_FACTOR)
+            .subquery()
         )
+        ranked = select(
+            recent,
+            func.row_number().over(
+                partition_by=func.lower(recent.c.description),
+                order_by=recent.c.date.desc(),
+            ).label("merchant_rank"),
+        ).subquery()
         
-        history = []
-        for t in recent_transactions:
-            if t.category and t.category != "uncategorized":
-                history.append({
-                    "description": t.description,
-                    "amount": t.amount,
-                    "category": t.category,
-                    "type": t.type.value,
-                })
+        recent_transactions = db.execute(
+            select(ranked.c.description, ranked.c.amount, ranked.c.category, ranked.c.type)
+            .where(ranked.c.merchant_rank == 1)
+            .order_by(ranked.c.date.desc())
+            .limit(limit)
+        ).all()
+        
+        return [t._asdict() for t in recent_transactions]
+    
+    @staticmethod
+    def _get_similar_history(db: Session, user_id: str, description: str, limit: int = 5) -> List[Dict]:
+        """
+        Get the user's categorized transactions most similar to this description
+        
+        Uses the pg_trgm index on description (similarity operator %), so the
+        prompt carries the few past transactions that matter for this merchant
+        instead of relying on recency alone. Returns [] on non-PostgreSQL
+        databases, where the recent history in the context is all there is.
+        """
+        if db.get_bind().dialect.name != "postgresql":
+            return []
         
-        return history
+        rows = (
+            db.query(
+                Transaction.description,
+                Transaction.amount,
+                Transaction.category,
+            )
+            .filter(
+                Transaction.user_id == user_id,
+                Transaction.description.op("%")(description),
+                *_CATEGORIZED,
+            )
+            .order_by(func.similarity(Transaction.description, description).desc())
+            .limit(limit)
+            .all()
+        )
+        return [row._asdict() for row in rows]
     
     @staticmethod
     def _build_categorization_prompt(
         description: str,
         amount: float,
         trans_type: str,
-        user_history: List[Dict],
-        user_categories: List[Dict],
+        similar_history: List[Dict] = (),
     ) -> str:
         """
-        Build context-aware prompt for LLM categorization
+        Build the per-transaction part of the categorization prompt
         
-        Includes:
-        - Transaction details
-        - Available categories
-        - User's historical patterns
-        - Instructions for response format
+        The instructions and response format are the static
+        CATEGORIZATION_SYSTEM_PROMPT, sent as the system message, and the
+        user's categories and history are CategorizationContext.prompt_context.
+        """
+        prompt = TRANSACTION_DETAILS_TEMPLATE.format(
+            description=description, amount=amount, trans_type=trans_type
+        )
+        if similar_history:
+            prompt += "\n\n**User's Similar Past Transactions:**\n" + "".join([
+                SIMILAR_HISTORY_LINE_TEMPLATE.format(**h) for h in similar_history
+            ])
+        return prompt
+    
+    @staticmethod
+    def _build_batch_categorization_prompt(transactions: List[Dict]) -> str:
+        """
+        Build the per-batch part of the bulk categorization prompt
+        
+        Transactions are numbered from 1; the model answers with those ids.
+        Instructions are the static BATCH_CATEGORIZATION_SYSTEM_PROMPT.
+        """
+        transaction_lines = "".join([
+            BATCH_TRANSACTION_LINE_TEMPLATE.format(index=i, **t)
+            for i, t in enumerate(transactions, start=1)
+        ])
+        return f"**Transactions (id. description | amount | type):**\n{transaction_lines}"
+    
+    @staticmethod
+    def _build_user_context(user_history: List[Dict], view: CategorizationView) -> Tuple[str, str]:
+        """
+        Format the user's categories and recent categorization history
+        
+        Returns:
+            (categories_text, history_text)
         """
         # Format user history
         history_text = ""
         if user_history:
-            history_text = "\n**User's Recent Categorization Patterns:**\n"
-            for h in user_history[:10]:  # Show top 10
-                history_text += f"- '{h['description']}' (${h['amount']:.2f}) → {h['category']}\n"
-        
-        # Format user's categories (show most used first)
-        categories_text = "\n**User's Categories (sorted by usage):**\n"
-        
-        # Group by parent
-        root_cats = [c for c in user_categories if not c.get("parent_category")]
-        child_cats = [c for c in user_categories if c.get("parent_category")]
+            history_text = "\n**User's Recent Categorization Patterns:**\n" + "".join([
+                f"- '{h['description']}' (${h['amount']:.2f}) → {h['category']}\n"
+                for h in user_history[:10]  # Show top 10
+            ])
         
-        # Show root categories with their children
-        for root in root_cats[:15]:  # Top 15 root categories
-            categories_text += f"- {root['name']} ({root['display_name']})"
+        # Show root categories with their children (top 15 roots, top 5 children each)
+        category_lines = []
+        for root in view.ordered_roots[:15]:
+            line = f"- {root['name']} ({root['display_name']})"
             if root['usage_count'] > 0:
-                categories_text += f" [used {root['usage_count']}x]"
-            
-            # Show children
-            children = [c for c in child_cats if c.get("parent_category") == root["name"]]
+                line += f" [used {root['usage_count']}x]"
+            children = view.children_by_parent.get(root["name"])
             if children:
-                child_names = [f"{c['name']}" for c in children[:5]]  # Top 5 children
-                categories_text += f"\n  → {', '.join(child_names)}"
-            categories_text += "\n"
+                line += f"\n  → {', '.join(children[:5])}"
+            category_lines.append(line + "\n")
+        categories_text = "\n**User's Categories (sorted by usage):**\n" + "".join(category_lines)
         
-        prompt = f"""You are a financial transaction categorization expert. Categorize the following transaction into the most appropriate category.
-
-**Transaction Details:**
-- Description: "{description}"
-- Amount: ${amount:.2f}
-- Type: {trans_type}
-
-{categories_text}
-
-{history_text}
-
-**Instructions:**
-1. Choose the MOST SPECIFIC category from the user's existing categories
-2. Consider the user's historical patterns and usage frequency
-3. Use semantic understanding, not just keywords
-4. If NO existing category fits well, you can suggest a NEW category
-5. Provide confidence score (0.0 to 1.0)
-6. Explain your reasoning briefly
-
-**Response Format (JSON):**
-{{
-    "category": "category_name",
-    "confidence": 0.95,
-    "reasoning": "Brief explanation",
-    "new_category_suggested": false
-}}
-
-**If suggesting a NEW category:**
-{{
-    "category": "new_category_name",
-    "confidence": 0.85,
-    "reasoning": "Why existing categories don't fit",
-    "new_category_suggested": true,
-    "new_category": {{
-        "name": "new_category_name",
-        "display_name": "New Category Name",
-        "parent": "parent_category_if_applicable"
-    }}
-}}
-
-**Examples:**
-- "Whole Foods Market" → "groceries" (not just "food")
-- "Netflix subscription" → "streaming" (not just "entertainment")
-- "Apple Store" → Could be "electronics" or "groceries" depending on context
-
-Respond ONLY with valid JSON, no other text."""
-
-        return prompt
+        return categories_text, history_text
     
     @staticmethod
     def _parse_ai_response(response_text: str, valid_categories: List[str]) -> Dict:
@@ -293,62 +801,18 @@ Respond ONLY with valid JSON, no other text."""
         - Error recovery
         """
         try:
-            # Try to extract JSON from response
-            # Sometimes LLM adds markdown code blocks
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
+            # Extract the JSON object from any envelope
+            # (markdown code blocks, leading/trailing prose)
+            json_str = extract_json_object(response_text)
+            if json_str is None:
+                raise orjson.JSONDecodeError("No JSON object found in response", response_text, 0)
             
             # Parse JSON
-            result = json.loads(response_text)
-            
-            # Validate and normalize
-            category = result.get("category", "uncategorized").lower().replace(" ", "_")
-            confidence = float(result.get("confidence", 0.7))
-            reasoning = result.get("reasoning", "AI categorization")
-            new_category_suggested = result.get("new_category_suggested", False)
-            new_category = result.get("new_category")
+            result = orjson.loads(json_str)
             
-            # If new category suggested, validate it
-            if new_category_suggested and new_category:
-                # Normalize new category name
-                new_category["name"] = new_category.get("name", category).lower().replace(" ", "_")
-                
-                return {
-                    "category": new_category["name"],
-                    "confidence": confidence,
-                    "reasoning": reasoning,
-                    "new_category_suggested": True,
-                    "new_category": new_category,
-                }
-            
-            # Validate category exists in user's categories
-            if category not in valid_categories:
-                # Try to find closest match or use root category
-                root = CATEGORY_HIERARCHY.get_root_category(category)
-                if root in valid_categories:
-                    category = root
-                    confidence *= 0.8  # Reduce confidence for fallback
-                else:
-                    category = "uncategorized"
-                    confidence = 0.5
-            
-            # Normalize confidence to 0-1 range
-            confidence = max(0.0, min(1.0, confidence))
-            
-            return {
-                "category": category,
-                "confidence": confidence,
-                "reasoning": reasoning,
-                "new_category_suggested": False,
-            }
+            return AITransactionCategorizer._validate_ai_result(result, valid_categories)
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse AI response as JSON: {response_text[:200]}")
             return {
                 "category": "uncategorized",
@@ -367,6 +831,53 @@ Respond ONLY with valid JSON, no other text."""
                 "error": str(e),
             }
     
+    @staticmethod
+    def _validate_ai_result(result: Dict, valid_categories: List[str]) -> Dict:
+        """
+        Validate and normalize one parsed AI categorization object
+
+        Raises on malformed values; callers turn that into an error result.
+        """
+        category = result.get("category", "uncategorized").lower().replace(" ", "_")
+        confidence = float(result.get("confidence", 0.7))
+        reasoning = result.get("reasoning", "AI categorization")
+        new_category_suggested = result.get("new_category_suggested", False)
+        new_category = result.get("new_category")
+        
+        # If new category suggested, validate it
+        if new_category_suggested and new_category:
+            # Normalize new category name
+            new_category["name"] = new_category.get("name", category).lower().replace(" ", "_")
+            
+            return {
+                "category": new_category["name"],
+                "confidence": confidence,
+                "reasoning": reasoning,
+                "new_category_suggested": True,
+                "new_category": new_category,
+            }
+        
+        # Validate category exists in user's categories
+        if category not in valid_categories:
+            # Try to find closest match or use root category
+            root = CATEGORY_HIERARCHY.get_root_category(category)
+            if root in valid_categories:
+                category = root
+                confidence *= 0.8  # Reduce confidence for fallback
+            else:
+                category = "uncategorized"
+                confidence = 0.5
+        
+        # Normalize confidence to 0-1 range
+        confidence = max(0.0, min(1.0, confidence))
+        
+        return {
+            "category": category,
+            "confidence": confidence,
+            "reasoning": reasoning,
+            "new_category_suggested": False,
+        }
+    
     @staticmethod
     def learn_from_correction(
         db: Session,
@@ -384,7 +895,8 @@ Respond ONLY with valid JSON, no other text."""
         Args:
             db: Database session
             transaction_id: Transaction ID
-            old_category: AI-suggested category
+            old_category: AI-suggested category (for logging; cache invalidation
+                uses the category actually stored on the transaction)
             new_category: User-corrected category
             user_id: User ID
             
@@ -392,19 +904,31 @@ Respond ONLY with valid JSON, no other text."""
             Success status
         """
         try:
-            # Update transaction
-            transaction = db.query(Transaction).filter(
-                Transaction.id == transaction_id,
-                Transaction.user_id == user_id
+            # Stored category, locked so it cannot change before the UPDATE
+            row = db.execute(
+                select(Transaction.category, Transaction.description, Transaction.type, Transaction.amount)
+                .where(Transaction.id == transaction_id, Transaction.user_id == user_id)
+                .with_for_update()
             ).first()
             
-            if transaction:
-                transaction.category = new_category
+            if row:
+                db.execute(
+                    update(Transaction)
+                    .where(Transaction.id == transaction_id, Transaction.user_id == user_id)
+                    .values(category=new_category)
+                )
                 db.commit()
+
+                # The cached answer for this merchant was wrong; remember the user's
+                categorization_cache.store_correction(user_id, row.description, row.type, row.amount, new_category)
+                # Core UPDATE bypasses the flush hook that drops cached spending sums
+                spending_cache.invalidate({
+                    user_id: {spending_cache.category_key(row.category), spending_cache.category_key(new_category)}
+                })
                 
                 logger.info(
-                    f"Learned from correction: '{transaction.description}' "
-                    f"{old_category} → {new_category}"
+                    f"Learned from correction: '{row.description}' "
+                    f"{row.category} → {new_category}"
                 )
                 
                 # TODO: Store in feedback table for future training
@@ -421,4 +945,61 @@ Respond ONLY with valid JSON, no other text."""
             logger.error(f"Error learning from correction: {e}")
             db.rollback()
             return False
-
+    
+    @staticmethod
+    def learn_from_corrections_bulk(
+        db: Session,
+        user_id: str,
+        items: List[Tuple[str, str]],
+    ) -> int:
+        """
+        Learn from many user corrections at once (e.g., bulk relabeling)
+        
+        Reads the current categories in one query, then issues one UPDATE
+        per distinct new category and commits once.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            items: (transaction_id, new_category) pairs
+            
+        Returns:
+            Number of transactions updated
+        """
+        ids_by_category: Dict[str, List[str]] = {}
+        for transaction_id, new_category in items:
+            ids_by_category.setdefault(new_category, []).append(transaction_id)
+        if not ids_by_category:
+            return 0
+        
+        try:
+            # Previous categories, for spending-cache invalidation
+            old_categories = {
+                spending_cache.category_key(category) for (category,) in db.query(Transaction.category).filter(
+                    Transaction.user_id == user_id,
+                    Transaction.id.in_([transaction_id for transaction_id, _ in items])
+                ).distinct()
+            }
+            
+            updated = []
+            for new_category, transaction_ids in ids_by_category.items():
+                updated.extend((row, new_category) for row in db.execute(
+                    update(Transaction)
+                    .where(Transaction.user_id == user_id, Transaction.id.in_(transaction_ids))
+                    .values(category=new_category)
+                    .returning(Transaction.description, Transaction.type, Transaction.amount)
+                ))
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error learning from bulk corrections: {e}")
+            db.rollback()
+            return 0
+        
+        for row, new_category in updated:
+            categorization_cache.store_correction(user_id, row.description, row.type, row.amount, new_category)
+        spending_cache.invalidate({
+            user_id: old_categories | {spending_cache.category_key(category) for category in ids_by_category}
+        })
+        
+        logger.info(f"Learned from {len(updated)} corrections for user {user_id}")
+        return len(updated)
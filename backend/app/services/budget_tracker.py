@@ -4,12 +4,13 @@ Handles budget vs actual tracking and overspending detection
 """
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, extract, func, case
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
 import logging
 
-from ..database.models import Budget, Transaction, TransactionType, Notification, NotificationType, NotificationStatus
-import uuid
+from ..database.models import Budget, BudgetAlertDay, DailyCategorySpend, Transaction, TransactionType, Notification, NotificationType, NotificationStatus
+from ..utils.ids import uuid7
+from . import spending_cache
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,7 @@ class BudgetTracker:
         user_id: str,
         budget_id: str,
         current_date: Optional[datetime] = None,
+        actual_spent: Optional[float] = None,
     ) -> Dict:
         """
         Calculate budget vs actual spending for a specific budget
@@ -32,6 +34,7 @@ class BudgetTracker:
             user_id: User ID
             budget_id: Budget ID
             current_date: Current date (defaults to now)
+            actual_spent: Precomputed spending for the period (skips the aggregate query)
 
         Returns:
             Dict with budget status including spent amount, remaining, percentage
@@ -51,15 +54,39 @@ class BudgetTracker:
         if not budget:
             raise ValueError("Budget not found")
 
+        return BudgetTracker._build_budget_status(db, user_id, budget, current_date, actual_spent)
+
+    @staticmethod
+    def _build_budget_status(
+        db: Session,
+        user_id: str,
+        budget: Budget,
+        current_date: datetime,
+        actual_spent: Optional[float] = None,
+    ) -> Dict:
+        """
+        Budget vs actual metrics for an already-loaded budget (creates alerts as needed)
+
+        Args:
+            db: Database session
+            user_id: User ID
+            budget: Budget object
+            current_date: Current date
+            actual_spent: Precomputed spending for the period (skips the aggregate query)
+
+        Returns:
+            Dict with budget status including spent amount, remaining, percentage
+        """
         # Determine period start and end dates
         period_start, period_end = BudgetTracker._get_period_dates(
             budget, current_date
         )
 
         # Calculate actual spending in this period
-        actual_spent = BudgetTracker._calculate_actual_spending(
-            db, user_id, budget.category, period_start, period_end
-        )
+        if actual_spent is None:
+            actual_spent = BudgetTracker._calculate_actual_spending(
+                db, user_id, budget.category, period_start, period_end
+            )
 
         # Calculate metrics
         remaining = budget.amount - actual_spent
@@ -120,11 +147,15 @@ class BudgetTracker:
             )
         ).all()
 
+        # Spending for all budgets in one query (daily rollup / cache where possible)
+        spent_by_budget = BudgetTracker._bulk_calculate_spending(db, user_id, budgets, current_date)
+
         statuses = []
         for budget in budgets:
             try:
-                status = BudgetTracker.calculate_budget_status(
-                    db, user_id, budget.id, current_date
+                status = BudgetTracker._build_budget_status(
+                    db, user_id, budget, current_date,
+                    actual_spent=spent_by_budget.get(budget.id),
                 )
                 statuses.append(status)
             except Exception as e:
@@ -152,9 +183,30 @@ class BudgetTracker:
         Returns:
             Dict mapping category to total spent
         """
+        cached = spending_cache.get_spending_by_category(user_id, start_date, end_date)
+        if cached is not None:
+            return cached
+
+        days = BudgetTracker._rollup_days(db, start_date, end_date + timedelta(microseconds=1))
+        if days:
+            # Whole days: read the daily rollup instead of the transactions
+            results = db.query(
+                case(
+                    (DailyCategorySpend.category == "", "uncategorized"),
+                    else_=DailyCategorySpend.category
+                ).label('category'),
+                func.sum(DailyCategorySpend.total).label('total')
+            ).filter(
+                DailyCategorySpend.user_id == user_id,
+                DailyCategorySpend.day >= days[0],
+                DailyCategorySpend.day < days[1]
+            ).group_by('category').having(func.sum(DailyCategorySpend.total) != 0).all()
+
+            spending_by_category = {row.category: row.total for row in results}
+            spending_cache.store_spending_by_category(user_id, start_date, end_date, spending_by_category)
+            return spending_by_category
+
         # Use SQL GROUP BY for efficient aggregation
-        from sqlalchemy import case
-        
         results = db.query(
             case(
                 (Transaction.category == None, "uncategorized"),
@@ -172,6 +224,7 @@ class BudgetTracker:
         ).group_by('category').all()
 
         spending_by_category = {row.category: row.total for row in results}
+        spending_cache.store_spending_by_category(user_id, start_date, end_date, spending_by_category)
         return spending_by_category
 
     @staticmethod
@@ -233,18 +286,157 @@ class BudgetTracker:
         Returns:
             Total spent amount
         """
-        # Use SQL aggregation for better performance
-        total = db.query(func.sum(Transaction.amount)).filter(
+        cached = spending_cache.get_category_totals(user_id, [(category, start_date, end_date)])[0]
+        if cached is not None:
+            return cached
+
+        days = BudgetTracker._rollup_days(db, start_date, end_date)
+        if days:
+            total = db.query(func.sum(DailyCategorySpend.total)).filter(
+                DailyCategorySpend.user_id == user_id,
+                DailyCategorySpend.category == category,
+                DailyCategorySpend.day >= days[0],
+                DailyCategorySpend.day < days[1]
+            ).scalar() or 0.0
+        else:
+            # Use SQL aggregation for better performance
+            total = db.query(func.sum(Transaction.amount)).filter(
+                and_(
+                    Transaction.user_id == user_id,
+                    Transaction.type == TransactionType.EXPENSE,
+                    Transaction.category == category,
+                    Transaction.date >= start_date,
+                    Transaction.date < end_date
+                )
+            ).scalar() or 0.0
+
+        spending_cache.store_category_totals(user_id, [(category, start_date, end_date, total)])
+        return total
+
+    @staticmethod
+    def _rollup_days(db: Session, start: datetime, end: datetime) -> Optional[Tuple[date, date]]:
+        """
+        Day range of daily_category_spend covering [start, end), if it can
+
+        The rollup is maintained on PostgreSQL only and has day granularity, so
+        it answers ranges whose bounds both fall on midnight.
+
+        Returns:
+            (first_day, end_day) with end_day exclusive, or None to aggregate transactions
+        """
+        if start.time() != time.min or end.time() != time.min:
+            return None
+        if db.get_bind().dialect.name != "postgresql":
+            return None
+        return start.date(), end.date()
+
+    @staticmethod
+    def _bulk_calculate_spending(
+        db: Session,
+        user_id: str,
+        budgets: List[Budget],
+        current_date: datetime,
+    ) -> Dict[str, float]:
+        """
+        Calculate actual spending for several budgets in one query
+
+        Each budget gets its own conditional SUM over its category and period,
+        so budgets with different periods share a single scan of the user's
+        expenses in the overall date span.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            budgets: Budgets to compute
+            current_date: Current date
+
+        Returns:
+            Dict mapping budget_id to total spent in its current period
+        """
+        if not budgets:
+            return {}
+
+        periods = [BudgetTracker._get_period_dates(budget, current_date) for budget in budgets]
+        cached = spending_cache.get_category_totals(
+            user_id, [(budget.category, start, end) for budget, (start, end) in zip(budgets, periods)]
+        )
+        spent = {budget.id: total for budget, total in zip(budgets, cached) if total is not None}
+        missing = [i for i, total in enumerate(cached) if total is None]
+        if not missing:
+            return spent
+        budgets = [budgets[i] for i in missing]
+        periods = [periods[i] for i in missing]
+
+        day_ranges = [BudgetTracker._rollup_days(db, start, end) for start, end in periods]
+        if all(day_ranges):
+            # Every period covers whole days: sum the daily rollup instead
+            category_col, date_col, amount_col = (
+                DailyCategorySpend.category, DailyCategorySpend.day, DailyCategorySpend.total
+            )
+            bounds = day_ranges
+            filters = [DailyCategorySpend.user_id == user_id]
+        else:
+            category_col, date_col, amount_col = Transaction.category, Transaction.date, Transaction.amount
+            bounds = periods
+            filters = [Transaction.user_id == user_id, Transaction.type == TransactionType.EXPENSE]
+
+        sums = [
+            func.coalesce(func.sum(case(
+                (
+                    and_(
+                        category_col == budget.category,
+                        date_col >= period_start,
+                        date_col < period_end,
+                    ),
+                    amount_col,
+                ),
+                else_=0,
+            )), 0.0)
+            for budget, (period_start, period_end) in zip(budgets, bounds)
+        ]
+
+        row = db.query(*sums).filter(
             and_(
-                Transaction.user_id == user_id,
-                Transaction.type == TransactionType.EXPENSE,
-                Transaction.category == category,
-                Transaction.date >= start_date,
-                Transaction.date < end_date
+                *filters,
+                category_col.in_({budget.category for budget in budgets}),
+                date_col >= min(start for start, _ in bounds),
+                date_col < max(end for _, end in bounds)
             )
-        ).scalar() or 0.0
+        ).one()
+
+        totals = [float(total) for total in row]
+        spending_cache.store_category_totals(
+            user_id,
+            [
+                (budget.category, start, end, total)
+                for budget, (start, end), total in zip(budgets, periods, totals)
+            ],
+        )
+        spent.update((budget.id, total) for budget, total in zip(budgets, totals))
+        return spent
 
-        return total
+    @staticmethod
+    def _claim_alert_day(db: Session, budget_id: str, alert_date: date) -> bool:
+        """
+        Record that an alert for this budget is being sent on alert_date
+
+        Args:
+            db: Database session
+            budget_id: Budget ID
+            alert_date: UTC day of the alert
+
+        Returns:
+            True if this call claimed the day, False if it was already claimed
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(BudgetAlertDay).values(
+            budget_id=budget_id, alert_date=alert_date
+        ).on_conflict_do_nothing(index_elements=["budget_id", "alert_date"])
+        return db.execute(stmt).rowcount == 1
 
     @staticmethod
     def _create_budget_alert(
@@ -266,18 +458,9 @@ class BudgetTracker:
             percentage: Percentage of budget used
             alert_type: "warning" or "overspent"
         """
-        # Check if we already created an alert for this budget today
-        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        existing_alert = db.query(Notification).filter(
-            and_(
-                Notification.user_id == user_id,
-                Notification.type == NotificationType.BUDGET_ALERT,
-                Notification.created_at >= today_start,
-                Notification.extra_data.contains(budget.id)
-            )
-        ).first()
-
-        if existing_alert:
+        # Claim today's alert for this budget; a concurrent or earlier
+        # evaluation that already claimed it wins and we send nothing
+        if not BudgetTracker._claim_alert_day(db, budget.id, datetime.utcnow().date()):
             return  # Don't create duplicate alerts
 
         if alert_type == "warning":
@@ -290,7 +473,7 @@ class BudgetTracker:
             priority = 3  # High
 
         notification = Notification(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             user_id=user_id,
             type=NotificationType.BUDGET_ALERT,
             title=title,
@@ -298,7 +481,8 @@ class BudgetTracker:
             status=NotificationStatus.UNREAD,
             priority=priority,
             action_url=f"/budgets/{budget.id}",
-            extra_data=f'{{"budget_id": "{budget.id}", "category": "{budget.category}", "alert_type": "{alert_type}"}}',
+            extra_data={"budget_id": budget.id, "category": budget.category, "alert_type": alert_type},
+            budget_id=budget.id,
         )
 
         db.add(notification)
@@ -18,7 +18,7 @@ from ..database.models import (
     NotificationType,
     NotificationStatus,
 )
-import uuid
+from ..utils.ids import uuid7
 
 logger = logging.getLogger(__name__)
 
@@ -292,7 +292,7 @@ class CashFlowForecaster:
             return
 
         notification = Notification(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             user_id=user_id,
             type=NotificationType.LOW_BALANCE,
             title="Low Balance Warning",
@@ -300,7 +300,7 @@ class CashFlowForecaster:
             status=NotificationStatus.UNREAD,
             priority=3,  # High priority
             action_url="/forecast",
-            extra_data=f'{{"runway_days": {runway_days}, "min_balance": {projected_min_balance}}}',
+            extra_data={"runway_days": runway_days, "min_balance": projected_min_balance},
         )
 
         db.add(notification)
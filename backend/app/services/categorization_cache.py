@@ -0,0 +1,120 @@
+"""
+Redis cache of AI categorization results
+Repeat merchants ("STARBUCKS #123", "STARBUCKS #456") are categorized by the
+LLM once per user, then served from Redis until the entry expires. A user
+correction replaces the entry, so the corrected category is what later
+transactions with the same key get.
+"""
+from typing import Dict, Optional
+from functools import lru_cache
+import hashlib
+import logging
+import re
+
+import orjson
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Optional - requires the redis client
+try:
+    import redis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    RedisError = Exception
+    REDIS_AVAILABLE = False
+
+CACHE_KEY_PREFIX = "txcat:exact:"
+CACHE_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+
+# Digits and punctuation carry store numbers, dates and references, not the merchant
+_NOISE_RE = re.compile(r"[\d\W_]+")
+
+
+@lru_cache(maxsize=1)
+def _get_client():
+    """Shared Redis client, or None if Redis is not enabled"""
+    if not (REDIS_AVAILABLE and settings.USE_REDIS and settings.REDIS_URL):
+        return None
+    return redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+
+
+def normalize_description(description: str) -> str:
+    """Lowercase the description and collapse digits/punctuation into single spaces"""
+    return _NOISE_RE.sub(" ", description.lower()).strip()
+
+
+def cache_key(user_id: str, description: str, trans_type: str, amount: float) -> str:
+    """Key per (user, normalized description, type, amount rounded to tens)"""
+    # Enum members and Decimal amounts (as read back from the database) key
+    # the same as the plain values the categorizer is called with
+    trans_type = str(getattr(trans_type, "value", trans_type)).lower()
+    raw = "|".join((normalize_description(description), trans_type, str(round(float(amount), -1))))
+    return f"{CACHE_KEY_PREFIX}{user_id}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def get_cached_category(user_id: str, description: str, trans_type: str, amount: float) -> Optional[Dict]:
+    """
+    Cached categorization result for this transaction, if any
+
+    Returns:
+        Result dict (method "cache") or None on miss / Redis unavailable
+    """
+    client = _get_client()
+    if client is None:
+        return None
+    try:
+        cached = client.get(cache_key(user_id, description, trans_type, amount))
+    except RedisError as e:
+        logger.warning(f"Categorization cache read failed: {e}")
+        return None
+    if cached is None:
+        return None
+
+    result = orjson.loads(cached)
+    result["method"] = "cache"
+    return result
+
+
+def store_category(user_id: str, description: str, trans_type: str, amount: float, result: Dict) -> None:
+    """Remember an accepted categorization result"""
+    client = _get_client()
+    if client is None:
+        return
+    entry = {
+        "category": result["category"],
+        "confidence": result.get("confidence"),
+        "reasoning": result.get("reasoning"),
+        # Any suggested category was created on the first call
+        "new_category_suggested": False,
+    }
+    try:
+        client.set(
+            cache_key(user_id, description, trans_type, amount),
+            orjson.dumps(entry),
+            ex=CACHE_TTL_SECONDS,
+        )
+    except RedisError as e:
+        logger.warning(f"Categorization cache write failed: {e}")
+
+
+def store_correction(user_id: str, description: str, trans_type: str, amount: float, category: str) -> None:
+    """Remember the category a user corrected this transaction to"""
+    store_category(
+        user_id, description, trans_type, amount,
+        {"category": category, "confidence": 1.0, "reasoning": "User correction"},
+    )
+
+
+def invalidate_category(user_id: str, description: str, trans_type: str, amount: float) -> None:
+    """Forget the cached result for this transaction (e.g., after a user correction)"""
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        client.delete(cache_key(user_id, description, trans_type, amount))
+    except RedisError as e:
+        logger.warning(f"Categorization cache invalidation failed: {e}")
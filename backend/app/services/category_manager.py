@@ -2,17 +2,79 @@
 User Category Management Service
 Manages personalized category collections for each user
 """
+from dataclasses import dataclass
 from typing import List, Dict, Optional
+from sqlalchemy import event, func, select, update
 from sqlalchemy.orm import Session
 from datetime import datetime
-import uuid
-import json
+from ..utils.ids import uuid7
 import logging
+import threading
 
-from ..database.models import Category, User
+from ..database.models import Category, Transaction, User
 
 logger = logging.getLogger(__name__)
 
+# Optional - without cachetools the categorization view is rebuilt per request.
+# Per process; entries also expire so edits made by other workers show up.
+try:
+    from cachetools import TTLCache
+
+    _view_cache = TTLCache(maxsize=1024, ttl=600)
+    VIEW_CACHE_AVAILABLE = True
+except ImportError:
+    _view_cache = None
+    VIEW_CACHE_AVAILABLE = False
+
+_view_cache_lock = threading.Lock()  # TTLCache is not thread-safe
+_VIEW_DIRTY_KEY = "categorization_view_dirty"
+
+
+@dataclass(frozen=True, slots=True)
+class CategorizationView:
+    """A user's active categories, pre-grouped for categorization prompts"""
+    categories: List[Dict]  # sorted by usage
+    ordered_roots: List[Dict]  # categories without a parent, in usage order
+    children_by_parent: Dict[str, List[str]]  # parent name -> child names, in usage order
+    names: List[str]
+
+
+def invalidate_categorization_view(user_id: Optional[str] = None) -> None:
+    """Drop the cached view of one user (or of every user)"""
+    if not VIEW_CACHE_AVAILABLE:
+        return
+    with _view_cache_lock:
+        if user_id is None:
+            _view_cache.clear()
+        else:
+            _view_cache.pop(user_id, None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_categories(session, flush_context):
+    """Note users whose categories changed; their views are dropped once the commit lands"""
+    if not VIEW_CACHE_AVAILABLE:
+        return
+    changed = session.info.setdefault(_VIEW_DIRTY_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Category):
+            changed.add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_views_on_commit(session):
+    """
+    Invalidate after commit rather than at flush, so a concurrent reader cannot
+    re-cache the pre-commit categories between the two
+    """
+    for user_id in session.info.pop(_VIEW_DIRTY_KEY, ()):
+        invalidate_categorization_view(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_categories(session):
+    session.info.pop(_VIEW_DIRTY_KEY, None)
+
 
 # Default categories to seed for new users
 DEFAULT_CATEGORIES = [
@@ -116,7 +178,7 @@ class CategoryManager:
             categories_created = 0
             for cat_data in DEFAULT_CATEGORIES:
                 category = Category(
-                    id=str(uuid.uuid4()),
+                    id=str(uuid7()),
                     user_id=user_id,
                     name=cat_data["name"],
                     display_name=cat_data["display_name"],
@@ -153,28 +215,70 @@ class CategoryManager:
         Returns:
             List of category dictionaries
         """
-        query = db.query(Category).filter(Category.user_id == user_id)
+        # Only the returned columns (no keywords JSON / search vector), as plain rows
+        query = db.query(
+            Category.id,
+            Category.name,
+            Category.display_name,
+            Category.parent_category,
+            Category.icon,
+            Category.color,
+            Category.usage_count,
+            Category.ai_suggested,
+            Category.is_default,
+        ).filter(Category.user_id == user_id)
         
         if active_only:
             query = query.filter(Category.is_active == True)
         
         categories = query.order_by(Category.usage_count.desc(), Category.name).all()
         
-        return [
-            {
-                "id": cat.id,
-                "name": cat.name,
-                "display_name": cat.display_name,
-                "parent_category": cat.parent_category,
-                "icon": cat.icon,
-                "color": cat.color,
-                "usage_count": cat.usage_count,
-                "ai_suggested": cat.ai_suggested,
-                "is_default": cat.is_default,
-            }
-            for cat in categories
-        ]
+        return [cat._asdict() for cat in categories]
     
+    @staticmethod
+    def get_categorization_view(user_id: str, db: Session) -> CategorizationView:
+        """
+        Get the user's active categories grouped by parent (cached per user)
+
+        Roots and children are grouped in one pass when the categories are
+        fetched, so prompt building only walks the roots. The view is dropped
+        when the user's categories change (add_category, refresh_usage_counts,
+        any flushed Category edit).
+
+        Args:
+            user_id: User ID
+            db: Database session
+
+        Returns:
+            CategorizationView
+        """
+        if VIEW_CACHE_AVAILABLE:
+            with _view_cache_lock:
+                view = _view_cache.get(user_id)
+            if view is not None:
+                return view
+
+        categories = CategoryManager.get_user_categories(user_id, db, active_only=True)
+        ordered_roots = []
+        children_by_parent: Dict[str, List[str]] = {}
+        for cat in categories:
+            parent = cat["parent_category"]
+            if parent:
+                children_by_parent.setdefault(parent, []).append(cat["name"])
+            else:
+                ordered_roots.append(cat)
+
+        view = CategorizationView(
+            categories=categories,
+            ordered_roots=ordered_roots,
+            children_by_parent=children_by_parent,
+            names=[cat["name"] for cat in categories],
+        )
+        if VIEW_CACHE_AVAILABLE:
+            with _view_cache_lock:
+                _view_cache[user_id] = view
+        return view
+
     @staticmethod
     def get_category_names(user_id: str, db: Session, active_only: bool = True) -> List[str]:
         """
@@ -235,7 +339,7 @@ class CategoryManager:
             
             # Create new category
             category = Category(
-                id=str(uuid.uuid4()),
+                id=str(uuid7()),
                 user_id=user_id,
                 name=name,
                 display_name=display_name,
@@ -270,28 +374,45 @@ class CategoryManager:
             raise
     
     @staticmethod
-    def increment_usage(user_id: str, category_name: str, db: Session) -> None:
+    def refresh_usage_counts(db: Session, user_id: Optional[str] = None) -> int:
         """
-        Increment usage count for a category
-        
+        Recompute category usage counts from the transactions table
+
+        This should be called by a scheduled job (e.g., hourly cron) instead of
+        bumping a counter row on every categorized transaction, which serialized
+        concurrent inserts on the category row lock. Commits.
+
         Args:
-            user_id: User ID
-            category_name: Category name
             db: Database session
+            user_id: Limit the refresh to one user (defaults to all users)
+
+        Returns:
+            Number of categories whose count changed
         """
+        usage = select(func.count(Transaction.id)).where(
+            Transaction.user_id == Category.user_id,
+            Transaction.category == Category.name,
+        ).scalar_subquery()
+
+        stmt = (
+            update(Category)
+            .values(usage_count=usage)
+            .where(Category.usage_count.is_distinct_from(usage))
+            .execution_options(synchronize_session=False)
+        )
+        if user_id is not None:
+            stmt = stmt.where(Category.user_id == user_id)
+
         try:
-            category = db.query(Category).filter(
-                Category.user_id == user_id,
-                Category.name == category_name
-            ).first()
-            
-            if category:
-                category.usage_count += 1
-                db.commit()
-                
+            result = db.execute(stmt)
+            db.commit()
+            # Bulk UPDATE bypasses the flush hook; usage order may have changed
+            invalidate_categorization_view(user_id)
+            return result.rowcount
         except Exception as e:
             db.rollback()
-            logger.error(f"Error incrementing usage for category '{category_name}': {e}")
+            logger.error(f"Error refreshing category usage counts: {e}")
+            return 0
     
     @staticmethod
     def find_similar_category(
@@ -310,22 +431,27 @@ class CategoryManager:
         Returns:
             Category name if found, None otherwise
         """
-        # Get all user categories with keywords
-        categories = db.query(Category).filter(
-            Category.user_id == user_id,
-            Category.is_active == True,
-            Category.keywords.isnot(None)
-        ).all()
-        
         description_lower = description.lower()
-        
-        for category in categories:
-            try:
-                keywords = json.loads(category.keywords) if category.keywords else []
-                for keyword in keywords:
-                    if keyword.lower() in description_lower:
-                        return category.name
-            except json.JSONDecodeError:
-                continue
-        
-        return None
+
+        # Keyword containment is checked in the database, so only the best
+        # match comes back instead of every category with its keyword list
+        if db.get_bind().dialect.name == "postgresql":
+            keyword = func.jsonb_array_elements_text(Category.keywords).table_valued("value")
+            position = func.strpos(description_lower, func.lower(keyword.c.value))
+        else:
+            keyword = func.json_each(Category.keywords).table_valued("value")
+            position = func.instr(description_lower, func.lower(keyword.c.value))
+        has_matching_keyword = select(1).select_from(keyword).where(position > 0).exists()
+
+        # Most used category first
+        return db.scalar(
+            select(Category.name)
+            .where(
+                Category.user_id == user_id,
+                Category.is_active == True,
+                Category.keywords.isnot(None),
+                has_matching_keyword,
+            )
+            .order_by(Category.usage_count.desc())
+            .limit(1)
+        )
@@ -123,7 +123,6 @@ class DynamicBudgetAdjuster:
             if budget:
                 old_amount = budget.amount
                 budget.amount = adj["new_amount"]
-                budget.updated_at = datetime.utcnow()
                 
                 applied.append({
                     "category": budget.category,
@@ -74,7 +74,7 @@ class ExportService:
         for txn in transactions:
             writer.writerow([
                 txn.date.strftime('%Y-%m-%d'),
-                txn.type.value,
+                txn.type,
                 txn.category,
                 txn.description,
                 f"{txn.amount:.2f}",
@@ -318,7 +318,7 @@ class ExportService:
             html += f"""
             <tr>
                 <td>{txn.date.strftime('%Y-%m-%d')}</td>
-                <td>{txn.type.value}</td>
+                <td>{txn.type}</td>
                 <td>{txn.category}</td>
                 <td>{txn.description}</td>
                 <td>${txn.amount:,.2f}</td>
@@ -0,0 +1,229 @@
+"""
+Shared LLM clients for the AI services
+Each client owns an HTTP connection pool, so one instance per configuration is
+built and reused instead of constructing a new one per call
+"""
+from functools import lru_cache
+from typing import Optional
+import asyncio
+
+from ..config import settings
+
+# Optional - HTTP/2 needs the h2 package; HTTP/1.1 keep-alive otherwise
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+
+
+@lru_cache(maxsize=1)
+def _shared_http_clients():
+    """
+    One sync and one async httpx client shared by every OpenAI-compatible model,
+    so all of them draw on the same keep-alive connection pool
+
+    Returns:
+        (httpx.Client, httpx.AsyncClient)
+    """
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    )
+    return (
+        httpx.Client(http2=HTTP2_AVAILABLE, limits=limits),
+        httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits),
+    )
+
+
+@lru_cache(maxsize=8)
+def get_service_llm(
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    timeout: Optional[float] = None,
+):
+    """
+    Get a cached chat model for the given provider and generation settings
+
+    Args:
+        provider: AI provider name (anthropic/claude use Anthropic, anything else OpenAI)
+        model: Model name
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        timeout: Request timeout in seconds (provider default if None)
+
+    Returns:
+        ChatAnthropic or ChatOpenAI instance, or None if no API key is configured
+    """
+    from langchain_anthropic import ChatAnthropic
+    from langchain_openai import ChatOpenAI
+
+    if provider in ["anthropic", "claude"] and settings.ANTHROPIC_API_KEY:
+        return ChatAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout,
+        )
+    elif settings.OPENAI_API_KEY:
+        http_client, http_async_client = _shared_http_clients()
+        return ChatOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            http_client=http_client,
+            http_async_client=http_async_client,
+        )
+    return None
+
+
+def cached_system_message(text: str, provider: str):
+    """
+    System message for a prompt prefix that is identical across calls
+
+    Marked as an ephemeral cache breakpoint for Anthropic when prompt caching
+    is enabled, so repeated calls are billed for the prefix at the cached rate.
+
+    Args:
+        text: Static system prompt
+        provider: AI provider name
+
+    Returns:
+        SystemMessage
+    """
+    from langchain_core.messages import SystemMessage
+
+    if settings.ENABLE_PROMPT_CACHING and provider in ["anthropic", "claude"]:
+        return SystemMessage(
+            content=[
+                {
+                    "type": "text",
+                    "text": text,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ]
+        )
+    return SystemMessage(content=text)
+
+
+def cached_human_message(prefix: str, text: str, provider: str):
+    """
+    User message whose leading block is shared by many calls
+
+    The prefix (e.g., a user's categories and history) gets its own cache
+    breakpoint for Anthropic, so calls for the same user reuse the cached
+    system prompt plus prefix and only the trailing text is billed in full.
+
+    Args:
+        prefix: Text repeated across calls
+        text: Per-call text
+        provider: AI provider name
+
+    Returns:
+        HumanMessage
+    """
+    from langchain_core.messages import HumanMessage
+
+    if settings.ENABLE_PROMPT_CACHING and provider in ["anthropic", "claude"] and prefix:
+        return HumanMessage(
+            content=[
+                {
+                    "type": "text",
+                    "text": prefix,
+                    "cache_control": {"type": "ephemeral"}
+                },
+                {"type": "text", "text": text},
+            ]
+        )
+    return HumanMessage(content=f"{prefix}\n\n{text}" if prefix else text)
+
+
+def _extract_balanced(text: str, open_char: str, close_char: str) -> Optional[str]:
+    """
+    Return the first balanced top-level open_char...close_char span in text, or None
+
+    Single pass tracking bracket depth and string/escape state, so brackets
+    inside string values (e.g., "[see above]" in a reasoning field) and prose
+    after the JSON do not throw off the match.
+    """
+    start = text.find(open_char)
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == open_char:
+            depth += 1
+        elif ch == close_char:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def extract_json_array(text: str) -> Optional[str]:
+    """Return the first balanced top-level JSON array in text, or None"""
+    return _extract_balanced(text, '[', ']')
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """
+    Return the first balanced top-level JSON object in text, or None
+
+    Works on bare JSON, markdown-fenced JSON and JSON wrapped in prose alike.
+    """
+    return _extract_balanced(text, '{', '}')
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket for async LLM calls: at most `rate` acquisitions per `period`
+    seconds, with up to `burst` allowed back to back
+    """
+
+    def __init__(self, rate: float, period: float = 60.0, burst: int = 1):
+        self._per_second = rate / period
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a call may start"""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._updated is not None:
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._per_second)
+            self._updated = now
+
+            if self._tokens < 1:
+                # Waiters queue on the lock, so calls start in order
+                wait = (1 - self._tokens) / self._per_second
+                await asyncio.sleep(wait)
+                self._updated = loop.time()
+                self._tokens = 1.0
+
+            self._tokens -= 1
@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List
 from statistics import mean, stdev
 import logging
-import uuid
+from ..utils.ids import uuid7
 
 from ..database.models import (
     Transaction,
@@ -20,6 +20,7 @@ from ..database.models import (
     Notification,
     NotificationType,
     NotificationStatus,
+    json_contains,
 )
 
 logger = logging.getLogger(__name__)
@@ -126,8 +127,7 @@ class NotificationEngine:
                     and_(
                         Notification.user_id == user_id,
                         Notification.type == NotificationType.GOAL_MILESTONE,
-                        Notification.extra_data.contains(f'"goal_id": "{goal_id}"'),
-                        Notification.extra_data.contains(f'"milestone": {milestone}')
+                        json_contains(Notification.extra_data, {"goal_id": goal_id, "milestone": milestone})
                     )
                 ).first()
 
@@ -197,7 +197,7 @@ class NotificationEngine:
     ):
         """Create notification for unusual spending"""
         notification = Notification(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             user_id=user_id,
             type=NotificationType.UNUSUAL_SPENDING,
             title="Unusual Spending Detected",
@@ -205,7 +205,7 @@ class NotificationEngine:
             status=NotificationStatus.UNREAD,
             priority=2,
             action_url=f"/transactions/{transaction.id}",
-            extra_data=f'{{"transaction_id": "{transaction.id}", "amount": {transaction.amount}, "average": {avg_amount}}}',
+            extra_data={"transaction_id": transaction.id, "amount": transaction.amount, "average": avg_amount},
         )
         db.add(notification)
         db.commit()
@@ -220,7 +220,7 @@ class NotificationEngine:
     ):
         """Create notification for goal milestone"""
         notification = Notification(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             user_id=user_id,
             type=NotificationType.GOAL_MILESTONE,
             title=f"Goal Milestone: {milestone}% Complete!",
@@ -228,7 +228,7 @@ class NotificationEngine:
             status=NotificationStatus.UNREAD,
             priority=1,
             action_url=f"/goals/{goal.id}",
-            extra_data=f'{{"goal_id": "{goal.id}", "milestone": {milestone}, "current": {goal.current_amount}, "target": {goal.target_amount}}}',
+            extra_data={"goal_id": goal.id, "milestone": milestone, "current": goal.current_amount, "target": goal.target_amount},
         )
         db.add(notification)
         db.commit()
@@ -242,7 +242,7 @@ class NotificationEngine:
     ):
         """Create notification for goal completion"""
         notification = Notification(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             user_id=user_id,
             type=NotificationType.GOAL_COMPLETED,
             title=f"Goal Completed: {goal.name}!",
@@ -250,7 +250,7 @@ class NotificationEngine:
             status=NotificationStatus.UNREAD,
             priority=1,
             action_url=f"/goals/{goal.id}",
-            extra_data=f'{{"goal_id": "{goal.id}", "amount": {goal.current_amount}}}',
+            extra_data={"goal_id": goal.id, "amount": goal.current_amount},
         )
         db.add(notification)
         db.commit()
@@ -264,7 +264,7 @@ class NotificationEngine:
     ):
         """Create notification for debt paid off"""
         notification = Notification(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             user_id=user_id,
             type=NotificationType.DEBT_PAID_OFF,
             title=f"Debt Paid Off: {debt.name}!",
@@ -272,7 +272,7 @@ class NotificationEngine:
             status=NotificationStatus.UNREAD,
             priority=1,
             action_url=f"/debts/{debt.id}",
-            extra_data=f'{{"debt_id": "{debt.id}", "amount": {debt.principal_amount}}}',
+            extra_data={"debt_id": debt.id, "amount": debt.principal_amount},
         )
         db.add(notification)
         db.commit()
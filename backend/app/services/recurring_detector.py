@@ -4,7 +4,7 @@ Analyzes transaction history to detect recurring patterns and suggest automation
 """
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
@@ -222,19 +222,18 @@ class RecurringDetector:
         avg_amount = sum(t.amount for t in sorted_trans) / len(sorted_trans)
 
         # Use most common description
-        descriptions = [t.description for t in sorted_trans]
-        most_common_desc = max(set(descriptions), key=descriptions.count)
+        most_common_desc = Counter(t.description for t in sorted_trans).most_common(1)[0][0]
 
-        # Use most common category
-        categories = [t.category for t in sorted_trans]
-        most_common_cat = max(set(categories), key=categories.count)
+        # Use most common category (None if no transaction is categorized)
+        category_counts = Counter(t.category for t in sorted_trans if t.category is not None).most_common(1)
+        most_common_cat = category_counts[0][0] if category_counts else None
 
         # Calculate next expected date
         last_date = sorted_trans[-1].date
         next_date = RecurringDetector._calculate_next_date(last_date, frequency)
 
         return {
-            "transaction_type": sorted_trans[0].type.value,
+            "transaction_type": sorted_trans[0].type,
             "amount": round(avg_amount, 2),
             "description": most_common_desc,
             "category": most_common_cat,
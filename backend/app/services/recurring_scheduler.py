@@ -3,11 +3,11 @@ Recurring Transaction Scheduler - TIER 1 Feature
 Handles automatic creation of recurring transactions and bill reminders
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, insert
 from datetime import datetime, timedelta
 from typing import List, Dict
 import logging
-import uuid
+from ..utils.ids import uuid7
 
 from ..database.models import (
     RecurringTransaction,
@@ -16,6 +16,7 @@ from ..database.models import (
     NotificationType,
     NotificationStatus,
     RecurrenceFrequency,
+    json_contains,
 )
 
 logger = logging.getLogger(__name__)
@@ -114,6 +115,8 @@ class RecurringScheduler:
 
         logger.info(f"Checking {len(active_recurring)} recurring transactions for reminders")
 
+        # Reminders are collected and written in one multi-row INSERT at the end
+        reminders = []
         for recurring in active_recurring:
             try:
                 # Calculate reminder date
@@ -126,14 +129,13 @@ class RecurringScheduler:
                         and_(
                             Notification.user_id == recurring.user_id,
                             Notification.type == NotificationType.BILL_REMINDER,
-                            Notification.extra_data.contains(recurring.id),
+                            json_contains(Notification.extra_data, {"recurring_id": recurring.id}),
                             Notification.created_at >= current_date.replace(hour=0, minute=0, second=0)
                         )
                     ).first()
 
                     if not existing_reminder:
-                        RecurringScheduler._create_bill_reminder(db, recurring)
-                        stats["reminders_created"] += 1
+                        reminders.append(RecurringScheduler._bill_reminder_values(recurring))
 
                 stats["processed"] += 1
 
@@ -142,6 +144,18 @@ class RecurringScheduler:
                 stats["errors"] += 1
                 continue
 
+        if reminders:
+            try:
+                # Core bulk insert - batched into multi-row statements (insertmanyvalues)
+                db.execute(insert(Notification), reminders)
+                db.commit()
+                stats["reminders_created"] = len(reminders)
+                logger.info(f"Created {len(reminders)} bill reminders")
+            except Exception as e:
+                logger.error(f"Error creating bill reminders: {e}")
+                stats["errors"] += len(reminders)
+                db.rollback()
+
         return stats
 
     @staticmethod
@@ -156,7 +170,7 @@ class RecurringScheduler:
             recurring: RecurringTransaction object
         """
         transaction = Transaction(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             user_id=recurring.user_id,
             type=recurring.type,
             amount=recurring.amount,
@@ -164,7 +178,7 @@ class RecurringScheduler:
             category=recurring.category,
             date=recurring.next_date,
             recurring=True,
-            extra_data=f'{{"recurring_id": "{recurring.id}"}}',
+            extra_data={"recurring_id": recurring.id},
         )
 
         db.add(transaction)
@@ -172,13 +186,15 @@ class RecurringScheduler:
         logger.info(f"Created transaction from recurring {recurring.id}")
 
     @staticmethod
-    def _create_bill_reminder(db: Session, recurring: RecurringTransaction):
+    def _bill_reminder_values(recurring: RecurringTransaction) -> Dict:
         """
-        Create a bill reminder notification
+        Build the column values for a bill reminder notification
 
         Args:
-            db: Database session
             recurring: RecurringTransaction object
+
+        Returns:
+            Dict of Notification column values, ready for a bulk insert
         """
         days_until = (recurring.next_date.date() - datetime.utcnow().date()).days
 
@@ -189,21 +205,18 @@ class RecurringScheduler:
         else:
             time_text = f"in {days_until} days"
 
-        notification = Notification(
-            id=str(uuid.uuid4()),
-            user_id=recurring.user_id,
-            type=NotificationType.BILL_REMINDER,
-            title=f"Bill Due: {recurring.description}",
-            message=f"Your {recurring.description} bill of ${recurring.amount:,.2f} is due {time_text} ({recurring.next_date.strftime('%b %d, %Y')}).",
-            status=NotificationStatus.UNREAD,
-            priority=2,  # Medium
-            action_url=f"/recurring/{recurring.id}",
-            extra_data=f'{{"recurring_id": "{recurring.id}", "amount": {recurring.amount}, "due_date": "{recurring.next_date.isoformat()}"}}',
-        )
-
-        db.add(notification)
-        db.commit()
-        logger.info(f"Created bill reminder for recurring {recurring.id}")
+        # Core insert bypasses @validates - pass canonical enum values
+        return {
+            "id": str(uuid7()),
+            "user_id": recurring.user_id,
+            "type": NotificationType.BILL_REMINDER.value,
+            "title": f"Bill Due: {recurring.description}",
+            "message": f"Your {recurring.description} bill of ${recurring.amount:,.2f} is due {time_text} ({recurring.next_date.strftime('%b %d, %Y')}).",
+            "status": NotificationStatus.UNREAD.value,
+            "priority": 2,  # Medium
+            "action_url": f"/recurring/{recurring.id}",
+            "extra_data": {"recurring_id": recurring.id, "amount": recurring.amount, "due_date": recurring.next_date.isoformat()},
+        }
 
     @staticmethod
     def _calculate_next_date(current_date: datetime, frequency: RecurrenceFrequency) -> datetime:
@@ -0,0 +1,207 @@
+"""
+Redis cache of spending sums for budget dashboards
+Per-category period totals (budget status) and per-period category breakdowns
+are cached per user and dropped when one of the user's transactions is
+inserted, updated or deleted. Each user/category keeps its periods in Redis
+hashes, so invalidation is a single DEL rather than a key scan. Open and closed
+periods live in separate hashes because a TTL applies to the whole hash.
+"""
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+import orjson
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database.models import Transaction
+
+logger = logging.getLogger(__name__)
+
+# Optional - requires the redis client
+try:
+    import redis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    RedisError = Exception
+    REDIS_AVAILABLE = False
+
+CATEGORY_TOTAL_PREFIX = "txsum:"
+CATEGORY_BREAKDOWN_PREFIX = "spendcat:"
+OPEN_PERIOD_TTL_SECONDS = 3600
+# Closed periods only change through backdated edits, which invalidate anyway
+CLOSED_PERIOD_TTL_SECONDS = 30 * 24 * 3600
+
+_CLOSED_SUFFIX = ":closed"
+_DIRTY_KEY = "spending_cache_dirty"
+
+
+@lru_cache(maxsize=1)
+def _get_client():
+    """Shared Redis client, or None if Redis is not enabled"""
+    if not (REDIS_AVAILABLE and settings.USE_REDIS and settings.REDIS_URL):
+        return None
+    return redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+
+
+def category_key(category: Optional[str]) -> str:
+    """Category as the spending sums name it (NULL/empty is "uncategorized")"""
+    return category or "uncategorized"
+
+
+def _is_closed(end: datetime) -> bool:
+    return end <= datetime.utcnow()
+
+
+def _total_key(user_id: str, category: str, closed: bool = False) -> str:
+    return f"{CATEGORY_TOTAL_PREFIX}{user_id}:{category}{_CLOSED_SUFFIX if closed else ''}"
+
+
+def _breakdown_key(user_id: str, closed: bool = False) -> str:
+    return f"{CATEGORY_BREAKDOWN_PREFIX}{user_id}{_CLOSED_SUFFIX if closed else ''}"
+
+
+def _period_field(start: datetime, end: datetime) -> str:
+    return f"{start.isoformat()}|{end.isoformat()}"
+
+
+def get_category_totals(
+    user_id: str,
+    periods: List[Tuple[str, datetime, datetime]],
+) -> List[Optional[float]]:
+    """
+    Cached spending totals for (category, period_start, period_end) entries
+
+    Returns:
+        One total per entry, None where not cached (all None if Redis is unavailable)
+    """
+    client = _get_client()
+    if client is None or not periods:
+        return [None] * len(periods)
+    try:
+        pipe = client.pipeline(transaction=False)
+        for category, start, end in periods:
+            pipe.hget(_total_key(user_id, category, _is_closed(end)), _period_field(start, end))
+        cached = pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Spending cache read failed: {e}")
+        return [None] * len(periods)
+    return [None if value is None else orjson.loads(value) for value in cached]
+
+
+def store_category_totals(
+    user_id: str,
+    totals: Iterable[Tuple[str, datetime, datetime, float]],
+) -> None:
+    """Remember spending totals for (category, period_start, period_end, total) entries"""
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for category, start, end, total in totals:
+            closed = _is_closed(end)
+            key = _total_key(user_id, category, closed)
+            pipe.hset(key, _period_field(start, end), orjson.dumps(total))
+            pipe.expire(key, CLOSED_PERIOD_TTL_SECONDS if closed else OPEN_PERIOD_TTL_SECONDS)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Spending cache write failed: {e}")
+
+
+def get_spending_by_category(user_id: str, start: datetime, end: datetime) -> Optional[Dict[str, float]]:
+    """Cached category breakdown for the period, or None on miss / Redis unavailable"""
+    client = _get_client()
+    if client is None:
+        return None
+    try:
+        cached = client.hget(_breakdown_key(user_id, _is_closed(end)), _period_field(start, end))
+    except RedisError as e:
+        logger.warning(f"Spending cache read failed: {e}")
+        return None
+    return None if cached is None else orjson.loads(cached)
+
+
+def store_spending_by_category(user_id: str, start: datetime, end: datetime, totals: Dict[str, float]) -> None:
+    """Remember the category breakdown for the period"""
+    client = _get_client()
+    if client is None:
+        return
+    closed = _is_closed(end)
+    key = _breakdown_key(user_id, closed)
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.hset(key, _period_field(start, end), orjson.dumps(totals))
+        pipe.expire(key, CLOSED_PERIOD_TTL_SECONDS if closed else OPEN_PERIOD_TTL_SECONDS)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Spending cache write failed: {e}")
+
+
+def invalidate(changed: Dict[str, Set[str]]) -> None:
+    """
+    Drop cached sums for the given users and categories
+
+    Args:
+        changed: Dict mapping user_id to the categories whose transactions changed
+    """
+    client = _get_client()
+    if client is None or not changed:
+        return
+    keys = [
+        _breakdown_key(user_id, closed)
+        for user_id in changed
+        for closed in (False, True)
+    ]
+    keys.extend(
+        _total_key(user_id, category, closed)
+        for user_id, categories in changed.items()
+        for category in categories
+        for closed in (False, True)
+    )
+    try:
+        client.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Spending cache invalidation failed: {e}")
+
+
+@event.listens_for(Transaction.category, "set", active_history=True)
+def _load_previous_category(target, value, oldvalue, initiator):
+    """No-op; active_history loads the old category so the flush hook below can invalidate it"""
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_transactions(session, flush_context):
+    """Note users/categories whose transactions changed; dropped once the commit lands"""
+    if _get_client() is None:
+        return
+    changed = session.info.setdefault(_DIRTY_KEY, defaultdict(set))
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, Transaction):
+            continue
+        categories = changed[obj.user_id]
+        categories.add(category_key(obj.category))
+        # A recategorized transaction also leaves its old category's totals stale
+        categories.update(category_key(old) for old in inspect(obj).attrs.category.history.deleted)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    """
+    Invalidate after commit rather than at flush, so a concurrent reader cannot
+    re-cache the pre-commit sums between the two
+    """
+    changed = session.info.pop(_DIRTY_KEY, None)
+    if changed:
+        invalidate(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_DIRTY_KEY, None)
@@ -2,6 +2,7 @@
 Transaction Categorization Service (Fallback)
 """
 from typing import Dict
+import re
 
 
 class TransactionCategorizer:
@@ -82,6 +83,15 @@ class TransactionCategorizer:
         "investment": ["dividend", "interest", "stock", "investment", "401k"],
     }
 
+    # Categories that only make sense for money coming in
+    INCOME_CATEGORIES = frozenset({"salary", "investment"})
+
+    # (keyword, category), longest keyword first so "gas bill" wins over "gas"
+    _KEYWORDS_BY_LENGTH = sorted(
+        ((keyword, cat) for cat, keywords in CATEGORY_KEYWORDS.items() for keyword in keywords),
+        key=lambda pair: -len(pair[0]),
+    )
+
     @staticmethod
     def categorize(description: str, amount: float = None, trans_type: str = None) -> Dict:
         """
@@ -99,14 +109,15 @@ class TransactionCategorizer:
 
         # Find matching category
         category = "uncategorized"
-        for cat, keywords in TransactionCategorizer.CATEGORY_KEYWORDS.items():
-            if any(keyword in description_lower for keyword in keywords):
-                category = cat
+        matched_keyword = None
+        for keyword, cat in TransactionCategorizer._KEYWORDS_BY_LENGTH:
+            if keyword in description_lower:
+                category, matched_keyword = cat, keyword
                 break
 
         # Determine type if not provided
         if not trans_type:
-            if category in ["salary", "investment"]:
+            if category in TransactionCategorizer.INCOME_CATEGORIES:
                 trans_type = "income"
             else:
                 trans_type = "expense"
@@ -122,8 +133,14 @@ class TransactionCategorizer:
         ]
         recurring = any(kw in description_lower for kw in recurring_keywords)
 
-        # Confidence based on match
-        confidence = 0.8 if category != "uncategorized" else 0.3
+        # Confidence based on match: a whole-word keyword ("netflix", "uber")
+        # is a stronger signal than a keyword inside another word
+        if matched_keyword is None:
+            confidence = 0.3
+        elif re.search(rf"\b{re.escape(matched_keyword)}\b", description_lower):
+            confidence = 0.9
+        else:
+            confidence = 0.8
 
         return {
             "category": category,
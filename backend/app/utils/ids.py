@@ -0,0 +1,30 @@
+"""
+Time-ordered identifiers
+UUIDv7 (RFC 9562) keeps new primary keys on the rightmost B-tree leaf,
+unlike random uuid4 which scatters inserts across the whole index
+"""
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a UUIDv7: 48-bit Unix millisecond timestamp followed by 74 random bits
+
+    Values sort by creation time (to the millisecond), so they can be stored in
+    the existing 36-char String id columns without a migration.
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    rand_a = rand >> 68  # 12 bits
+    rand_b = rand & ((1 << 62) - 1)  # 62 bits
+
+    value = (
+        (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76  # version
+        | rand_a << 64
+        | 0b10 << 62  # RFC 4122 variant
+        | rand_b
+    )
+    return uuid.UUID(int=value)
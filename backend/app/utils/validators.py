@@ -1,7 +1,11 @@
+from datetime import datetime, timezone
 from decimal import Decimal, InvalidOperation
 from typing import Union, Literal
 import re
 
+# Compiled once at import; sanitize_description runs on every description field
+_TAG_RE = re.compile(r'<[^>]+>')
+
 class FinancialValidationError(ValueError):
     """Custom exception for financial validation errors"""
     pass
@@ -41,7 +45,7 @@ class FinancialValidator:
             raise FinancialValidationError(f"Invalid amount format: {amount}")
 
         # Convert to float for final processing
-        float_amount = float(decimal_amount.quantize(Decimal(f'0.{"0" * precision}'))
+        float_amount = float(decimal_amount.quantize(Decimal(f'0.{"0" * precision}')))
 
         # Zero check
         if not allow_zero and float_amount == 0:
@@ -94,6 +98,18 @@ class FinancialValidator:
 
         return float_percentage
 
+    @staticmethod
+    def to_naive_utc(value: datetime) -> datetime:
+        """
+        Convert an offset-aware datetime to naive UTC
+
+        DateTime columns store naive UTC; asyncpg rejects aware values for them.
+        Naive input is assumed to be UTC already and returned unchanged.
+        """
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
     @staticmethod
     def sanitize_description(
         description: str,
@@ -128,6 +144,6 @@ class FinancialValidator:
 
         # HTML tag removal if not allowed
         if not allow_html:
-            description = re.sub(r'<[^>]+>', '', description)
+            description = _TAG_RE.sub('', description)
 
         return description
\ No newline at end of file
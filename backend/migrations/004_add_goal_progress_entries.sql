@@ -0,0 +1,17 @@
+-- Add goal_progress_entries table
+-- Audit trail for PUT /goals/{goal_id}/progress - one row per contribution
+
+CREATE TABLE IF NOT EXISTS goal_progress_entries (
+    id VARCHAR(36) PRIMARY KEY,
+    goal_id VARCHAR(36) NOT NULL REFERENCES goals(id) ON DELETE CASCADE,
+    user_id VARCHAR(36) NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    amount FLOAT NOT NULL,
+    date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_goal_progress_entries_goal_id ON goal_progress_entries(goal_id);
+CREATE INDEX IF NOT EXISTS ix_goal_progress_entries_user_id ON goal_progress_entries(user_id);
+
+-- Migration complete!
@@ -0,0 +1,70 @@
+-- Store enum columns as plain VARCHAR(32) with CHECK constraints
+-- SQLAlchemy's non-native Enum persisted member NAMES (e.g. 'INCOME', 'CREDIT_CARD');
+-- the models now store the lowercase enum VALUES directly, so existing rows are
+-- lowercased first (every name lowercases to its value).
+
+-- transactions
+UPDATE transactions SET type = LOWER(type) WHERE type <> LOWER(type);
+ALTER TABLE transactions ALTER COLUMN type TYPE VARCHAR(32);
+ALTER TABLE transactions DROP CONSTRAINT IF EXISTS ck_transactions_type;
+ALTER TABLE transactions ADD CONSTRAINT ck_transactions_type CHECK (type IN ('income', 'expense', 'lending', 'borrowing'));
+
+-- accounts
+UPDATE accounts SET account_type = LOWER(account_type) WHERE account_type <> LOWER(account_type);
+ALTER TABLE accounts ALTER COLUMN account_type TYPE VARCHAR(32);
+ALTER TABLE accounts DROP CONSTRAINT IF EXISTS ck_accounts_account_type;
+ALTER TABLE accounts ADD CONSTRAINT ck_accounts_account_type CHECK (account_type IN ('checking', 'savings', 'credit_card', 'investment', 'cash', 'other'));
+UPDATE accounts SET status = LOWER(status) WHERE status <> LOWER(status);
+ALTER TABLE accounts ALTER COLUMN status TYPE VARCHAR(32);
+ALTER TABLE accounts DROP CONSTRAINT IF EXISTS ck_accounts_status;
+ALTER TABLE accounts ADD CONSTRAINT ck_accounts_status CHECK (status IN ('active', 'closed', 'frozen', 'pending'));
+
+-- credit_cards
+UPDATE credit_cards SET card_network = LOWER(card_network) WHERE card_network <> LOWER(card_network);
+ALTER TABLE credit_cards ALTER COLUMN card_network TYPE VARCHAR(32);
+ALTER TABLE credit_cards DROP CONSTRAINT IF EXISTS ck_credit_cards_card_network;
+ALTER TABLE credit_cards ADD CONSTRAINT ck_credit_cards_card_network CHECK (card_network IN ('visa', 'mastercard', 'american_express', 'discover', 'diners_club', 'jcb', 'unionpay', 'other'));
+
+-- debts_loans
+UPDATE debts_loans SET type = LOWER(type) WHERE type <> LOWER(type);
+ALTER TABLE debts_loans ALTER COLUMN type TYPE VARCHAR(32);
+ALTER TABLE debts_loans DROP CONSTRAINT IF EXISTS ck_debts_loans_type;
+ALTER TABLE debts_loans ADD CONSTRAINT ck_debts_loans_type CHECK (type IN ('debt', 'loan'));
+UPDATE debts_loans SET status = LOWER(status) WHERE status <> LOWER(status);
+ALTER TABLE debts_loans ALTER COLUMN status TYPE VARCHAR(32);
+ALTER TABLE debts_loans DROP CONSTRAINT IF EXISTS ck_debts_loans_status;
+ALTER TABLE debts_loans ADD CONSTRAINT ck_debts_loans_status CHECK (status IN ('active', 'paid_off', 'defaulted'));
+
+-- goals
+UPDATE goals SET status = LOWER(status) WHERE status <> LOWER(status);
+ALTER TABLE goals ALTER COLUMN status TYPE VARCHAR(32);
+ALTER TABLE goals DROP CONSTRAINT IF EXISTS ck_goals_status;
+ALTER TABLE goals ADD CONSTRAINT ck_goals_status CHECK (status IN ('active', 'completed', 'abandoned'));
+
+-- insights
+UPDATE insights SET type = LOWER(type) WHERE type <> LOWER(type);
+ALTER TABLE insights ALTER COLUMN type TYPE VARCHAR(32);
+ALTER TABLE insights DROP CONSTRAINT IF EXISTS ck_insights_type;
+ALTER TABLE insights ADD CONSTRAINT ck_insights_type CHECK (type IN ('debt', 'savings', 'spending', 'goal', 'general'));
+
+-- recurring_transactions
+UPDATE recurring_transactions SET type = LOWER(type) WHERE type <> LOWER(type);
+ALTER TABLE recurring_transactions ALTER COLUMN type TYPE VARCHAR(32);
+ALTER TABLE recurring_transactions DROP CONSTRAINT IF EXISTS ck_recurring_transactions_type;
+ALTER TABLE recurring_transactions ADD CONSTRAINT ck_recurring_transactions_type CHECK (type IN ('income', 'expense', 'lending', 'borrowing'));
+UPDATE recurring_transactions SET frequency = LOWER(frequency) WHERE frequency <> LOWER(frequency);
+ALTER TABLE recurring_transactions ALTER COLUMN frequency TYPE VARCHAR(32);
+ALTER TABLE recurring_transactions DROP CONSTRAINT IF EXISTS ck_recurring_transactions_frequency;
+ALTER TABLE recurring_transactions ADD CONSTRAINT ck_recurring_transactions_frequency CHECK (frequency IN ('daily', 'weekly', 'biweekly', 'monthly', 'quarterly', 'yearly'));
+
+-- notifications
+UPDATE notifications SET type = LOWER(type) WHERE type <> LOWER(type);
+ALTER TABLE notifications ALTER COLUMN type TYPE VARCHAR(32);
+ALTER TABLE notifications DROP CONSTRAINT IF EXISTS ck_notifications_type;
+ALTER TABLE notifications ADD CONSTRAINT ck_notifications_type CHECK (type IN ('budget_alert', 'bill_reminder', 'goal_milestone', 'unusual_spending', 'low_balance', 'goal_completed', 'debt_paid_off'));
+UPDATE notifications SET status = LOWER(status) WHERE status <> LOWER(status);
+ALTER TABLE notifications ALTER COLUMN status TYPE VARCHAR(32);
+ALTER TABLE notifications DROP CONSTRAINT IF EXISTS ck_notifications_status;
+ALTER TABLE notifications ADD CONSTRAINT ck_notifications_status CHECK (status IN ('unread', 'read', 'dismissed'));
+
+-- Migration complete!
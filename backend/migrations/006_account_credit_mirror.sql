@@ -0,0 +1,17 @@
+-- Mirror credit card limit and utilization onto accounts
+-- Lets balance/utilization reads skip the 1:1 join to credit_cards
+
+ALTER TABLE accounts ADD COLUMN IF NOT EXISTS credit_limit FLOAT;
+ALTER TABLE accounts ADD COLUMN IF NOT EXISTS credit_utilization FLOAT;
+
+-- Backfill from existing credit card rows
+UPDATE accounts a
+SET credit_limit = cc.credit_limit,
+    credit_utilization = cc.credit_utilization
+FROM credit_cards cc
+WHERE cc.account_id = a.id;
+
+-- Partial index for the "cards near their limit" lookup (utilization is a percentage)
+CREATE INDEX IF NOT EXISTS ix_accounts_util_high ON accounts(credit_utilization) WHERE credit_utilization > 70;
+
+-- Migration complete!
@@ -0,0 +1,26 @@
+-- Composite indexes for the upcoming-bills, notifications and active-budget queries
+-- Each index covers the WHERE columns plus the ORDER BY column so the planner skips the sort
+
+-- Credit cards: denormalize the owning user so due-date lookups don't join accounts
+ALTER TABLE credit_cards ADD COLUMN IF NOT EXISTS user_id VARCHAR(36) REFERENCES users(id) ON DELETE CASCADE;
+
+UPDATE credit_cards cc
+SET user_id = a.user_id
+FROM accounts a
+WHERE a.id = cc.account_id AND cc.user_id IS NULL;
+
+DROP INDEX IF EXISTS ix_credit_cards_payment_due_date;
+CREATE INDEX IF NOT EXISTS ix_credit_cards_user_due ON credit_cards(user_id, payment_due_date);
+
+-- Notifications: recent list and unread badge per user
+CREATE INDEX IF NOT EXISTS ix_notif_user_created ON notifications(user_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_notif_user_status_created ON notifications(user_id, status, created_at);
+
+-- Budgets: "list my active budgets"
+CREATE INDEX IF NOT EXISTS ix_budgets_user_active_category ON budgets(user_id, is_active, category);
+
+ANALYZE credit_cards;
+ANALYZE notifications;
+ANALYZE budgets;
+
+-- Migration complete!
@@ -0,0 +1,20 @@
+-- Convert JSON-in-Text columns to native JSONB
+-- Postgres parses the payload once on write; reads return decoded objects and
+-- embedded keys can be filtered (->>, @>) and GIN-indexed server-side.
+-- Empty strings are treated as NULL; any other non-JSON text will abort the migration.
+
+ALTER TABLE accounts ALTER COLUMN extra_data TYPE JSONB USING NULLIF(extra_data, '')::jsonb;
+ALTER TABLE credit_cards ALTER COLUMN extra_data TYPE JSONB USING NULLIF(extra_data, '')::jsonb;
+ALTER TABLE debts_loans ALTER COLUMN extra_data TYPE JSONB USING NULLIF(extra_data, '')::jsonb;
+ALTER TABLE goals ALTER COLUMN extra_data TYPE JSONB USING NULLIF(extra_data, '')::jsonb;
+ALTER TABLE logs ALTER COLUMN details TYPE JSONB USING NULLIF(details, '')::jsonb;
+ALTER TABLE insights ALTER COLUMN extra_data TYPE JSONB USING NULLIF(extra_data, '')::jsonb;
+ALTER TABLE budgets ALTER COLUMN extra_data TYPE JSONB USING NULLIF(extra_data, '')::jsonb;
+ALTER TABLE recurring_transactions ALTER COLUMN extra_data TYPE JSONB USING NULLIF(extra_data, '')::jsonb;
+ALTER TABLE notifications ALTER COLUMN extra_data TYPE JSONB USING NULLIF(extra_data, '')::jsonb;
+ALTER TABLE categories ALTER COLUMN keywords TYPE JSONB USING NULLIF(keywords, '')::jsonb;
+
+-- Keyword containment lookups: WHERE keywords @> '["whole foods"]'
+CREATE INDEX IF NOT EXISTS ix_categories_keywords_gin ON categories USING gin (keywords jsonb_path_ops);
+
+-- Migration complete!
@@ -0,0 +1,28 @@
+-- Materialized view: current-month spending per active monthly budget
+-- Replaces the per-request transactions scan behind the budget status page.
+-- Refresh nightly and after budget edits:
+--   REFRESH MATERIALIZED VIEW CONCURRENTLY mv_monthly_budget_status;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_monthly_budget_status AS
+SELECT
+    b.id AS budget_id,
+    b.user_id,
+    b.category,
+    b.amount AS budget,
+    COALESCE(SUM(t.amount), 0) AS spent,
+    date_trunc('month', now() AT TIME ZONE 'UTC') AS month
+FROM budgets b
+LEFT JOIN transactions t
+    ON t.user_id = b.user_id
+    AND t.category = b.category
+    AND t.type = 'expense'
+    AND t.date >= date_trunc('month', now() AT TIME ZONE 'UTC')
+    AND t.date < date_trunc('month', now() AT TIME ZONE 'UTC') + INTERVAL '1 month'
+WHERE b.is_active AND b.period = 'monthly'
+GROUP BY b.id, b.user_id, b.category, b.amount;
+
+-- Unique index is required for REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_monthly_budget_status_budget ON mv_monthly_budget_status(budget_id);
+CREATE INDEX IF NOT EXISTS ix_mv_monthly_budget_status_user_category ON mv_monthly_budget_status(user_id, category);
+
+-- Migration complete!
@@ -0,0 +1,67 @@
+-- Store money as NUMERIC(18,4) and rates as NUMERIC(7,4) instead of double precision
+-- Exact sums/comparisons in SQL; rates keep 4 decimals (0.1999) and allow percentages < 1000
+
+-- mv_monthly_budget_status depends on budgets.amount / transactions.amount
+DROP MATERIALIZED VIEW IF EXISTS mv_monthly_budget_status;
+
+ALTER TABLE transactions ALTER COLUMN amount TYPE NUMERIC(18,4) USING amount::numeric(18,4);
+
+ALTER TABLE accounts
+    ALTER COLUMN current_balance TYPE NUMERIC(18,4) USING current_balance::numeric(18,4),
+    ALTER COLUMN credit_limit TYPE NUMERIC(18,4) USING credit_limit::numeric(18,4),
+    ALTER COLUMN interest_rate TYPE NUMERIC(7,4) USING interest_rate::numeric(7,4);
+
+ALTER TABLE credit_cards
+    ALTER COLUMN credit_limit TYPE NUMERIC(18,4) USING credit_limit::numeric(18,4),
+    ALTER COLUMN available_credit TYPE NUMERIC(18,4) USING available_credit::numeric(18,4),
+    ALTER COLUMN annual_fee TYPE NUMERIC(18,4) USING annual_fee::numeric(18,4),
+    ALTER COLUMN late_fee TYPE NUMERIC(18,4) USING late_fee::numeric(18,4),
+    ALTER COLUMN statement_balance TYPE NUMERIC(18,4) USING statement_balance::numeric(18,4),
+    ALTER COLUMN minimum_payment TYPE NUMERIC(18,4) USING minimum_payment::numeric(18,4),
+    ALTER COLUMN last_payment_amount TYPE NUMERIC(18,4) USING last_payment_amount::numeric(18,4),
+    ALTER COLUMN rewards_balance TYPE NUMERIC(18,4) USING rewards_balance::numeric(18,4),
+    ALTER COLUMN apr TYPE NUMERIC(7,4) USING apr::numeric(7,4),
+    ALTER COLUMN foreign_transaction_fee_percent TYPE NUMERIC(7,4) USING foreign_transaction_fee_percent::numeric(7,4),
+    ALTER COLUMN cashback_rate TYPE NUMERIC(7,4) USING cashback_rate::numeric(7,4);
+
+ALTER TABLE debts_loans
+    ALTER COLUMN principal_amount TYPE NUMERIC(18,4) USING principal_amount::numeric(18,4),
+    ALTER COLUMN remaining_amount TYPE NUMERIC(18,4) USING remaining_amount::numeric(18,4),
+    ALTER COLUMN monthly_payment TYPE NUMERIC(18,4) USING monthly_payment::numeric(18,4),
+    ALTER COLUMN interest_rate TYPE NUMERIC(7,4) USING interest_rate::numeric(7,4);
+
+ALTER TABLE goals
+    ALTER COLUMN target_amount TYPE NUMERIC(18,4) USING target_amount::numeric(18,4),
+    ALTER COLUMN current_amount TYPE NUMERIC(18,4) USING current_amount::numeric(18,4);
+
+ALTER TABLE goal_progress_entries ALTER COLUMN amount TYPE NUMERIC(18,4) USING amount::numeric(18,4);
+
+ALTER TABLE budgets
+    ALTER COLUMN amount TYPE NUMERIC(18,4) USING amount::numeric(18,4),
+    ALTER COLUMN alert_threshold TYPE NUMERIC(7,4) USING alert_threshold::numeric(7,4);
+
+ALTER TABLE recurring_transactions ALTER COLUMN amount TYPE NUMERIC(18,4) USING amount::numeric(18,4);
+
+-- Recreate the rollup (same definition as 009)
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_monthly_budget_status AS
+SELECT
+    b.id AS budget_id,
+    b.user_id,
+    b.category,
+    b.amount AS budget,
+    COALESCE(SUM(t.amount), 0) AS spent,
+    date_trunc('month', now() AT TIME ZONE 'UTC') AS month
+FROM budgets b
+LEFT JOIN transactions t
+    ON t.user_id = b.user_id
+    AND t.category = b.category
+    AND t.type = 'expense'
+    AND t.date >= date_trunc('month', now() AT TIME ZONE 'UTC')
+    AND t.date < date_trunc('month', now() AT TIME ZONE 'UTC') + INTERVAL '1 month'
+WHERE b.is_active AND b.period = 'monthly'
+GROUP BY b.id, b.user_id, b.category, b.amount;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_monthly_budget_status_budget ON mv_monthly_budget_status(budget_id);
+CREATE INDEX IF NOT EXISTS ix_mv_monthly_budget_status_user_category ON mv_monthly_budget_status(user_id, category);
+
+-- Migration complete!
@@ -0,0 +1,60 @@
+-- Move created_at/updated_at maintenance into the database
+-- Defaults come from the server; a BEFORE UPDATE trigger stamps updated_at,
+-- so the ORM no longer computes and binds a timestamp for every dirty row.
+
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = TIMEZONE('utc', CURRENT_TIMESTAMP);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE users
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+DROP TRIGGER IF EXISTS trg_users_updated_at ON users;
+CREATE TRIGGER trg_users_updated_at BEFORE UPDATE ON users FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+ALTER TABLE accounts
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+DROP TRIGGER IF EXISTS trg_accounts_updated_at ON accounts;
+CREATE TRIGGER trg_accounts_updated_at BEFORE UPDATE ON accounts FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+ALTER TABLE credit_cards
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+DROP TRIGGER IF EXISTS trg_credit_cards_updated_at ON credit_cards;
+CREATE TRIGGER trg_credit_cards_updated_at BEFORE UPDATE ON credit_cards FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+ALTER TABLE debts_loans
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+DROP TRIGGER IF EXISTS trg_debts_loans_updated_at ON debts_loans;
+CREATE TRIGGER trg_debts_loans_updated_at BEFORE UPDATE ON debts_loans FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+ALTER TABLE goals
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+DROP TRIGGER IF EXISTS trg_goals_updated_at ON goals;
+CREATE TRIGGER trg_goals_updated_at BEFORE UPDATE ON goals FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+ALTER TABLE budgets
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+DROP TRIGGER IF EXISTS trg_budgets_updated_at ON budgets;
+CREATE TRIGGER trg_budgets_updated_at BEFORE UPDATE ON budgets FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+ALTER TABLE recurring_transactions
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+DROP TRIGGER IF EXISTS trg_recurring_transactions_updated_at ON recurring_transactions;
+CREATE TRIGGER trg_recurring_transactions_updated_at BEFORE UPDATE ON recurring_transactions FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+ALTER TABLE categories
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+DROP TRIGGER IF EXISTS trg_categories_updated_at ON categories;
+CREATE TRIGGER trg_categories_updated_at BEFORE UPDATE ON categories FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+-- Migration complete!
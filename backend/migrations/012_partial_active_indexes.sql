@@ -0,0 +1,17 @@
+-- Partial indexes over active rows only
+-- Inactive recurring transactions and budgets are never scanned by the scheduler
+-- or the listings, so keep them out of the B-trees.
+
+-- Scheduler: WHERE is_active AND next_date <= now()
+DROP INDEX IF EXISTS ix_recurring_transactions_next_date;
+DROP INDEX IF EXISTS idx_recurring_next_date;
+CREATE INDEX IF NOT EXISTS ix_rt_due_active ON recurring_transactions(next_date) WHERE is_active;
+
+-- Per-user listings of active recurring transactions
+CREATE INDEX IF NOT EXISTS ix_rt_user_active ON recurring_transactions(user_id) WHERE is_active;
+
+-- Active budgets per user/category (replaces the full index from 007)
+DROP INDEX IF EXISTS ix_budgets_user_active_category;
+CREATE INDEX IF NOT EXISTS ix_budgets_active_category ON budgets(user_id, category) WHERE is_active;
+
+-- Migration complete!
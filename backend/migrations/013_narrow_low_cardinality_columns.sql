@@ -0,0 +1,17 @@
+-- Narrow low-cardinality string columns
+-- autopay_amount becomes a CHECK-constrained VARCHAR(32) like the other enum columns (005);
+-- account currency becomes a fixed-width ISO 4217 CHAR(3).
+
+UPDATE credit_cards SET autopay_amount = lower(autopay_amount) WHERE autopay_amount IS NOT NULL;
+UPDATE credit_cards SET autopay_amount = 'minimum'
+WHERE autopay_amount IS NOT NULL
+  AND autopay_amount NOT IN ('minimum', 'statement_balance', 'full_balance', 'custom');
+
+ALTER TABLE credit_cards ALTER COLUMN autopay_amount TYPE VARCHAR(32);
+ALTER TABLE credit_cards DROP CONSTRAINT IF EXISTS ck_credit_cards_autopay_amount;
+ALTER TABLE credit_cards ADD CONSTRAINT ck_credit_cards_autopay_amount
+    CHECK (autopay_amount IN ('minimum', 'statement_balance', 'full_balance', 'custom'));
+
+ALTER TABLE accounts ALTER COLUMN currency TYPE CHAR(3) USING upper(left(currency, 3));
+
+-- Migration complete!
@@ -0,0 +1,84 @@
+-- Partition logs, insights and notifications by month on created_at
+-- Old months drop out of the hot working set, per-partition indexes stay small,
+-- and retention becomes DETACH PARTITION instead of a bulk DELETE
+-- (see app/database/partitions.py / scripts/maintain_partitions.py).
+-- PostgreSQL requires the partition key in the primary key: PK becomes (id, created_at).
+
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(
+    parent text,
+    months_ahead int DEFAULT 3,
+    from_month date DEFAULT (TIMEZONE('utc', CURRENT_TIMESTAMP))::date
+) RETURNS void AS $$
+DECLARE
+    m date := date_trunc('month', from_month)::date;
+    stop date := (date_trunc('month', TIMEZONE('utc', CURRENT_TIMESTAMP)) + make_interval(months => months_ahead))::date;
+BEGIN
+    WHILE m <= stop LOOP
+        EXECUTE 'CREATE TABLE IF NOT EXISTS ' || quote_ident(parent || '_' || to_char(m, 'YYYYMM'))
+            || ' PARTITION OF ' || quote_ident(parent)
+            || ' FOR VALUES FROM (' || quote_literal(m) || ') TO (' || quote_literal((m + interval '1 month')::date) || ')';
+        m := (m + interval '1 month')::date;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- logs
+BEGIN;
+ALTER TABLE logs RENAME TO logs_unpartitioned;
+UPDATE logs_unpartitioned SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+
+CREATE TABLE logs (LIKE logs_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS)
+    PARTITION BY RANGE (created_at);
+SELECT ensure_monthly_partitions('logs', 3, (SELECT COALESCE(min(created_at), TIMEZONE('utc', CURRENT_TIMESTAMP)) FROM logs_unpartitioned)::date);
+CREATE TABLE IF NOT EXISTS logs_default PARTITION OF logs DEFAULT;
+
+INSERT INTO logs SELECT * FROM logs_unpartitioned;
+DROP TABLE logs_unpartitioned;
+
+ALTER TABLE logs ADD PRIMARY KEY (id, created_at);
+ALTER TABLE logs ADD FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+CREATE INDEX IF NOT EXISTS ix_logs_user_id ON logs(user_id);
+CREATE INDEX IF NOT EXISTS ix_logs_created_at ON logs(created_at);
+COMMIT;
+
+-- insights
+BEGIN;
+ALTER TABLE insights RENAME TO insights_unpartitioned;
+UPDATE insights_unpartitioned SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+
+CREATE TABLE insights (LIKE insights_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS)
+    PARTITION BY RANGE (created_at);
+SELECT ensure_monthly_partitions('insights', 3, (SELECT COALESCE(min(created_at), TIMEZONE('utc', CURRENT_TIMESTAMP)) FROM insights_unpartitioned)::date);
+CREATE TABLE IF NOT EXISTS insights_default PARTITION OF insights DEFAULT;
+
+INSERT INTO insights SELECT * FROM insights_unpartitioned;
+DROP TABLE insights_unpartitioned;
+
+ALTER TABLE insights ADD PRIMARY KEY (id, created_at);
+ALTER TABLE insights ADD FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+CREATE INDEX IF NOT EXISTS ix_insights_user_id ON insights(user_id);
+CREATE INDEX IF NOT EXISTS ix_insights_created_at ON insights(created_at);
+COMMIT;
+
+-- notifications
+BEGIN;
+ALTER TABLE notifications RENAME TO notifications_unpartitioned;
+UPDATE notifications_unpartitioned SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+
+CREATE TABLE notifications (LIKE notifications_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS)
+    PARTITION BY RANGE (created_at);
+SELECT ensure_monthly_partitions('notifications', 3, (SELECT COALESCE(min(created_at), TIMEZONE('utc', CURRENT_TIMESTAMP)) FROM notifications_unpartitioned)::date);
+CREATE TABLE IF NOT EXISTS notifications_default PARTITION OF notifications DEFAULT;
+
+INSERT INTO notifications SELECT * FROM notifications_unpartitioned;
+DROP TABLE notifications_unpartitioned;
+
+ALTER TABLE notifications ADD PRIMARY KEY (id, created_at);
+ALTER TABLE notifications ADD FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+CREATE INDEX IF NOT EXISTS ix_notifications_user_id ON notifications(user_id);
+CREATE INDEX IF NOT EXISTS ix_notifications_created_at ON notifications(created_at);
+CREATE INDEX IF NOT EXISTS ix_notif_user_created ON notifications(user_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_notif_user_status_created ON notifications(user_id, status, created_at);
+COMMIT;
+
+-- Migration complete!
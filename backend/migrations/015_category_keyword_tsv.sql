@@ -0,0 +1,28 @@
+-- Full-text search vector over category keywords
+-- Keyword matching prefilters candidate categories in the database
+-- (keyword_tsv @@ description words) instead of scanning every row in Python.
+
+ALTER TABLE categories ADD COLUMN IF NOT EXISTS keyword_tsv TSVECTOR;
+
+CREATE OR REPLACE FUNCTION categories_keyword_tsv_update() RETURNS trigger AS $$
+BEGIN
+    NEW.keyword_tsv = CASE
+        WHEN NEW.keywords IS NULL THEN NULL
+        ELSE jsonb_to_tsvector('simple', NEW.keywords, '["string"]')
+    END;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_categories_keyword_tsv ON categories;
+CREATE TRIGGER trg_categories_keyword_tsv BEFORE INSERT OR UPDATE OF keywords ON categories
+    FOR EACH ROW EXECUTE FUNCTION categories_keyword_tsv_update();
+
+-- Backfill existing rows
+UPDATE categories
+SET keyword_tsv = jsonb_to_tsvector('simple', keywords, '["string"]')
+WHERE keywords IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS ix_cat_kw_tsv ON categories USING gin (keyword_tsv);
+
+-- Migration complete!
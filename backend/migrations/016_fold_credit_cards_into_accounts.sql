@@ -0,0 +1,75 @@
+-- Fold the 1:1 credit_cards extension into accounts
+-- Card fields become nullable columns on accounts (NULL for non-card accounts),
+-- so account reads never need the join. credit_limit / credit_utilization
+-- already exist as the mirror columns added in 006.
+
+ALTER TABLE accounts
+    ADD COLUMN IF NOT EXISTS available_credit NUMERIC(18,4),
+    ADD COLUMN IF NOT EXISTS apr NUMERIC(7,4),
+    ADD COLUMN IF NOT EXISTS annual_fee NUMERIC(18,4),
+    ADD COLUMN IF NOT EXISTS late_fee NUMERIC(18,4),
+    ADD COLUMN IF NOT EXISTS foreign_transaction_fee_percent NUMERIC(7,4),
+    ADD COLUMN IF NOT EXISTS statement_balance NUMERIC(18,4),
+    ADD COLUMN IF NOT EXISTS minimum_payment NUMERIC(18,4),
+    ADD COLUMN IF NOT EXISTS statement_date TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS payment_due_date TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS last_payment_date TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS last_payment_amount NUMERIC(18,4),
+    ADD COLUMN IF NOT EXISTS card_network VARCHAR(32),
+    ADD COLUMN IF NOT EXISTS card_last4 VARCHAR,
+    ADD COLUMN IF NOT EXISTS cardholder_name VARCHAR,
+    ADD COLUMN IF NOT EXISTS expiration_month INTEGER,
+    ADD COLUMN IF NOT EXISTS expiration_year INTEGER,
+    ADD COLUMN IF NOT EXISTS rewards_program VARCHAR,
+    ADD COLUMN IF NOT EXISTS rewards_balance NUMERIC(18,4),
+    ADD COLUMN IF NOT EXISTS cashback_rate NUMERIC(7,4),
+    ADD COLUMN IF NOT EXISTS grace_period_days INTEGER,
+    ADD COLUMN IF NOT EXISTS alert_before_due_days INTEGER,
+    ADD COLUMN IF NOT EXISTS autopay_enabled BOOLEAN,
+    ADD COLUMN IF NOT EXISTS autopay_amount VARCHAR(32);
+
+UPDATE accounts a
+SET credit_limit = cc.credit_limit,
+    available_credit = cc.available_credit,
+    credit_utilization = cc.credit_utilization,
+    apr = cc.apr,
+    annual_fee = cc.annual_fee,
+    late_fee = cc.late_fee,
+    foreign_transaction_fee_percent = cc.foreign_transaction_fee_percent,
+    statement_balance = cc.statement_balance,
+    minimum_payment = cc.minimum_payment,
+    statement_date = cc.statement_date,
+    payment_due_date = cc.payment_due_date,
+    last_payment_date = cc.last_payment_date,
+    last_payment_amount = cc.last_payment_amount,
+    card_network = cc.card_network,
+    card_last4 = cc.card_last4,
+    cardholder_name = cc.cardholder_name,
+    expiration_month = cc.expiration_month,
+    expiration_year = cc.expiration_year,
+    rewards_program = cc.rewards_program,
+    rewards_balance = cc.rewards_balance,
+    cashback_rate = cc.cashback_rate,
+    grace_period_days = cc.grace_period_days,
+    alert_before_due_days = cc.alert_before_due_days,
+    autopay_enabled = cc.autopay_enabled,
+    autopay_amount = cc.autopay_amount
+FROM credit_cards cc
+WHERE cc.account_id = a.id;
+
+DROP TABLE IF EXISTS credit_cards;
+
+ALTER TABLE accounts DROP CONSTRAINT IF EXISTS ck_accounts_card_network;
+ALTER TABLE accounts ADD CONSTRAINT ck_accounts_card_network
+    CHECK (card_network IN ('visa', 'mastercard', 'american_express', 'discover', 'diners_club', 'jcb', 'unionpay', 'other'));
+ALTER TABLE accounts DROP CONSTRAINT IF EXISTS ck_accounts_autopay_amount;
+ALTER TABLE accounts ADD CONSTRAINT ck_accounts_autopay_amount
+    CHECK (autopay_amount IN ('minimum', 'statement_balance', 'full_balance', 'custom'));
+ALTER TABLE accounts DROP CONSTRAINT IF EXISTS ck_accounts_credit_fields;
+ALTER TABLE accounts ADD CONSTRAINT ck_accounts_credit_fields
+    CHECK (account_type = 'credit_card' OR credit_limit IS NULL);
+
+-- Upcoming bills per user
+CREATE INDEX IF NOT EXISTS ix_accounts_user_due ON accounts(user_id, payment_due_date) WHERE payment_due_date IS NOT NULL;
+
+-- Migration complete!
@@ -0,0 +1,15 @@
+-- Covering index for per-type spending windows
+-- WHERE user_id = ? AND type IN (...) AND date >= ? GROUP BY type, category
+-- is served by an index-only scan; (user_id, type) lookups use its prefix.
+-- Recent-first listings keep using ix_transactions_user_date (scanned backward).
+
+CREATE INDEX IF NOT EXISTS ix_tx_user_type_date
+    ON transactions(user_id, type, date) INCLUDE (category, amount);
+
+-- Superseded by the prefix of ix_tx_user_type_date
+DROP INDEX IF EXISTS ix_transactions_user_type;
+
+-- Keep the visibility map current so the index-only scan avoids heap fetches
+VACUUM (ANALYZE) transactions;
+
+-- Migration complete!
@@ -0,0 +1,13 @@
+-- Trigram index on transaction descriptions
+-- Recurring-pattern matching prefilters candidates in the database with
+-- similarity(description, ?) / ILIKE instead of scoring every row in the
+-- amount window in Python.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_tx_desc_trgm
+    ON transactions USING gin (description gin_trgm_ops);
+
+ANALYZE transactions;
+
+-- Migration complete!
@@ -0,0 +1,11 @@
+-- Composite index for similar-transaction lookups
+-- WHERE user_id = ? AND type = ? AND amount BETWEEN ? AND ? AND date >= ?
+-- range-scans only the amount window of one user and type; INCLUDE lets the
+-- description/category prefilter run on index entries (PG 11+).
+
+CREATE INDEX IF NOT EXISTS ix_tx_user_type_amt_date
+    ON transactions(user_id, type, amount, date) INCLUDE (description, category);
+
+ANALYZE transactions;
+
+-- Migration complete!
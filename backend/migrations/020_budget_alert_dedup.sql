@@ -0,0 +1,31 @@
+-- Idempotent budget alerts
+-- notifications is partitioned by created_at, so it cannot carry a unique
+-- index on (budget_id, day). Instead each alert first claims its day in
+-- budget_alert_days with INSERT ... ON CONFLICT DO NOTHING; only the
+-- evaluation that inserted the row creates the notification.
+
+CREATE TABLE IF NOT EXISTS budget_alert_days (
+    budget_id VARCHAR(36) NOT NULL REFERENCES budgets(id) ON DELETE CASCADE,
+    alert_date DATE NOT NULL,
+    PRIMARY KEY (budget_id, alert_date)
+);
+
+-- Budget the alert is about, denormalized from extra_data
+ALTER TABLE notifications ADD COLUMN IF NOT EXISTS budget_id VARCHAR;
+
+UPDATE notifications
+SET budget_id = extra_data->>'budget_id'
+WHERE type = 'budget_alert' AND budget_id IS NULL;
+
+-- Seed today's claims so alerts already sent are not repeated after deploy
+INSERT INTO budget_alert_days (budget_id, alert_date)
+SELECT DISTINCT n.budget_id, n.created_at::date
+FROM notifications n
+JOIN budgets b ON b.id = n.budget_id
+WHERE n.type = 'budget_alert' AND n.created_at >= TIMEZONE('utc', CURRENT_TIMESTAMP)::date
+ON CONFLICT DO NOTHING;
+
+CREATE INDEX IF NOT EXISTS ix_notif_user_budget_created
+    ON notifications(user_id, budget_id, created_at) WHERE budget_id IS NOT NULL;
+
+-- Migration complete!
@@ -0,0 +1,10 @@
+-- GIN index on notifications.extra_data
+-- Dedup checks for bill reminders and goal milestones filter on keys of
+-- extra_data; they are written as jsonb containment (extra_data @> '{...}'),
+-- which jsonb_path_ops serves with an index probe instead of scanning every
+-- notification of the user.
+
+CREATE INDEX IF NOT EXISTS ix_notif_extra_gin
+    ON notifications USING gin (extra_data jsonb_path_ops);
+
+-- Migration complete!
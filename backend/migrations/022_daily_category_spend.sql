@@ -0,0 +1,49 @@
+-- Daily expense rollup per user and category
+-- Budget status and spending-by-category reports sum at most one row per day
+-- instead of every transaction in the period. An AFTER trigger on
+-- transactions applies each insert/update/delete as a +/- delta.
+
+CREATE TABLE IF NOT EXISTS daily_category_spend (
+    user_id VARCHAR(36) NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    category VARCHAR NOT NULL,
+    day DATE NOT NULL,
+    total NUMERIC(18, 4) NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, category, day)
+);
+
+CREATE OR REPLACE FUNCTION daily_category_spend_apply() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.type = 'expense' THEN
+        INSERT INTO daily_category_spend AS d (user_id, category, day, total)
+        VALUES (OLD.user_id, COALESCE(OLD.category, ''), OLD.date::date, -OLD.amount)
+        ON CONFLICT (user_id, category, day) DO UPDATE SET total = d.total + EXCLUDED.total;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.type = 'expense' THEN
+        INSERT INTO daily_category_spend AS d (user_id, category, day, total)
+        VALUES (NEW.user_id, COALESCE(NEW.category, ''), NEW.date::date, NEW.amount)
+        ON CONFLICT (user_id, category, day) DO UPDATE SET total = d.total + EXCLUDED.total;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Install the trigger and backfill under one lock so no write slips between them
+BEGIN;
+LOCK TABLE transactions IN SHARE ROW EXCLUSIVE MODE;
+
+DROP TRIGGER IF EXISTS trg_transactions_daily_spend ON transactions;
+CREATE TRIGGER trg_transactions_daily_spend
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, type, category, amount, date ON transactions
+    FOR EACH ROW EXECUTE FUNCTION daily_category_spend_apply();
+
+DELETE FROM daily_category_spend;
+INSERT INTO daily_category_spend (user_id, category, day, total)
+SELECT user_id, COALESCE(category, ''), date::date, SUM(amount)
+FROM transactions
+WHERE type = 'expense'
+GROUP BY user_id, COALESCE(category, ''), date::date;
+COMMIT;
+
+ANALYZE daily_category_spend;
+
+-- Migration complete!
@@ -0,0 +1,12 @@
+-- Drop the category keyword search vector (added in 015)
+-- Keyword matching needs substring semantics ("uber" matches "UBEREATS 1234"),
+-- which whole-lexeme tsquery matching cannot express. find_similar_category
+-- now checks keyword containment directly in SQL, so the vector, its trigger
+-- and its GIN index are unused.
+
+DROP INDEX IF EXISTS ix_cat_kw_tsv;
+DROP TRIGGER IF EXISTS trg_categories_keyword_tsv ON categories;
+DROP FUNCTION IF EXISTS categories_keyword_tsv_update();
+ALTER TABLE categories DROP COLUMN IF EXISTS keyword_tsv;
+
+-- Migration complete!
@@ -0,0 +1,8 @@
+-- Drop the nightly monthly budget rollup (added in 009)
+-- Budget status now reads the trigger-maintained daily_category_spend table
+-- (022), which is always current, so the materialized view and its refresh
+-- job are no longer used.
+
+DROP MATERIALIZED VIEW IF EXISTS mv_monthly_budget_status;
+
+-- Migration complete!
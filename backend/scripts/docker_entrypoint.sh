@@ -10,5 +10,8 @@ else
     python backend/scripts/init_db.py
 fi
 
+# Schema is bootstrapped above, once - workers skip DDL at startup
+export INIT_DB_ON_STARTUP=false
+
 echo "🚀 Starting application..."
 exec uvicorn backend.app.main:app --host 0.0.0.0 --port 8000
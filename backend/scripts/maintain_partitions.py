@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Partition maintenance for logs, insights and notifications
+Run daily (e.g., cron) to pre-create upcoming monthly partitions and
+detach months past the retention window
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database.session import SessionLocal
+from app.database.partitions import maintain_partitions
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Roll partitions forward and retire expired months"""
+    db = SessionLocal()
+
+    try:
+        stats = maintain_partitions(db)
+        logger.info(f"Partition maintenance complete - detached {stats['detached']} partition(s)")
+    except Exception as e:
+        logger.error(f"Fatal error during partition maintenance: {e}", exc_info=True)
+        return 1
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Category usage count refresh
+Run periodically (e.g., cron every few minutes) to fold new transactions
+into categories.usage_count with one bulk UPDATE, instead of a row-locking
+increment per categorized transaction
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database.session import SessionLocal
+from app.services.category_manager import CategoryManager
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Recompute usage counts for every user's categories"""
+    db = SessionLocal()
+
+    try:
+        changed = CategoryManager.refresh_usage_counts(db)
+        logger.info(f"Category usage refresh complete - updated {changed} categor{'y' if changed == 1 else 'ies'}")
+    except Exception as e:
+        logger.error(f"Fatal error during category usage refresh: {e}", exc_info=True)
+        return 1
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -73,7 +73,7 @@ def client():
     from sqlalchemy.orm import sessionmaker
     from backend.app.main import app
     from backend.app.database.models import Base
-    from backend.app.database.session import get_db
+    from backend.app.database.session import get_db, get_async_db
     
     # Test database
     TEST_DATABASE_URL = "sqlite:///./test_categories.db"
@@ -89,6 +89,17 @@ def client():
     
     app.dependency_overrides[get_db] = override_get_db
     
+    # Async routes must see the same test database (requires aiosqlite)
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    async_engine = create_async_engine("sqlite+aiosqlite:///./test_categories.db")
+    TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+    
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    
     # Create tables
     Base.metadata.create_all(bind=engine)
     
@@ -119,3 +130,103 @@ def auth_headers(client):
     token = data["access_token"]
     
     return {"Authorization": f"Bearer {token}"}
+
+
+# ============================================================================
+# Unit-test helpers: throwaway SQLite database and an in-memory Redis stand-in
+# ============================================================================
+
+@pytest.fixture(scope="function")
+def unit_db(tmp_path):
+    """Session on a throwaway SQLite database with every table created"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database.models import Base
+    
+    # check_same_thread=False: async code under test hands the session to worker threads
+    engine = create_engine(f"sqlite:///{tmp_path / 'unit.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    
+    yield session
+    
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def unit_user(unit_db):
+    """A committed user in unit_db"""
+    import uuid
+    from app.database.models import User
+    
+    user = User(
+        id=str(uuid.uuid4()),
+        email=f"unit_{uuid.uuid4().hex[:8]}@example.com",
+        password_hash="test_hash",
+        name="Unit Test User",
+    )
+    unit_db.add(user)
+    unit_db.commit()
+    return user
+
+
+class FakeRedis:
+    """Just enough of the redis client for the service caches (strings, hashes, TTLs, pipelines)"""
+    
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.ttls = {}
+    
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+    
+    def get(self, key):
+        return self.values.get(key)
+    
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.ttls[key] = ex
+    
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+    
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+    
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+    
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.hashes.pop(key, None)
+            self.ttls.pop(key, None)
+
+
+class FakePipeline:
+    """Queues calls and replays them on the FakeRedis at execute()"""
+    
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+    
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+    
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture(scope="function")
+def fake_redis(monkeypatch):
+    """Point the Redis-backed service caches at one in-memory FakeRedis"""
+    from app.services import categorization_cache, spending_cache
+    
+    client = FakeRedis()
+    monkeypatch.setattr(categorization_cache, "_get_client", lambda: client)
+    monkeypatch.setattr(spending_cache, "_get_client", lambda: client)
+    return client
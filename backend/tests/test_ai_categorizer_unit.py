@@ -0,0 +1,281 @@
+"""
+Unit tests: AI transaction categorizer without a real LLM
+A scripted fake model stands in for the provider client; data lives in a
+throwaway SQLite database.
+"""
+import asyncio
+import threading
+
+import orjson
+import pytest
+
+from app.config import settings
+from app.database.models import Transaction
+from app.services import ai_transaction_categorizer, categorization_cache, spending_cache
+from app.services.ai_transaction_categorizer import AITransactionCategorizer
+from app.services.transaction_categorizer import TransactionCategorizer
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    """Answers every call with reply(prompt_text) and records the prompts"""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def _answer(self, messages):
+        prompt = "\n".join(str(message.content) for message in messages)
+        self.prompts.append(prompt)
+        return FakeResponse(self.reply(prompt))
+
+    def invoke(self, messages):
+        return self._answer(messages)
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(0)
+        return self._answer(messages)
+
+
+def answer(category, confidence=0.9, **extra):
+    return {"category": category, "confidence": confidence, "reasoning": "test", **extra}
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Install a fake model; set .reply to script its answers"""
+    llm = FakeLLM(lambda prompt: orjson.dumps(answer("groceries")).decode())
+    monkeypatch.setattr(settings, "AI_PROVIDER", "openai")
+    monkeypatch.setattr(ai_transaction_categorizer, "get_service_llm", lambda *args, **kwargs: llm)
+    return llm
+
+
+def test_acategorize_many_keeps_db_work_off_the_event_loop(unit_db, unit_user, fake_llm, monkeypatch):
+    loop_threads = []
+    db_threads = []
+
+    def similar_history(db, user_id, description, limit=5):
+        db_threads.append(threading.get_ident())
+        return []
+
+    monkeypatch.setattr(AITransactionCategorizer, "_get_similar_history", staticmethod(similar_history))
+    fake_llm.reply = lambda prompt: orjson.dumps(
+        answer("electronics" if "Pixel Mart" in prompt else "groceries")
+    ).decode()
+
+    async def run():
+        loop_threads.append(threading.get_ident())
+        return await AITransactionCategorizer.acategorize_many(
+            [
+                {"description": "Corner  shop 42", "amount": 12.0, "type": "expense"},
+                {"description": "", "amount": 5.0, "type": "expense"},
+                {"description": "Pixel Mart 7", "amount": 99.0, "type": "expense"},
+            ],
+            unit_user.id, unit_db,
+        )
+
+    results = asyncio.run(run())
+
+    assert [r["category"] for r in results] == ["groceries", "uncategorized", "electronics"]
+    assert [r["method"] for r in results] == ["ai", "skip", "ai"]
+    assert len(fake_llm.prompts) == 2
+    assert db_threads and loop_threads[0] not in db_threads
+
+
+def test_acategorize_many_falls_back_to_rules_when_the_llm_fails(unit_db, unit_user, fake_llm):
+    def reply(prompt):
+        if "Pixel Mart" in prompt:
+            raise RuntimeError("provider down")
+        return "not json"
+
+    fake_llm.reply = reply
+
+    results = asyncio.run(AITransactionCategorizer.acategorize_many(
+        [
+            {"description": "Corner shop 42", "amount": 12.0, "type": "expense"},
+            {"description": "Pixel Mart 7", "amount": 99.0, "type": "expense"},
+        ],
+        unit_user.id, unit_db,
+    ))
+
+    assert [r["method"] for r in results] == ["rule-based", "rule-based"]
+
+
+RULE_CATEGORIES = ["investment", "salary", "transport", "utilities", "food"]
+
+
+@pytest.mark.parametrize("description, trans_type", [
+    ("CREDIT CARD INTEREST CHARGE", "expense"),  # "interest" -> investment
+    ("INCOME TAX PAYMENT IRS", "expense"),       # "income" -> salary
+    ("UBER TRIP REFUND", "income"),              # "uber" -> transport
+])
+def test_rule_tier_escalates_categories_of_the_other_type(description, trans_type):
+    assert TransactionCategorizer.categorize(description, 50.0, trans_type)["confidence"] >= 0.9
+    assert AITransactionCategorizer._confident_rule_result(description, 50.0, trans_type, RULE_CATEGORIES) is None
+
+
+def test_rule_tier_prefers_the_longest_keyword():
+    result = AITransactionCategorizer._confident_rule_result("GAS BILL PG&E", 80.0, "expense", RULE_CATEGORIES)
+
+    assert result["category"] == "utilities"
+
+
+def test_cached_answer_beats_a_confident_rule(unit_db, unit_user, fake_llm, fake_redis):
+    categorization_cache.store_category(unit_user.id, "Starbucks 1142", "expense", 6.0, answer("coffee_shops"))
+
+    result = AITransactionCategorizer.categorize("Starbucks 1142", 6.0, "expense", unit_user.id, unit_db)
+
+    assert (result["category"], result["method"]) == ("coffee_shops", "cache")
+    assert fake_llm.prompts == []
+
+
+def test_user_correction_beats_a_confident_rule(unit_db, unit_user, fake_llm, fake_redis, invalidated):
+    transaction = add_transaction(unit_db, unit_user, "Uber 7731", "transport", amount=18.0)
+    assert AITransactionCategorizer.learn_from_correction(
+        unit_db, transaction.id, "transport", "business_travel", unit_user.id
+    )
+
+    results = AITransactionCategorizer.categorize_bulk(
+        [{"description": "Uber 7731", "amount": 18.0, "type": "expense"}], unit_user.id, unit_db,
+    )
+
+    assert (results[0]["category"], results[0]["method"]) == ("business_travel", "cache")
+    assert fake_llm.prompts == []
+
+
+def batch_reply(items):
+    return lambda prompt: orjson.dumps(items).decode()
+
+
+def test_categorize_bulk_maps_batch_answers_by_id(unit_db, unit_user, fake_llm):
+    # Ids number the transactions sent to the model (the blank one is not sent).
+    # Answers come out of order, plus a duplicate and an out-of-range id to ignore.
+    fake_llm.reply = batch_reply([
+        {"id": 2, **answer("electronics")},
+        {"id": 1, **answer("groceries")},
+        {"id": 1, **answer("fuel")},
+        {"id": 3, **answer("fuel")},
+    ])
+
+    results = AITransactionCategorizer.categorize_bulk(
+        [
+            {"description": "Corner shop 42", "amount": 12.0, "type": "expense"},
+            {"description": "   ", "amount": 5.0, "type": "expense"},
+            {"description": "Pixel Mart 7", "amount": 99.0, "type": "expense"},
+        ],
+        unit_user.id, unit_db,
+    )
+
+    assert [r["category"] for r in results] == ["groceries", "uncategorized", "electronics"]
+    assert [r["method"] for r in results] == ["ai", "skip", "ai"]
+    # One call for the whole batch; the blank description never reached the model
+    assert len(fake_llm.prompts) == 1
+    assert '1. "Corner shop 42"' in fake_llm.prompts[0]
+    assert '2. "Pixel Mart 7"' in fake_llm.prompts[0]
+
+
+def test_categorize_bulk_falls_back_to_rules_for_skipped_and_malformed_items(unit_db, unit_user, fake_llm):
+    fake_llm.reply = batch_reply([
+        {"id": 1, **answer("groceries")},
+        {"id": "two", **answer("electronics")},     # malformed id
+        {"id": 3, "confidence": 0.9},               # no category
+        {"id": 4, **answer("groceries", confidence=0.2)},  # not confident enough
+        # id 5 not answered at all
+    ])
+
+    results = AITransactionCategorizer.categorize_bulk(
+        [
+            {"description": f"Corner shop {n}", "amount": 10.0 + n, "type": "expense"}
+            for n in range(1, 6)
+        ],
+        unit_user.id, unit_db,
+    )
+
+    assert [r["method"] for r in results] == ["ai", "rule-based", "rule-based", "rule-based", "rule-based"]
+
+
+def test_categorize_bulk_falls_back_to_rules_when_the_answer_is_not_json(unit_db, unit_user, fake_llm):
+    fake_llm.reply = lambda prompt: "Sorry, I cannot help with that."
+
+    results = AITransactionCategorizer.categorize_bulk(
+        [{"description": "Corner shop 42", "amount": 12.0, "type": "expense"}],
+        unit_user.id, unit_db,
+    )
+
+    assert results[0]["method"] == "rule-based"
+
+
+def add_transaction(db, user, description, category, amount=20.0):
+    transaction = Transaction(
+        user_id=user.id, type="expense", amount=amount,
+        description=description, category=category,
+    )
+    db.add(transaction)
+    db.commit()
+    return transaction
+
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    """Record spending-cache invalidations instead of talking to Redis"""
+    calls = []
+    monkeypatch.setattr(spending_cache, "invalidate", lambda changed: calls.append(changed))
+    return calls
+
+
+def test_learn_from_correction_updates_the_transaction(unit_db, unit_user, invalidated):
+    transaction = add_transaction(unit_db, unit_user, "Corner shop 42", "food")
+
+    assert AITransactionCategorizer.learn_from_correction(unit_db, transaction.id, "food", "groceries", unit_user.id)
+
+    unit_db.expire_all()
+    assert unit_db.get(Transaction, transaction.id).category == "groceries"
+    assert invalidated == [{unit_user.id: {"food", "groceries"}}]
+
+
+def test_learn_from_correction_invalidates_the_stored_category(unit_db, unit_user, invalidated):
+    # The caller's idea of the old category is stale; an empty one sums as "uncategorized"
+    transaction = add_transaction(unit_db, unit_user, "Corner shop 42", "")
+
+    assert AITransactionCategorizer.learn_from_correction(unit_db, transaction.id, "food", "groceries", unit_user.id)
+
+    assert invalidated == [{unit_user.id: {"uncategorized", "groceries"}}]
+
+
+def test_learn_from_correction_ignores_other_users_transactions(unit_db, unit_user, invalidated):
+    transaction = add_transaction(unit_db, unit_user, "Corner shop 42", "food")
+
+    assert not AITransactionCategorizer.learn_from_correction(unit_db, transaction.id, "food", "groceries", "someone-else")
+
+    unit_db.expire_all()
+    assert unit_db.get(Transaction, transaction.id).category == "food"
+    assert invalidated == []
+
+
+def test_learn_from_corrections_bulk_updates_every_transaction(unit_db, unit_user, invalidated):
+    first = add_transaction(unit_db, unit_user, "Corner shop 42", "food")
+    second = add_transaction(unit_db, unit_user, "Pixel Mart 7", "shopping")
+    third = add_transaction(unit_db, unit_user, "Fuel stop", "transport")
+
+    updated = AITransactionCategorizer.learn_from_corrections_bulk(unit_db, unit_user.id, [
+        (first.id, "groceries"),
+        (second.id, "electronics"),
+        (third.id, "groceries"),
+        ("missing-id", "groceries"),
+    ])
+
+    assert updated == 3
+    unit_db.expire_all()
+    assert [unit_db.get(Transaction, t.id).category for t in (first, second, third)] == [
+        "groceries", "electronics", "groceries",
+    ]
+    assert invalidated == [{unit_user.id: {"food", "shopping", "transport", "groceries", "electronics"}}]
+
+
+def test_learn_from_corrections_bulk_with_nothing_to_do(unit_db, unit_user, invalidated):
+    assert AITransactionCategorizer.learn_from_corrections_bulk(unit_db, unit_user.id, []) == 0
+    assert invalidated == []
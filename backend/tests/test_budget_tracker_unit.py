@@ -0,0 +1,102 @@
+"""
+Unit tests: budget status, alert dedup, JSON containment filters and the
+updated_at trigger
+Data lives in a throwaway SQLite database (the PostgreSQL-only paths are
+covered by test_postgres_features.py).
+"""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select, update
+
+from app.database.models import (
+    Budget,
+    Notification,
+    NotificationType,
+    Transaction,
+    json_contains,
+)
+from app.services.budget_tracker import BudgetTracker
+
+
+def add_budget(db, user, category, amount):
+    budget = Budget(
+        user_id=user.id, category=category, amount=amount, period="monthly",
+        start_date=datetime.utcnow() - timedelta(days=60),
+    )
+    db.add(budget)
+    db.commit()
+    return budget
+
+
+def add_expense(db, user, category, amount, when=None):
+    db.add(Transaction(
+        user_id=user.id, type="expense", amount=amount, description=f"{category} purchase",
+        category=category, date=when or datetime.utcnow(),
+    ))
+    db.commit()
+
+
+def test_budget_statuses_sum_only_the_current_period(unit_db, unit_user):
+    add_budget(unit_db, unit_user, "food", 100)
+    add_budget(unit_db, unit_user, "transport", 50)
+    add_expense(unit_db, unit_user, "food", 30)
+    add_expense(unit_db, unit_user, "food", 15)
+    add_expense(unit_db, unit_user, "food", 500, when=datetime.utcnow() - timedelta(days=45))
+
+    statuses = {s["category"]: s for s in BudgetTracker.get_all_budget_statuses(unit_db, unit_user.id)}
+
+    assert statuses["food"]["actual_spent"] == 45
+    assert statuses["transport"]["actual_spent"] == 0
+    assert not statuses["food"]["is_overspent"]
+
+
+def test_overspent_budget_alerts_once_per_day(unit_db, unit_user):
+    budget = add_budget(unit_db, unit_user, "food", 100)
+    add_expense(unit_db, unit_user, "food", 150)
+
+    BudgetTracker.get_all_budget_statuses(unit_db, unit_user.id)
+    BudgetTracker.get_all_budget_statuses(unit_db, unit_user.id)
+
+    alerts = unit_db.scalars(select(Notification).where(Notification.budget_id == budget.id)).all()
+    assert len(alerts) == 1
+    assert alerts[0].type == NotificationType.BUDGET_ALERT
+
+
+def test_claim_alert_day_is_first_come_first_served(unit_db, unit_user):
+    budget = add_budget(unit_db, unit_user, "food", 100)
+    today = date.today()
+
+    assert BudgetTracker._claim_alert_day(unit_db, budget.id, today)
+    assert not BudgetTracker._claim_alert_day(unit_db, budget.id, today)
+    assert BudgetTracker._claim_alert_day(unit_db, budget.id, today + timedelta(days=1))
+
+
+def test_json_contains_matches_every_given_key(unit_db, unit_user):
+    for goal_id, milestone in (("g1", 25), ("g1", 50), ("g2", 25)):
+        unit_db.add(Notification(
+            user_id=unit_user.id, type=NotificationType.GOAL_MILESTONE, title="Milestone", message="",
+            extra_data={"goal_id": goal_id, "milestone": milestone},
+        ))
+    unit_db.commit()
+
+    def matching(criteria):
+        return unit_db.scalars(
+            select(Notification.extra_data).where(json_contains(Notification.extra_data, criteria))
+        ).all()
+
+    assert matching({"goal_id": "g1", "milestone": 50}) == [{"goal_id": "g1", "milestone": 50}]
+    assert len(matching({"goal_id": "g1"})) == 2
+    assert matching({"goal_id": "g3"}) == []
+
+
+def test_updated_at_moves_on_update(unit_db, unit_user):
+    budget = add_budget(unit_db, unit_user, "food", 100)
+    stale = datetime(2020, 1, 1)
+    unit_db.execute(update(Budget).where(Budget.id == budget.id).values(updated_at=stale))
+    unit_db.commit()
+    assert unit_db.get(Budget, budget.id).updated_at == stale
+
+    budget.amount = 150
+    unit_db.commit()
+
+    assert budget.updated_at > stale
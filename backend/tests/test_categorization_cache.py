@@ -0,0 +1,36 @@
+"""
+Unit tests: Redis cache of AI categorization results
+Runs against the in-memory FakeRedis from conftest
+"""
+from app.services import categorization_cache
+
+
+def test_repeat_merchants_share_one_entry(fake_redis):
+    categorization_cache.store_category(
+        "u1", "NETFLIX.COM 8842", "expense", 15.49,
+        {"category": "streaming", "confidence": 0.9, "reasoning": "Video service", "new_category_suggested": True},
+    )
+
+    cached = categorization_cache.get_cached_category("u1", "Netflix.com #1177", "expense", 15.99)
+
+    assert cached["category"] == "streaming"
+    assert cached["method"] == "cache"
+    # The suggested category already exists once the first answer was stored
+    assert cached["new_category_suggested"] is False
+    assert list(fake_redis.ttls.values()) == [categorization_cache.CACHE_TTL_SECONDS]
+
+
+def test_entries_are_per_user_type_and_amount_band(fake_redis):
+    categorization_cache.store_category("u1", "Corner shop", "expense", 12.0, {"category": "groceries"})
+
+    assert categorization_cache.get_cached_category("u2", "Corner shop", "expense", 12.0) is None
+    assert categorization_cache.get_cached_category("u1", "Corner shop", "income", 12.0) is None
+    assert categorization_cache.get_cached_category("u1", "Corner shop", "expense", 250.0) is None
+
+
+def test_invalidate_category_forgets_the_answer(fake_redis):
+    categorization_cache.store_category("u1", "Corner shop", "expense", 12.0, {"category": "groceries"})
+
+    categorization_cache.invalidate_category("u1", "Corner shop", "expense", 12.0)
+
+    assert categorization_cache.get_cached_category("u1", "Corner shop", "expense", 12.0) is None
@@ -0,0 +1,46 @@
+"""
+Unit tests: CategoryManager keyword matching and categorization view
+Data lives in a throwaway SQLite database.
+"""
+
+from app.database.models import Category
+from app.services.category_manager import CategoryManager
+
+
+def add_category(db, user, name, keywords, usage_count=0):
+    db.add(Category(
+        user_id=user.id,
+        name=name,
+        display_name=name.title(),
+        keywords=keywords,
+        usage_count=usage_count,
+    ))
+    db.commit()
+
+
+def test_find_similar_category_matches_keywords_inside_words(unit_db, unit_user):
+    add_category(unit_db, unit_user, "transport", ["uber", "Lyft"])
+
+    assert CategoryManager.find_similar_category(unit_user.id, "UBEREATS 1234", unit_db) == "transport"
+    assert CategoryManager.find_similar_category(unit_user.id, "lyft ride home", unit_db) == "transport"
+    assert CategoryManager.find_similar_category(unit_user.id, "Corner shop", unit_db) is None
+
+
+def test_find_similar_category_prefers_the_most_used_match(unit_db, unit_user):
+    add_category(unit_db, unit_user, "groceries", ["whole foods"], usage_count=2)
+    add_category(unit_db, unit_user, "food", ["foods"], usage_count=9)
+
+    assert CategoryManager.find_similar_category(unit_user.id, "Whole Foods Market", unit_db) == "food"
+
+
+def test_categorization_view_is_refreshed_only_after_commit(unit_db, unit_user):
+    add_category(unit_db, unit_user, "groceries", ["whole foods"])
+    assert CategoryManager.get_categorization_view(unit_user.id, unit_db).names == ["groceries"]
+
+    unit_db.add(Category(user_id=unit_user.id, name="transport", display_name="Transport"))
+    unit_db.flush()
+    # Flushed but not committed: other readers keep the committed view
+    assert CategoryManager.get_categorization_view(unit_user.id, unit_db).names == ["groceries"]
+
+    unit_db.commit()
+    assert sorted(CategoryManager.get_categorization_view(unit_user.id, unit_db).names) == ["groceries", "transport"]
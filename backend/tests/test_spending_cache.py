@@ -0,0 +1,48 @@
+"""
+Unit tests: Redis spending-sum cache
+Runs against the in-memory FakeRedis from conftest
+"""
+from datetime import datetime, timedelta
+
+from app.services import spending_cache
+
+
+def test_open_and_closed_periods_keep_their_own_ttl(fake_redis):
+    now = datetime.utcnow()
+    closed = ("food", now - timedelta(days=60), now - timedelta(days=30))
+    open_ = ("food", now - timedelta(days=1), now + timedelta(days=29))
+
+    spending_cache.store_category_totals("u1", [(*closed, 120.0)])
+    spending_cache.store_category_totals("u1", [(*open_, 45.5)])
+
+    assert fake_redis.ttls[spending_cache._total_key("u1", "food", closed=True)] == (
+        spending_cache.CLOSED_PERIOD_TTL_SECONDS
+    )
+    assert fake_redis.ttls[spending_cache._total_key("u1", "food")] == (
+        spending_cache.OPEN_PERIOD_TTL_SECONDS
+    )
+    assert spending_cache.get_category_totals("u1", [closed, open_]) == [120.0, 45.5]
+
+
+def test_invalidate_drops_open_and_closed_entries(fake_redis):
+    now = datetime.utcnow()
+    closed_start, closed_end = now - timedelta(days=60), now - timedelta(days=30)
+    open_start, open_end = now - timedelta(days=1), now + timedelta(days=29)
+
+    spending_cache.store_category_totals("u1", [("food", closed_start, closed_end, 10.0)])
+    spending_cache.store_category_totals("u1", [("food", open_start, open_end, 20.0)])
+    spending_cache.store_spending_by_category("u1", closed_start, closed_end, {"food": 10.0})
+    spending_cache.store_spending_by_category("u1", open_start, open_end, {"food": 20.0})
+
+    spending_cache.invalidate({"u1": {"food"}})
+
+    assert fake_redis.hashes == {}
+    assert spending_cache.get_spending_by_category("u1", open_start, open_end) is None
+
+
+def test_reads_fall_through_without_redis(monkeypatch):
+    monkeypatch.setattr(spending_cache, "_get_client", lambda: None)
+    now = datetime.utcnow()
+
+    assert spending_cache.get_category_totals("u1", [("food", now, now)]) == [None]
+    assert spending_cache.get_spending_by_category("u1", now, now) is None
@@ -0,0 +1,19 @@
+"""
+Unit tests: request validation helpers
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.utils.validators import FinancialValidator
+
+
+def test_to_naive_utc_converts_aware_datetimes():
+    aware = datetime(2026, 3, 14, 9, 30, tzinfo=timezone(timedelta(hours=-5)))
+
+    assert FinancialValidator.to_naive_utc(aware) == datetime(2026, 3, 14, 14, 30)
+    assert FinancialValidator.to_naive_utc(aware).tzinfo is None
+
+
+def test_to_naive_utc_keeps_naive_datetimes():
+    naive = datetime(2026, 3, 14, 9, 30)
+
+    assert FinancialValidator.to_naive_utc(naive) is naive